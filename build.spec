@@ -19,10 +19,29 @@ a = Analysis(
         'asyncio',
         'src',
         'src.gui',
+        'src.gui_bridge',
         'src.stream_checker',
+        'src.circuit_breaker',
+        'src.egress',
         'src.recorder',
+        'src.process_manager',
+        'src.fanout',
+        'src.watchdog',
+        'src.standby',
+        'src.integrity',
+        'src.library',
+        'src.eventlog',
+        'src.retention',
+        'src.backfill',
+        'src.comments',
+        'src.admission',
         'src.utils',
         'src.config',
+        'src.tracing',
+        'src.event_detector',
+        'src.sharding',
+        'src.channels',
+        'src.history',
     ],
     hookspath=[],
     hooksconfig={},
@@ -1,12 +1,331 @@
 """트위캐스트 자동 녹화 프로그램 - 메인 진입점"""
 
-from src.gui import TwitCastingMonitorGUI
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from src.backfill import BackfillQueue
+from src.channels import ChannelDirectory, STATUS_NOT_FOUND, format_channel
+from src.config import ConfigManager
+from src.eventlog import EventLogReader, LEVELS, format_record
+from src.gui_bridge import SettingsSnapshot
+from src.history import HistoryStore
+from src.integrity import verify_manifest
+from src.library import RecordingLibrary, format_row, format_size
+from src.process_manager import process_manager
+from src.retention import RetentionEngine
+from src.tracing import tracer, profiler
+from src.utils import normalize_user_id, parse_channel_list
+
+
+def parse_args(argv=None):
+    """명령줄 인자 파싱"""
+    parser = argparse.ArgumentParser(description="트위캐스트 자동 녹화 프로그램")
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="트레이스를 기록하고 종료 시 Chrome trace JSON 파일로 저장"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="SECONDS",
+        type=float,
+        help="시작 후 지정한 시간(초) 동안 샘플링 프로파일러 실행"
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        default="profile.txt",
+        help="프로파일 결과 파일 (기본값: profile.txt)"
+    )
+    parser.add_argument(
+        "--sessions",
+        metavar="USER_ID",
+        help="채널의 방송 기록을 출력하고 종료"
+    )
+    parser.add_argument(
+        "--error-rates",
+        action="store_true",
+        help="채널별 확인 오류율을 출력하고 종료"
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=30,
+        help="기록 조회 기간 (일, 기본값: 30)"
+    )
+    parser.add_argument(
+        "--library",
+        metavar="TEXT",
+        nargs="?",
+        const="",
+        help="녹화 목록을 출력하고 종료 (제목 검색어 지정 가능)"
+    )
+    parser.add_argument(
+        "--channel",
+        metavar="USER_ID",
+        help="녹화 목록 조회 채널"
+    )
+    parser.add_argument(
+        "--since",
+        metavar="YYYY-MM-DD",
+        help="녹화 목록 / 로그 조회 시작 날짜 (로그는 'YYYY-MM-DD HH:MM'도 가능)"
+    )
+    parser.add_argument(
+        "--logs",
+        metavar="TEXT",
+        nargs="?",
+        const="",
+        help="저장된 로그를 검색하여 출력하고 종료 (검색어 지정 가능)"
+    )
+    parser.add_argument(
+        "--level",
+        choices=list(LEVELS),
+        help="로그 검색 최소 심각도"
+    )
+    parser.add_argument(
+        "--retention-plan",
+        action="store_true",
+        help="보존 정책으로 삭제될 방송 목록을 출력하고 종료 (삭제하지 않음)"
+    )
+    parser.add_argument(
+        "--verify",
+        metavar="FILE",
+        nargs="+",
+        help="녹화 파일을 무결성 목록(.manifest.json)과 비교하고 종료"
+    )
+    parser.add_argument(
+        "--backfill",
+        metavar="USER_ID",
+        nargs="+",
+        help="채널의 지난 방송 중 받지 않은 방송을 내려받고 종료 (중단 후 다시 실행하면 이어받기)"
+    )
+    parser.add_argument(
+        "--import-channels",
+        metavar="FILE",
+        nargs="+",
+        help="텍스트/CSV 파일('-'는 표준 입력)의 채널을 확인하여 감시 목록에 추가하고 종료"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="채널 가져오기 시 캐시된 채널 정보도 다시 가져옴"
+    )
+    parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="녹화 목록 조회 전에 저장 경로를 다시 검사"
+    )
+    return parser.parse_args(argv)
+
+
+def print_history(args) -> bool:
+    """기록 조회 옵션 처리 (처리했으면 True)"""
+    if not (args.sessions or args.error_rates):
+        return False
+
+    history = HistoryStore(ConfigManager().get("history_db", "history.db"))
+    try:
+        if args.sessions:
+            for row in history.sessions_for(args.sessions, args.days):
+                print(f"{row['started_at']} ~ {row['ended_at'] or '(진행 중)'}  {row['title'] or ''}")
+        if args.error_rates:
+            for row in history.error_rate_by_channel(args.days):
+                print(f"{row['user_id']:<30} {row['errors']:>6}/{row['probes']:<6} {row['error_rate']:.1%}")
+    finally:
+        history.close()
+    return True
+
+
+def print_library(args) -> bool:
+    """녹화 목록 조회 옵션 처리 (처리했으면 True)"""
+    if args.library is None and not args.rescan and not args.retention_plan:
+        return False
+
+    config = ConfigManager()
+    library = RecordingLibrary(config.get("library_db", "library.db"))
+    if args.rescan:
+        result = library.reconcile(config.get("save_path", "") or ".", full=True)
+        print(f"디렉토리 {result['scanned']}개 검사, {result['added']}개 추가, {result['removed']}개 제거")
+    if args.library is not None:
+        rows = library.query(user_id=args.channel, text=args.library or None, since=args.since, limit=10000)
+        for row in rows:
+            print(format_row(row))
+        print(f"{len(rows)}개 파일, {format_size(sum(row['bytes'] for row in rows))}")
+    if args.retention_plan:
+        retention = RetentionEngine(
+            library,
+            get_save_dir=lambda: config.get("save_path", "") or ".",
+            rules=config.get("retention", {})
+        )
+        plan = retention.plan()
+        for session, reason in plan:
+            print(f"{session['user_id']:<20} {format_size(session['bytes']):>9}  {session['dir']}  ({reason})")
+        print(f"{len(plan)}개 방송, {format_size(sum(session['bytes'] for session, _ in plan))} 삭제 예정")
+    return True
+
+
+def print_logs(args) -> bool:
+    """로그 검색 옵션 처리 (처리했으면 True)"""
+    if args.logs is None:
+        return False
+
+    # 실행 중인 프로그램의 회전/압축과 겹치지 않도록 읽기만 함
+    reader = EventLogReader(ConfigManager().get("log_dir", "logs"))
+    since = datetime.fromisoformat(args.since).timestamp() if args.since else None
+    records = reader.search(
+        channel=args.channel, since=since, level=args.level, text=args.logs or None, limit=10000
+    )
+    for record in reversed(records):
+        print(format_record(record))
+    return True
+
+
+def verify_files(args) -> bool:
+    """무결성 검사 옵션 처리 (처리했으면 True)"""
+    if not args.verify:
+        return False
+
+    for path in args.verify:
+        try:
+            result = verify_manifest(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ {path}: 검사 불가 ({e})")
+            continue
+        if result["ok"]:
+            print(f"✅ {path}: 정상 ({result['bytes']:,} 바이트, {result['elapsed']:.1f}초)")
+        else:
+            print(f"❌ {path}: 불일치 - 손상 구간 {result['bad_segments']}, "
+                  f"크기 {result['bytes']:,}/{result['expected_bytes']:,}")
+    return True
+
+
+def run_backfill(args) -> bool:
+    """지난 방송 백필 옵션 처리 (처리했으면 True)"""
+    if not args.backfill:
+        return False
+
+    config = ConfigManager()
+    settings = SettingsSnapshot(
+        ytdlp_path=config.get("ytdlp_path", ""),
+        ffmpeg_path=config.get("ffmpeg_path", ""),
+        save_path=config.get("save_path", "")
+    )
+    process_manager.configure(
+        budget=config.get("process_budget"),
+        limits=config.get("process_limits"),
+        priorities=config.get("process_priorities")
+    )
+    options = config.get("backfill", {})
+    history = HistoryStore(config.get("history_db", "history.db"))
+    backfill = BackfillQueue(
+        RecordingLibrary(config.get("library_db", "library.db")),
+        get_settings=lambda: settings,
+        db_path=config.get("backfill_db", "backfill.db"),
+        history=history,
+        on_event=lambda user_id, message: print(f"[{user_id}] {message}"),
+        fragment_budget=int(options.get("fragment_budget", 8)),
+        fragments_per_job=int(options.get("fragments_per_job", 4)),
+        max_attempts=int(options.get("max_attempts", 3)),
+        poll_interval=1.0
+    )
+    for user_id in args.backfill:
+        try:
+            backfill.enqueue_missing(user_id)
+        except Exception as e:
+            print(f"❌ {user_id}: 지난 방송 목록 가져오기 실패 ({e})")
+
+    backfill.start()
+    try:
+        backfill.wait_idle()
+    except KeyboardInterrupt:
+        print("중단 - 다시 실행하면 이어받습니다.")
+    finally:
+        backfill.stop()
+        history.close()
+    counts = backfill.counts()
+    print(f"완료 {counts.get('done', 0)}개, 실패 {counts.get('failed', 0)}개, 대기 {counts.get('queued', 0)}개")
+    return True
+
+
+def import_channels(args) -> bool:
+    """채널 가져오기 옵션 처리 (처리했으면 True)"""
+    if not args.import_channels:
+        return False
+
+    # 콘솔 로캘(cp949 등)과 관계없이 UTF-8로 읽음 (한글 머리글 CSV)
+    text = "\n".join(
+        sys.stdin.buffer.read().decode("utf-8-sig", errors="replace") if path == "-"
+        else Path(path).read_text(encoding="utf-8-sig", errors="replace")
+        for path in args.import_channels
+    )
+    user_ids, invalid = parse_channel_list(text)
+    for entry in invalid:
+        print(f"❌ {entry}  (형식 오류)")
+
+    config = ConfigManager()
+    options = config.get("channel_cache", {})
+    channels = ChannelDirectory(
+        config.get("channels_db", "channels.db"),
+        ttl=float(options.get("ttl_days", 7)) * 86400,
+        concurrency=int(options.get("concurrency", 8))
+    )
+    resolved = channels.resolve_many(
+        user_ids,
+        refresh=args.refresh,
+        progress=lambda done, total: print(f"\r확인 중... {done}/{total}", end="", file=sys.stderr)
+    )
+    print(file=sys.stderr)
+    for user_id in user_ids:
+        print(format_channel(user_id, resolved.get(user_id)))
+
+    # 빈 칸을 먼저 채우고 나머지는 뒤에 추가
+    urls = list(config.get("channel_urls", []))
+    existing = {user_id.lower() for user_id in map(normalize_user_id, filter(None, urls)) if user_id}
+    added = 0
+    for user_id in user_ids:
+        if user_id.lower() in existing or resolved.get(user_id, {}).get("status") == STATUS_NOT_FOUND:
+            continue
+        existing.add(user_id.lower())
+        if "" in urls:
+            urls[urls.index("")] = user_id
+        else:
+            urls.append(user_id)
+        added += 1
+    if added:
+        config.set("channel_urls", urls)
+        config.save_config()
+    print(f"채널 {added}개 추가 (확인 {len(user_ids)}개, 형식 오류 {len(invalid)}개)")
+    return True
 
 
 def main():
     """메인 진입점"""
+    args = parse_args()
+
+    handled = (
+        print_history(args) or print_library(args) or print_logs(args) or verify_files(args)
+        or run_backfill(args) or import_channels(args)
+    )
+    if handled:
+        return
+
+    if args.trace:
+        tracer.enable()
+    if args.profile:
+        profiler.start(args.profile, args.profile_output)
+
+    from src.gui import TwitCastingMonitorGUI
+
     app = TwitCastingMonitorGUI()
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        if profiler.is_running:
+            profiler.stop()
+        if args.trace:
+            tracer.export(args.trace)
 
 
 if __name__ == "__main__":
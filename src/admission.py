@@ -0,0 +1,259 @@
+"""동시 녹화 승인 제어 모듈
+
+진행 중인 녹화들의 저장 파일 증가량으로 다운로드 대역폭과 디스크 쓰기량을 측정하고,
+새 녹화를 설정된 한도와 채널 우선순위에 따라 승인(admit), 저화질 승인(degrade),
+대기(queue) 중 하나로 결정합니다. 기존 녹화는 그대로 유지되고 새 녹화만 조정됩니다.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+
+ADMIT = "admit"
+DEGRADE = "degrade"
+QUEUE = "queue"
+
+
+class AdmissionController:
+    """대역폭/디스크 기반 녹화 승인 제어 클래스"""
+
+    def __init__(
+        self,
+        recorder,
+        on_admit=None,
+        max_concurrent: int = 0,
+        max_bandwidth_mbps: float = 0,
+        max_disk_mbps: float = 0,
+        degrade_format: str = "worst",
+        degrade_ratio: float = 0.35,
+        default_bitrate_mbps: float = 3.0,
+        interval: float = 5.0
+    ):
+        """
+        Args:
+            recorder: StreamRecorder 인스턴스
+            on_admit: 대기 중이던 녹화가 승인될 때 호출할 콜백 (user_id, payload, decision, reason)
+            max_concurrent: 최대 동시 녹화 수 (0이면 제한 없음)
+            max_bandwidth_mbps: 최대 다운로드 대역폭 (Mbps, 0이면 제한 없음)
+            max_disk_mbps: 최대 디스크 쓰기량 (Mbps, 0이면 제한 없음)
+            degrade_format: 저화질 승인 시 사용할 yt-dlp 포맷 (빈 값이면 저화질 승인 안 함)
+            degrade_ratio: 저화질 녹화의 예상 비트레이트 비율
+            default_bitrate_mbps: 측정값이 없을 때 녹화 하나의 예상 비트레이트
+            interval: 측정 주기 (초)
+        """
+        self.recorder = recorder
+        self.on_admit = on_admit
+        self.max_concurrent = max_concurrent
+        self.max_bandwidth_mbps = max_bandwidth_mbps
+        self.max_disk_mbps = max_disk_mbps
+        self.degrade_format = degrade_format
+        self.degrade_ratio = degrade_ratio
+        self.default_bitrate_mbps = default_bitrate_mbps
+        self.interval = interval
+
+        self.rates = {}  # {user_id: (다운로드 Mbps, 디스크 Mbps)}
+        self.waiting = {}  # {user_id: {"priority", "payload", "reason", "since"}}
+        self.reserved = {}  # {user_id: (예상 Mbps, 승인 시각)} - 측정값이 생기기 전까지 예약
+        self.admitted = {}  # {user_id: 승인 시각} - 승인했지만 아직 녹화 목록에 없을 수 있는 녹화 (동시 녹화 수에 포함)
+        self._last_sizes = {}  # {user_id: (원본 크기, 디렉토리 전체 크기, 측정 시각)}
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="admission", daemon=True)
+        self._thread.start()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_concurrent or self.max_bandwidth_mbps or self.max_disk_mbps)
+
+    # === 측정 ===
+
+    @staticmethod
+    def _sizes(file_path: str) -> tuple[int, int]:
+        """원본 파일 크기와 같은 디렉토리(변환 출력 포함) 전체 크기"""
+        path = Path(file_path)
+        main_size = 0
+        total = 0
+        try:
+            with os.scandir(path.parent) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        size = entry.stat().st_size
+                        total += size
+                        if entry.name == path.name:
+                            main_size = size
+        except OSError:
+            pass
+        return main_size, total
+
+    def sample(self):
+        """진행 중인 녹화의 파일 증가량으로 대역폭과 디스크 쓰기량을 갱신합니다."""
+        now = time.monotonic()
+        active = set(self.recorder.get_recording_channels())
+        rates = {}
+        sizes = {}
+        for user_id in active:
+            file_path = self.recorder.get_output_file(user_id)
+            if not file_path:
+                continue
+            main_size, total = self._sizes(file_path)
+            sizes[user_id] = (main_size, total, now)
+            previous = self._last_sizes.get(user_id)
+            if previous and now > previous[2]:
+                elapsed = now - previous[2]
+                download = max(0, main_size - previous[0]) * 8 / elapsed / 1_000_000
+                disk = max(0, total - previous[1]) * 8 / elapsed / 1_000_000
+                rates[user_id] = (download, disk)
+            elif user_id in self.rates:
+                rates[user_id] = self.rates[user_id]
+
+        with self._lock:
+            self._last_sizes = sizes
+            self.rates = rates
+            # 실제 측정값이 생겼거나 오래된 예약은 해제
+            self.reserved = {
+                user_id: reservation for user_id, reservation in self.reserved.items()
+                if user_id not in rates and now - reservation[1] < 30
+            }
+            # 녹화가 시작되면 녹화 목록으로 세므로, 시작하지 못하고 오래된 승인만 해제
+            self.admitted = {
+                user_id: admitted_at for user_id, admitted_at in self.admitted.items()
+                if user_id in active or now - admitted_at < 60
+            }
+
+    def totals(self) -> tuple[float, float]:
+        """(총 다운로드 Mbps, 총 디스크 Mbps)"""
+        with self._lock:
+            return (
+                sum(rate[0] for rate in self.rates.values()),
+                sum(rate[1] for rate in self.rates.values()),
+            )
+
+    def _estimate(self) -> float:
+        """새 녹화 하나의 예상 비트레이트 (진행 중인 녹화 평균)"""
+        measured = [rate[0] for rate in self.rates.values() if rate[0] > 0]
+        if measured:
+            return sum(measured) / len(measured)
+        return self.default_bitrate_mbps
+
+    # === 결정 ===
+
+    def _decide(self, user_id: str, priority: int, ignore_waiting: bool = False) -> tuple[str, str]:
+        if not self.enabled:
+            return ADMIT, ""
+
+        # 진행 중인 녹화 + 승인했지만 아직 시작 중인 녹화 (동시 요청/대기열 처리에서 한도를 넘지 않도록)
+        active = len(set(self.recorder.get_recording_channels()) | set(self.admitted))
+        pending = sum(mbps for uid, (mbps, _) in self.reserved.items() if uid not in self.rates)
+        download = sum(rate[0] for rate in self.rates.values()) + pending
+        disk = sum(rate[1] for rate in self.rates.values()) + pending
+        estimate = self._estimate()
+
+        if self.max_concurrent and active >= self.max_concurrent:
+            return QUEUE, f"동시 녹화 한도 ({active}/{self.max_concurrent})"
+
+        if not ignore_waiting:
+            ahead = [
+                uid for uid, entry in self.waiting.items()
+                if uid != user_id and entry["priority"] >= priority
+            ]
+            if ahead:
+                return QUEUE, f"우선순위가 같거나 높은 대기 녹화 {len(ahead)}개"
+
+        def fits(rate: float) -> str:
+            if self.max_bandwidth_mbps and download + rate > self.max_bandwidth_mbps:
+                return f"대역폭 {download:.1f}+{rate:.1f} > {self.max_bandwidth_mbps:g} Mbps"
+            if self.max_disk_mbps and disk + rate > self.max_disk_mbps:
+                return f"디스크 쓰기 {disk:.1f}+{rate:.1f} > {self.max_disk_mbps:g} Mbps"
+            return ""
+
+        reason = fits(estimate)
+        if not reason:
+            self._reserve(user_id, estimate)
+            return ADMIT, ""
+        if self.degrade_format and not fits(estimate * self.degrade_ratio):
+            self._reserve(user_id, estimate * self.degrade_ratio)
+            return DEGRADE, reason
+        return QUEUE, reason
+
+    def _reserve(self, user_id: str, mbps: float):
+        """승인한 녹화를 측정값이 생기기 전까지 대역폭/동시 녹화 수에 포함 (잠금 안에서 호출)"""
+        now = time.monotonic()
+        self.reserved[user_id] = (mbps, now)
+        self.admitted[user_id] = now
+
+    def request(self, user_id: str, priority: int = 0, payload=None) -> tuple[str, str]:
+        """
+        새 녹화의 승인 여부를 결정합니다. 대기로 결정되면 payload와 함께 대기열에 넣고,
+        여유가 생기면 on_admit 콜백으로 알립니다.
+
+        Returns:
+            tuple[str, str]: (ADMIT | DEGRADE | QUEUE, 사유)
+        """
+        with self._lock:
+            decision, reason = self._decide(user_id, priority)
+            if decision == QUEUE:
+                entry = self.waiting.get(user_id)
+                self.waiting[user_id] = {
+                    "priority": priority,
+                    "payload": payload,
+                    "reason": reason,
+                    "since": entry["since"] if entry else time.monotonic(),
+                }
+            else:
+                self.waiting.pop(user_id, None)
+        return decision, reason
+
+    def cancel(self, user_id: str):
+        """대기 중인 녹화를 취소합니다 (방송 종료 / 감시 중지)."""
+        with self._lock:
+            self.waiting.pop(user_id, None)
+            self.reserved.pop(user_id, None)
+            self.admitted.pop(user_id, None)
+
+    def release(self, user_id: str):
+        """녹화가 끝났을 때 예약을 해제하고 대기열을 즉시 다시 확인합니다."""
+        with self._lock:
+            self.reserved.pop(user_id, None)
+            self.admitted.pop(user_id, None)
+            self.rates.pop(user_id, None)
+        self._wake_event.set()
+
+    def waiting_reasons(self) -> dict:
+        """{user_id: 대기 사유}"""
+        with self._lock:
+            return {user_id: entry["reason"] for user_id, entry in self.waiting.items()}
+
+    def _drain(self):
+        """우선순위가 높은(같으면 오래 기다린) 대기 녹화부터 승인합니다."""
+        admitted = []
+        with self._lock:
+            ordered = sorted(self.waiting.items(), key=lambda item: (-item[1]["priority"], item[1]["since"]))
+            for user_id, entry in ordered:
+                # 앞에서 승인한 녹화의 예약이 반영된 상태로 다시 판단
+                decision, reason = self._decide(user_id, entry["priority"], ignore_waiting=True)
+                if decision == QUEUE:
+                    # 앞선 대기 녹화를 건너뛰고 뒤의 녹화를 먼저 승인하지 않음
+                    entry["reason"] = reason
+                    break
+                del self.waiting[user_id]
+                admitted.append((user_id, entry["payload"], decision, reason))
+
+        if self.on_admit:
+            for user_id, payload, decision, reason in admitted:
+                self.on_admit(user_id, payload, decision, reason)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.interval)
+            self._wake_event.clear()
+            self.sample()
+            if self.waiting:
+                self._drain()
+
+    def stop(self):
+        """측정 스레드를 종료합니다."""
+        self._stop_event.set()
+        self._wake_event.set()
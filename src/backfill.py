@@ -0,0 +1,458 @@
+"""지난 방송(아카이브) 백필 모듈
+
+감시하지 못한 방송(장애, 늦게 추가한 채널)의 아카이브를 찾아서 내려받습니다.
+
+- 채널의 지난 방송 목록을 yt-dlp로 가져와 녹화 목록 색인/기록에 없는 방송만 대기열에 추가
+  (방송 중인 채널의 최신 방송과 녹화 중인 방송은 라이브 녹화가 받으므로 제외)
+- 목록 가져오기는 작은 작업자 풀에서 실행 (여러 채널을 한꺼번에 추가해도 yt-dlp가 몰리지 않음)
+- 대기열은 SQLite에 저장되어, 중단 후 다시 시작하면 이어서 진행 (yt-dlp -c로 조각 단위 이어받기)
+- 조각(fragment) 동시 다운로드 수를 전체 한도 안에서 작업마다 나눠 사용
+- 라이브 녹화 중에는 한도를 줄이고, 낮은 우선순위(nice)로 실행
+- 저장 형식은 라이브 녹화와 같음 (`{저장경로}/{사용자ID}/[날짜]_제목(ID)/...`)
+"""
+
+import json
+import re
+import sqlite3
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+from .process_manager import process_manager
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    movie_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    file_path TEXT,
+    added_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, added_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs(user_id);
+"""
+
+_PROGRESS = re.compile(r"^\[download\]\s+(\d+(?:\.\d+)?)%")
+
+
+class BackfillQueue:
+    """아카이브 백필 대기열 / 다운로드 관리 클래스"""
+
+    def __init__(
+        self,
+        library,
+        get_settings,
+        db_path: str = "backfill.db",
+        live_count=None,
+        live_movies=None,
+        history=None,
+        on_event=None,
+        fragment_budget: int = 8,
+        fragments_per_job: int = 4,
+        busy_budget: int = 2,
+        max_attempts: int = 3,
+        list_concurrency: int = 2,
+        poll_interval: float = 5.0
+    ):
+        """
+        Args:
+            library: RecordingLibrary 인스턴스 (받은 방송 확인 / 완료 파일 색인)
+            get_settings: ytdlp_path, ffmpeg_path, save_path 속성이 있는 최신 설정을 반환하는 함수
+            db_path: 대기열 데이터베이스 파일 경로
+            live_count: 진행 중인 라이브 녹화 수를 반환하는 함수
+            live_movies: 방송 중인 채널 {user_id: 방송 ID | None}를 반환하는 함수 (라이브 녹화와 겹치지 않도록)
+            history: HistoryStore 인스턴스 (녹화한 방송 ID 확인, 없으면 녹화 목록 색인만 확인)
+            on_event: 작업 상태 변경 시 호출할 콜백 (user_id, 메시지)
+            fragment_budget: 모든 백필 작업의 조각 동시 다운로드 수 합계 한도
+            fragments_per_job: 작업 하나의 최대 조각 동시 다운로드 수 (yt-dlp -N)
+            busy_budget: 라이브 녹화 중일 때의 조각 한도 (0이면 녹화가 끝날 때까지 새 작업 보류)
+            max_attempts: 작업당 최대 시도 횟수
+            list_concurrency: 동시에 실행할 최대 목록 가져오기 수
+            poll_interval: 대기열 확인 주기 (초)
+        """
+        self.library = library
+        self.get_settings = get_settings
+        self.db_path = Path(db_path)
+        self.live_count = live_count or (lambda: 0)
+        self.live_movies = live_movies or (lambda: {})
+        self.history = history
+        self.on_event = on_event
+        self.fragment_budget = fragment_budget
+        self.fragments_per_job = fragments_per_job
+        self.busy_budget = busy_budget
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+
+        self.running = {}  # {movie_id: {"user_id", "process", "fragments", "progress"}}
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._listing = set()  # 목록 가져오기 대기/진행 중인 채널
+        self._list_pool = ThreadPoolExecutor(max_workers=max(1, list_concurrency), thread_name_prefix="backfill-list")
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            # 이전 실행에서 중단된 작업은 대기열로 되돌림 (다시 시작하면 이어받기)
+            conn.execute("UPDATE jobs SET status = ? WHERE status = ?", (QUEUED, RUNNING))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10.0)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _notify(self, user_id: str, message: str):
+        if self.on_event:
+            self.on_event(user_id, message)
+
+    # === 대기열 ===
+
+    def list_archives(self, user_id: str, timeout: float = 120.0) -> list[dict]:
+        """
+        채널의 지난 방송 목록을 가져옵니다.
+
+        Returns:
+            list[dict]: [{"movie_id", "url", "title"}]
+
+        Raises:
+            RuntimeError: yt-dlp 실행 실패
+        """
+        cmd = [
+            self.get_settings().ytdlp_path or "yt-dlp",
+            "--flat-playlist",
+            "--dump-single-json",
+            "--no-warnings",
+            f"https://twitcasting.tv/{user_id}/show/"
+        ]
+        # 확인 프로세스와 같이 프로세스 한도 여유가 있을 때만 실행
+        process_manager.wait_room()
+        process = process_manager.popen("probe", cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process_manager.terminate(process, timeout=1)
+            raise RuntimeError(f"목록 가져오기 시간 초과 ({timeout:.0f}초)")
+        process_manager.release(process)
+        if process.returncode != 0:
+            message = stderr.decode("utf-8", errors="ignore").strip().splitlines()
+            raise RuntimeError(message[-1] if message else f"exit code {process.returncode}")
+
+        data = json.loads(stdout.decode("utf-8"))
+        archives = []
+        for entry in data.get("entries") or []:
+            movie_id = str(entry.get("id") or "")
+            if not movie_id:
+                continue
+            archives.append({
+                "movie_id": movie_id,
+                "url": entry.get("url") or f"https://twitcasting.tv/{user_id}/movie/{movie_id}",
+                "title": entry.get("title"),
+            })
+        return archives
+
+    def _recorded(self, user_id: str) -> set[str]:
+        """이미 받았거나 라이브로 녹화 중인 방송 ID"""
+        recorded = set(self.library.movie_ids(user_id))
+        if self.history:
+            recorded |= self.history.recorded_movie_ids(user_id)
+        live_movie = self.live_movies().get(user_id)
+        if live_movie:
+            recorded.add(str(live_movie))
+        return recorded
+
+    def enqueue_missing(self, user_id: str) -> int:
+        """
+        지난 방송 중 녹화 목록과 대기열에 없는 방송을 대기열에 추가합니다.
+        방송 중인 채널의 최신 방송은 라이브 녹화가 받으므로 제외합니다.
+
+        Returns:
+            int: 추가한 방송 수
+        """
+        archives = self.list_archives(user_id)
+        recorded = self._recorded(user_id)
+        if archives and user_id in self.live_movies():
+            # 방송 ID는 증가하는 숫자 - 가장 큰 ID가 지금 방송
+            newest = max(archives, key=lambda item: int(item["movie_id"]) if item["movie_id"].isdigit() else -1)
+            recorded.add(newest["movie_id"])
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = [
+            (item["movie_id"], user_id, item["url"], item["title"], QUEUED, now)
+            for item in archives
+            if item["movie_id"] not in recorded
+        ]
+        with closing(self._connect()) as conn, conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (movie_id, user_id, url, title, status, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            added = conn.total_changes - before
+        if added:
+            self._notify(user_id, f"📼 지난 방송 {added}개 백필 대기열에 추가")
+            self.wake()
+        return added
+
+    def request_listing(self, user_id: str):
+        """
+        채널의 지난 방송 목록 가져오기를 작업자 풀에 넣습니다 (백그라운드, 같은 채널 중복 요청은 하나로).
+        실패는 on_event로 알립니다.
+        """
+        with self._lock:
+            if self._stop_event.is_set() or user_id in self._listing:
+                return
+            self._listing.add(user_id)
+        self._list_pool.submit(self._list_one, user_id)
+
+    def _list_one(self, user_id: str):
+        try:
+            if not self._stop_event.is_set():
+                self.enqueue_missing(user_id)
+        except Exception as e:
+            self._notify(user_id, f"⚠️ 지난 방송 목록 가져오기 실패: {e}")
+        finally:
+            with self._lock:
+                self._listing.discard(user_id)
+
+    def retry_failed(self, user_id: str = None) -> int:
+        """실패한 작업을 다시 대기열에 넣습니다."""
+        with closing(self._connect()) as conn, conn:
+            if user_id:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = 0 WHERE status = ? AND user_id = ?",
+                    (QUEUED, FAILED, user_id)
+                )
+            else:
+                cursor = conn.execute("UPDATE jobs SET status = ?, attempts = 0 WHERE status = ?", (QUEUED, FAILED))
+        self.wake()
+        return cursor.rowcount
+
+    def counts(self) -> dict:
+        """{상태: 작업 수}"""
+        with closing(self._connect()) as conn:
+            return {row["status"]: row["count"] for row in conn.execute(
+                "SELECT status, COUNT(*) AS count FROM jobs GROUP BY status"
+            )}
+
+    def progress(self) -> list[dict]:
+        """진행 중인 작업 [{"movie_id", "user_id", "fragments", "progress"}]"""
+        with self._lock:
+            return [
+                {"movie_id": movie_id, "user_id": job["user_id"], "fragments": job["fragments"],
+                 "progress": job["progress"]}
+                for movie_id, job in self.running.items()
+            ]
+
+    # === 다운로드 ===
+
+    def _budget(self) -> int:
+        """지금 사용할 수 있는 조각 동시 다운로드 한도 (라이브 녹화 우선)"""
+        return self.busy_budget if self.live_count() else self.fragment_budget
+
+    def _next_job(self) -> dict | None:
+        """
+        다음에 시작할 작업. 대기열에 넣은 뒤 라이브로 녹화된 방송은 완료 처리하고,
+        지금 라이브로 녹화 중인 방송은 방송이 끝날 때까지 미룹니다.
+        """
+        with self._lock:
+            running = list(self.running)
+        live = {str(movie_id) for movie_id in self.live_movies().values() if movie_id}
+        recorded = {}
+        with closing(self._connect()) as conn:
+            placeholders = ",".join("?" * len(running))
+            rows = conn.execute(
+                f"SELECT * FROM jobs WHERE status = ? AND movie_id NOT IN ({placeholders}) "
+                "ORDER BY added_at, movie_id",
+                (QUEUED, *running)
+            ).fetchall()
+        for row in rows:
+            if row["movie_id"] in live:
+                continue
+            if row["user_id"] not in recorded:
+                recorded[row["user_id"]] = self._recorded(row["user_id"])
+            if row["movie_id"] in recorded[row["user_id"]]:
+                with closing(self._connect()) as conn, conn:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE movie_id = ?",
+                        (DONE, "라이브로 녹화됨", datetime.now().isoformat(timespec="seconds"), row["movie_id"])
+                    )
+                continue
+            return dict(row)
+        return None
+
+    def _schedule(self):
+        """한도 여유만큼 대기열의 작업을 시작합니다."""
+        while not self._stop_event.is_set():
+            with self._lock:
+                used = sum(job["fragments"] for job in self.running.values())
+            free = self._budget() - used
+            if free < 1:
+                return
+            job = self._next_job()
+            if job is None:
+                return
+            fragments = min(self.fragments_per_job, free)
+            with self._lock:
+                self.running[job["movie_id"]] = {
+                    "user_id": job["user_id"], "process": None, "fragments": fragments, "progress": 0.0,
+                }
+            with closing(self._connect()) as conn, conn:
+                conn.execute("UPDATE jobs SET status = ? WHERE movie_id = ?", (RUNNING, job["movie_id"]))
+            threading.Thread(
+                target=self._run_job, args=(job, fragments), name=f"backfill-{job['movie_id']}", daemon=True
+            ).start()
+
+    def _build_command(self, job: dict, fragments: int) -> list[str]:
+        settings = self.get_settings()
+        save_dir = Path(settings.save_path or Path.cwd())
+        # 라이브 녹화와 같은 저장 형식
+        output_template = str(
+            save_dir / job["user_id"] / "[%(upload_date)s]_%(title)s(%(id)s)/[%(upload_date)s]_%(title)s(%(id)s).%(ext)s"
+        )
+        cmd = [
+            settings.ytdlp_path or "yt-dlp",
+            "-c",  # 중단된 다운로드 이어받기 (.part / .ytdl 조각 진행 상태 사용)
+            "--newline",
+            "--progress",  # --print는 --quiet를 켜므로 진행률 줄을 계속 출력하도록 지정
+            "-N", str(fragments),
+            "-o", output_template,
+            "--merge-output-format", "mp4",
+            "--print", "after_move:filepath",
+        ]
+        if settings.ffmpeg_path:
+            cmd += ["--ffmpeg-location", settings.ffmpeg_path]
+        cmd.append(job["url"])
+        return cmd
+
+    def _run_job(self, job: dict, fragments: int):
+        movie_id = job["movie_id"]
+        user_id = job["user_id"]
+        file_path = None
+        last_line = ""
+        error = None
+
+        try:
+            # 라이브 녹화보다 낮은 "backfill" 우선순위로 실행
+            process = process_manager.popen(
+                "backfill",
+                self._build_command(job, fragments),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+            )
+            with self._lock:
+                self.running[movie_id]["process"] = process
+            self._notify(user_id, f"📼 백필 시작: {job['title'] or movie_id} (조각 {fragments}개 동시)")
+
+            with process.stdout:
+                for raw in iter(process.stdout.readline, b""):
+                    line = raw.decode("utf-8", errors="ignore").strip()
+                    if not line:
+                        continue
+                    match = _PROGRESS.match(line)
+                    if match:
+                        with self._lock:
+                            self.running[movie_id]["progress"] = float(match.group(1))
+                        continue
+                    # --print after_move:filepath 출력은 최종 파일 경로
+                    if not line.startswith("[") and Path(line).is_file():
+                        file_path = line
+                    else:
+                        last_line = line
+            process.wait()
+            process_manager.terminate(process)
+
+            if self._stop_event.is_set():
+                error = None  # 종료로 중단된 작업은 다음 실행에서 이어받음
+            elif process.returncode != 0 or not file_path:
+                error = last_line or f"exit code {process.returncode}"
+        except Exception as e:
+            error = str(e)
+
+        try:
+            now = datetime.now().isoformat(timespec="seconds")
+            with closing(self._connect()) as conn, conn:
+                if self._stop_event.is_set() and not file_path:
+                    conn.execute("UPDATE jobs SET status = ? WHERE movie_id = ?", (QUEUED, movie_id))
+                elif error is None:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, error = NULL, file_path = ?, finished_at = ? WHERE movie_id = ?",
+                        (DONE, file_path, now, movie_id)
+                    )
+                else:
+                    attempts = job["attempts"] + 1
+                    status = FAILED if attempts >= self.max_attempts else QUEUED
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = ?, error = ?, finished_at = ? WHERE movie_id = ?",
+                        (status, attempts, error, now, movie_id)
+                    )
+
+            if file_path and error is None:
+                self.library.add(file_path)
+                self._notify(user_id, f"📼 백필 완료: {Path(file_path).name}")
+            elif error is not None:
+                self._notify(user_id, f"⚠️ 백필 실패 ({job['title'] or movie_id}): {error}")
+        finally:
+            # 상태 기록 / 색인 뒤에 진행 목록에서 제거 (is_idle이 끝나지 않은 작업을 빠뜨리지 않도록)
+            with self._lock:
+                self.running.pop(movie_id, None)
+        self.wake()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._schedule()
+            except Exception:
+                # 한 번 실패해도 다음 주기에 다시 시도
+                pass
+            self._wake_event.wait(self.poll_interval)
+            self._wake_event.clear()
+
+    def start(self):
+        """백그라운드에서 대기열 처리를 시작합니다."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="backfill", daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        """다음 주기를 기다리지 않고 대기열을 바로 확인합니다 (작업 추가 / 녹화 종료 시 등)."""
+        self._wake_event.set()
+
+    def is_idle(self) -> bool:
+        """진행 중이거나 대기 중인 작업이 없는지"""
+        with self._lock:
+            if self.running:
+                return False
+        return not self.counts().get(QUEUED)
+
+    def wait_idle(self, poll: float = 1.0):
+        """대기열이 빌 때까지 기다립니다 (명령줄 백필용)."""
+        while not self._stop_event.is_set() and not self.is_idle():
+            time.sleep(poll)
+
+    def stop(self):
+        """진행 중인 다운로드를 중단합니다 (다음 실행에서 이어받기)."""
+        self._stop_event.set()
+        self._wake_event.set()
+        self._list_pool.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            processes = [job["process"] for job in self.running.values() if job["process"]]
+        for process in processes:
+            process_manager.terminate(process, timeout=3)
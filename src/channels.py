@@ -0,0 +1,235 @@
+"""채널 정보 캐시 모듈
+
+채널의 표시 이름/프로필 이미지/마지막 방송 시각과 ID 확인 결과를 SQLite에 저장하여,
+채널을 대량으로 가져오거나 프로그램을 다시 열 때 아직 유효한 정보는 다시 가져오지 않습니다.
+
+- 정보는 채널 페이지(`https://twitcasting.tv/{ID}`)의 og 메타 태그에서 읽음 (404면 없는 채널)
+- 가져오기 결과별 유효 기간: 정상 ttl, 없는 채널 missing_ttl, 일시 오류 error_ttl
+- 오래된 채널만 동시 요청 수를 제한하여 병렬로 가져옴
+- 마지막 방송 시각은 감시 중 방송 시작을 감지할 때 기록
+"""
+
+import html
+import re
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+
+
+STATUS_OK = "ok"
+STATUS_NOT_FOUND = "not_found"
+STATUS_ERROR = "error"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS channels (
+    user_id TEXT PRIMARY KEY COLLATE NOCASE,
+    status TEXT NOT NULL,
+    display_name TEXT,
+    avatar TEXT,
+    last_live_at TEXT,
+    error TEXT,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# 일시 오류 시 이전에 가져온 이름/이미지는 유지
+_UPSERT = (
+    "INSERT INTO channels (user_id, status, display_name, avatar, error, fetched_at) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(user_id) DO UPDATE SET status = excluded.status, "
+    "display_name = COALESCE(excluded.display_name, display_name), avatar = COALESCE(excluded.avatar, avatar), "
+    "error = excluded.error, fetched_at = excluded.fetched_at"
+)
+
+_META = re.compile(r"<meta\s+[^>]*?(?:property|name)=[\"'](og:title|og:image|twitter:title)[\"'][^>]*?>", re.I)
+_CONTENT = re.compile(r"content=[\"']([^\"']*)[\"']", re.I)
+# "표시 이름 (@ID) 's Live - TwitCasting" 형식에서 이름만
+_TITLE_SUFFIX = re.compile(r"\s*(?:\(@[^)]*\).*|[-|｜]\s*TwitCasting.*)$", re.I)
+
+
+def fetch_profile(user_id: str, timeout: float = 10.0) -> dict:
+    """
+    채널 페이지에서 표시 이름과 프로필 이미지를 가져옵니다.
+
+    Returns:
+        dict: {"status", "display_name", "avatar", "error"}
+    """
+    request = urllib.request.Request(
+        f"https://twitcasting.tv/{quote(user_id, safe=':')}",
+        headers={"User-Agent": "Mozilla/5.0", "Accept-Language": "ja,en;q=0.8"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            page = response.read(512 * 1024).decode("utf-8", errors="ignore")
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            return {"status": STATUS_NOT_FOUND, "display_name": None, "avatar": None, "error": "HTTP 404"}
+        return {"status": STATUS_ERROR, "display_name": None, "avatar": None, "error": f"HTTP {e.code}"}
+    except (OSError, ValueError) as e:
+        return {"status": STATUS_ERROR, "display_name": None, "avatar": None, "error": str(e)}
+
+    meta = {}
+    for match in _META.finditer(page):
+        content = _CONTENT.search(match.group(0))
+        if content:
+            meta.setdefault(match.group(1).lower(), html.unescape(content.group(1)).strip())
+    title = meta.get("og:title") or meta.get("twitter:title") or ""
+    return {
+        "status": STATUS_OK,
+        "display_name": _TITLE_SUFFIX.sub("", title) or None,
+        "avatar": meta.get("og:image") or None,
+        "error": None,
+    }
+
+
+class ChannelDirectory:
+    """SQLite 기반 채널 정보 캐시"""
+
+    def __init__(
+        self,
+        db_path: str = "channels.db",
+        ttl: float = 7 * 86400,
+        missing_ttl: float = 86400,
+        error_ttl: float = 3600,
+        concurrency: int = 8,
+        timeout: float = 10.0,
+        fetch=None
+    ):
+        """
+        Args:
+            db_path: 데이터베이스 파일 경로
+            ttl: 정상 채널 정보의 유효 기간 (초)
+            missing_ttl: 없는 채널 결과의 유효 기간 (초)
+            error_ttl: 일시 오류 결과의 유효 기간 (초)
+            concurrency: 동시에 가져올 최대 채널 수
+            timeout: 채널 하나를 가져오는 제한 시간 (초)
+            fetch: (user_id, timeout)을 받아 fetch_profile 형식 dict를 반환하는 함수 (기본: fetch_profile)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttls = {STATUS_OK: ttl, STATUS_NOT_FOUND: missing_ttl, STATUS_ERROR: error_ttl}
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.fetch = fetch or fetch_profile
+        self._write_lock = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10.0)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # === 조회 ===
+
+    def cached(self, user_ids: list[str]) -> dict:
+        """저장된 채널 정보 (유효 기간과 무관, 없는 채널은 빠짐)"""
+        result = {}
+        with closing(self._connect()) as conn:
+            # SQLite 변수 개수 제한보다 작게 나누어 조회
+            for start in range(0, len(user_ids), 500):
+                chunk = user_ids[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT * FROM channels WHERE user_id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for row in rows:
+                    result[row["user_id"]] = dict(row)
+        # 입력한 대소문자로 돌려줌
+        lowered = {user_id.lower(): info for user_id, info in result.items()}
+        return {user_id: lowered[user_id.lower()] for user_id in user_ids if user_id.lower() in lowered}
+
+    def is_fresh(self, info: dict, now: float = None) -> bool:
+        """유효 기간이 남은 정보인지"""
+        now = time.time() if now is None else now
+        return now - info["fetched_at"] < self.ttls.get(info["status"], 0)
+
+    def resolve_many(self, user_ids: list[str], refresh: bool = False, progress=None, cancel=None) -> dict:
+        """
+        채널 정보를 돌려줍니다. 유효 기간이 지났거나 없는 채널만 병렬로 가져와 저장합니다.
+
+        Args:
+            user_ids: 채널 ID 목록 (정규화된 ID)
+            refresh: True면 유효 기간과 무관하게 모두 다시 가져옴
+            progress: 채널 하나를 가져올 때마다 호출할 콜백 (완료 수, 가져올 전체 수)
+            cancel: set()되면 남은 채널을 가져오지 않는 threading.Event
+
+        Returns:
+            dict: {user_id: {"status", "display_name", "avatar", "last_live_at", "error", "fetched_at"}}
+                취소로 가져오지 못한 채널은 빠짐
+        """
+        result = self.cached(user_ids)
+        now = time.time()
+        stale = [user_id for user_id in user_ids
+                 if refresh or user_id not in result or not self.is_fresh(result[user_id], now)]
+        if not stale:
+            return result
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(stale)), thread_name_prefix="channel-fetch") as pool:
+            futures = {pool.submit(self._fetch_one, user_id, cancel): user_id for user_id in stale}
+            for future in as_completed(futures):
+                user_id = futures[future]
+                info = future.result()
+                done += 1
+                if info is None:
+                    result.pop(user_id, None)
+                else:
+                    self._store(user_id, info)
+                    previous = result.get(user_id, {})
+                    result[user_id] = {
+                        **info,
+                        "display_name": info["display_name"] or previous.get("display_name"),
+                        "avatar": info["avatar"] or previous.get("avatar"),
+                        "last_live_at": previous.get("last_live_at"),
+                    }
+                if progress:
+                    progress(done, len(stale))
+        return result
+
+    def _fetch_one(self, user_id: str, cancel) -> dict | None:
+        if cancel is not None and cancel.is_set():
+            return None
+        try:
+            info = self.fetch(user_id, self.timeout)
+        except Exception as e:
+            info = {"status": STATUS_ERROR, "display_name": None, "avatar": None, "error": str(e)}
+        info["fetched_at"] = time.time()
+        return info
+
+    # === 기록 ===
+
+    def _store(self, user_id: str, info: dict):
+        with self._write_lock, closing(self._connect()) as conn, conn:
+            conn.execute(_UPSERT, (
+                user_id, info["status"], info["display_name"], info["avatar"], info["error"], info["fetched_at"]
+            ))
+
+    def mark_live(self, user_id: str, when: datetime):
+        """방송 시작을 감지한 시각을 기록합니다 (방송 중이므로 있는 채널로 저장)."""
+        with self._write_lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO channels (user_id, status, last_live_at, fetched_at) VALUES (?, ?, ?, 0) "
+                "ON CONFLICT(user_id) DO UPDATE SET last_live_at = excluded.last_live_at",
+                (user_id, STATUS_OK, when.isoformat(timespec="seconds"))
+            )
+
+
+def format_channel(user_id: str, info: dict | None) -> str:
+    """채널 한 줄 표시 (가져오기 결과 목록용)"""
+    if info is None:
+        return f"⏸️ {user_id}  (확인 취소)"
+    if info["status"] == STATUS_NOT_FOUND:
+        return f"❌ {user_id}  (없는 채널)"
+    if info["status"] == STATUS_ERROR:
+        return f"⚠️ {user_id}  (확인 실패: {info.get('error')})"
+    name = info.get("display_name") or "-"
+    last_live = info.get("last_live_at") or "-"
+    return f"✅ {user_id}  {name}  (마지막 방송: {last_live})"
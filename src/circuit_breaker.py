@@ -0,0 +1,201 @@
+"""채널별 / 전역 서킷 브레이커 모듈
+
+확인 실패를 오류 분류별로 집계하여, 실패가 이어지는 채널은 지수 백오프로 확인을 중단(open)하고
+대기 시간이 지나면 한 번만 시험 확인(half-open)합니다. 사이트가 요청 제한(429)을 걸면
+전역 브레이커가 모든 채널의 확인을 일시 중단합니다.
+"""
+
+import random
+import threading
+import time
+
+from .stream_checker import (
+    ERROR_BLOCKED,
+    ERROR_EXTRACTOR,
+    ERROR_NETWORK,
+    ERROR_NOT_FOUND,
+    ERROR_RATE_LIMITED,
+    ERROR_TIMEOUT,
+    ERROR_UNKNOWN,
+)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# {분류: (연속 실패 허용 횟수, 첫 중단 시간(초))}
+# 일시적 오류는 몇 번 재시도 후 짧게, 채널 삭제/차단처럼 지속되는 오류는 바로 길게 중단
+ERROR_POLICIES = {
+    ERROR_NETWORK: (3, 30),
+    ERROR_TIMEOUT: (3, 30),
+    ERROR_UNKNOWN: (3, 60),
+    ERROR_EXTRACTOR: (2, 300),
+    ERROR_NOT_FOUND: (1, 600),
+    ERROR_BLOCKED: (1, 600),
+    ERROR_RATE_LIMITED: (1, 60),
+}
+
+
+class CircuitBreaker:
+    """지수 백오프와 half-open 시험 확인을 지원하는 서킷 브레이커"""
+
+    def __init__(self, max_delay: float = 3600.0):
+        """
+        Args:
+            max_delay: 최대 중단 시간 (초)
+        """
+        self.max_delay = max_delay
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_count = 0
+        self.last_kind = None
+        self.retry_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """지금 확인해도 되는지 반환합니다 (half-open에서는 한 번만 허용)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() < self.retry_at:
+                    return False
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            # HALF_OPEN: 시험 확인은 동시에 하나만
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def release_probe(self):
+        """허용받은 시험 확인을 수행하지 않았거나 결과를 반영하지 않을 때 호출합니다."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def remaining(self) -> float:
+        """다시 확인할 수 있을 때까지 남은 시간 (초)"""
+        return max(0.0, self.retry_at - time.monotonic()) if self.state == OPEN else 0.0
+
+    def record_success(self):
+        """확인 성공 - 브레이커를 닫고 카운터를 초기화합니다."""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_count = 0
+            self.last_kind = None
+            self._probe_in_flight = False
+
+    def record_failure(self, kind: str) -> float | None:
+        """
+        확인 실패를 기록합니다.
+
+        Returns:
+            float | None: 이번 실패로 브레이커가 열렸으면 중단 시간 (초)
+        """
+        threshold, base_delay = ERROR_POLICIES.get(kind, ERROR_POLICIES[ERROR_UNKNOWN])
+        with self._lock:
+            self.failures += 1
+            self.last_kind = kind
+            self._probe_in_flight = False
+
+            if self.state != HALF_OPEN and self.failures < threshold:
+                return None
+
+            # half-open 시험 실패 또는 허용 횟수 초과 -> 중단 시간을 두 배씩 늘려서 다시 열기
+            self.opened_count += 1
+            delay = min(base_delay * (2 ** (self.opened_count - 1)), self.max_delay)
+            delay *= random.uniform(0.9, 1.1)  # 여러 채널이 동시에 재시도하지 않도록 분산
+            self.state = OPEN
+            self.retry_at = time.monotonic() + delay
+            return delay
+
+
+class BreakerRegistry:
+    """채널별 브레이커와 요청 제한용 전역 브레이커 관리"""
+
+    def __init__(self, max_delay: float = 3600.0):
+        self.max_delay = max_delay
+        self.global_breaker = CircuitBreaker(max_delay=max_delay)
+        self.channels = {}  # {user_id: CircuitBreaker}
+        self._lock = threading.Lock()
+
+    def channel(self, user_id: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self.channels.get(user_id)
+            if breaker is None:
+                breaker = self.channels[user_id] = CircuitBreaker(max_delay=self.max_delay)
+            return breaker
+
+    def before_probe(self, user_id: str) -> tuple[bool, str, float]:
+        """
+        확인 전에 호출하여 확인 가능 여부를 반환합니다.
+
+        Returns:
+            tuple[bool, str, float]: (허용 여부, 중단 사유, 남은 시간(초))
+        """
+        global_checked = self.global_breaker.state != CLOSED
+        if global_checked and not self.global_breaker.allow():
+            return False, "사이트 요청 제한 (전체 일시 중단)", self.global_breaker.remaining()
+
+        breaker = self.channel(user_id)
+        if not breaker.allow():
+            if global_checked:
+                self.global_breaker.release_probe()
+            return False, breaker.last_kind or ERROR_UNKNOWN, breaker.remaining()
+        return True, "", 0.0
+
+    def cancel_probe(self, user_id: str):
+        """before_probe로 허용받았지만 확인하지 않았을 때 시험 확인 자리를 반납합니다."""
+        self.channel(user_id).release_probe()
+        if self.global_breaker.state != CLOSED:
+            self.global_breaker.release_probe()
+
+    def after_probe(self, user_id: str, status: dict, global_scope: bool = True) -> tuple[str, float] | None:
+        """
+        확인 결과를 반영합니다.
+
+        Args:
+            user_id: 채널 ID
+            status: check_stream_status 결과
+            global_scope: False이면 요청 제한을 전역 브레이커에 반영하지 않음
+                          (출구 분산 사용 시 다른 출구가 남아 있는 경우)
+
+        Returns:
+            tuple[str, float] | None: 브레이커가 열렸으면 ("global" | "channel", 중단 시간)
+        """
+        kind = status.get("error_kind") if "error" in status else None
+        breaker = self.channel(user_id)
+
+        if kind is None:
+            breaker.record_success()
+            if self.global_breaker.state != CLOSED:
+                self.global_breaker.record_success()
+            return None
+
+        if kind == ERROR_RATE_LIMITED:
+            # 요청 제한은 채널 문제가 아니므로 전역 브레이커에만 반영
+            breaker.release_probe()
+            if not global_scope:
+                if self.global_breaker.state != CLOSED:
+                    self.global_breaker.release_probe()
+                return None
+            delay = self.global_breaker.record_failure(kind)
+            return ("global", delay) if delay else None
+
+        if self.global_breaker.state != CLOSED:
+            # 사이트가 응답했으면 요청 제한은 풀린 것으로 판단, 네트워크 오류는 판단 보류
+            if kind in (ERROR_NETWORK, ERROR_TIMEOUT, ERROR_UNKNOWN):
+                self.global_breaker.release_probe()
+            else:
+                self.global_breaker.record_success()
+
+        delay = breaker.record_failure(kind)
+        return ("channel", delay) if delay else None
+
+    def remove(self, user_id: str):
+        """채널 감시 중지 시 브레이커를 제거합니다."""
+        with self._lock:
+            self.channels.pop(user_id, None)
@@ -0,0 +1,215 @@
+"""라이브 댓글 기록 모듈
+
+방송 중인 채널의 댓글을 영상 옆 `{파일명}.comments.jsonl.gz`에 기록합니다.
+
+- 댓글 스트림은 푸시 이벤트와 같은 형식의 중계 서버에서 받으며, 연결 하나가 여러 채널을 담당
+  (GET {endpoint}?channels=id1,id2,... / SSE 또는 NDJSON)
+  댓글 이벤트: ``{"user_id", "type": "comment", "id", "author", "message", "created_at"}``
+- 파일은 추가 전용 gzip (기록할 때마다 gzip 멤버 하나를 덧붙임, `gzip.open`으로 한 번에 읽힘)
+- 각 줄의 `t`는 녹화 시작 시각 기준 경과 시간 (초, 녹화 전 댓글은 음수)
+- 채널별 버퍼 크기가 정해져 있어 댓글 속도와 무관하게 메모리 사용량 일정 (초과분은 버리고 개수 기록)
+"""
+
+import gzip
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+from .event_detector import LiveEventSubscriber
+from .fanout import build_output_base
+
+
+COMMENTS_SUFFIX = ".comments.jsonl.gz"
+
+
+def _event_time(value) -> float | None:
+    """댓글 작성 시각을 epoch 초로 변환합니다 (epoch 초/밀리초 또는 ISO 문자열)."""
+    if isinstance(value, (int, float)):
+        return value / 1000 if value > 1e11 else float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+class _CommentSession:
+    """방송 하나의 댓글 버퍼와 기록 파일"""
+
+    def __init__(self, user_id: str, probe_info: dict, max_buffer: int):
+        self.user_id = user_id
+        self.probe_info = probe_info or {}
+        self.opened_at = time.time()
+        self.base = None  # 녹화 시작 시각 (epoch 초)
+        self.path = None
+        self.buffer = deque(maxlen=max_buffer)  # [(작성 시각, id, 작성자, 내용)]
+        self.recent_ids = deque(maxlen=max_buffer)
+        self.recent_set = set()
+        self.written = 0
+        self.dropped = 0
+        self.write_lock = threading.Lock()  # 주기 기록과 종료 시 기록이 겹치지 않도록
+
+
+class CommentRecorder:
+    """채널별 라이브 댓글 기록 관리 클래스"""
+
+    def __init__(
+        self,
+        endpoint: str,
+        get_save_dir,
+        locate=None,
+        batch_size: int = 50,
+        flush_interval: float = 5.0,
+        max_buffer: int = 2000,
+        locate_timeout: float = 60.0
+    ):
+        """
+        Args:
+            endpoint: 댓글 중계 서버 URL
+            get_save_dir: 현재 저장 경로를 반환하는 함수
+            locate: 채널의 (녹화 파일 경로, 녹화 시작 epoch 초)를 반환하는 함수 (모르면 None)
+            batch_size: 연결 하나가 담당하는 최대 채널 수
+            flush_interval: 버퍼를 파일에 기록하는 주기 (초)
+            max_buffer: 채널별 최대 버퍼 댓글 수 (넘으면 오래된 댓글부터 버림)
+            locate_timeout: 녹화 파일 위치를 기다리는 최대 시간 (초). 지나면 녹화 경로 형식으로 직접 만듦
+        """
+        self.get_save_dir = get_save_dir
+        self.locate = locate or (lambda user_id: (None, None))
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.locate_timeout = locate_timeout
+
+        self.sessions = {}  # {user_id: _CommentSession}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._subscriber = LiveEventSubscriber(endpoint, on_event=self.on_event, batch_size=batch_size)
+        self._thread = threading.Thread(target=self._writer, name="comment-writer", daemon=True)
+        self._thread.start()
+
+    # === 세션 ===
+
+    def start(self, user_id: str, probe_info: dict = None):
+        """방송 시작 시 댓글 기록을 시작합니다."""
+        with self._lock:
+            if user_id in self.sessions:
+                return
+            self.sessions[user_id] = _CommentSession(user_id, probe_info, self.max_buffer)
+        self._subscriber.subscribe(user_id)
+
+    def stop(self, user_id: str) -> dict | None:
+        """
+        방송 종료 시 남은 댓글을 기록하고 세션을 닫습니다.
+
+        Returns:
+            dict | None: {"path", "written", "dropped"}
+        """
+        self._subscriber.unsubscribe(user_id)
+        with self._lock:
+            session = self.sessions.pop(user_id, None)
+        if session is None:
+            return None
+        self._flush(session, final=True)
+        return {"path": session.path, "written": session.written, "dropped": session.dropped}
+
+    def on_event(self, user_id: str, event: dict):
+        """중계 서버 이벤트 콜백 (구독 스레드에서 호출됨)"""
+        if event.get("type", "comment") != "comment" or "message" not in event:
+            return
+        received = time.time()
+        with self._lock:
+            session = self.sessions.get(user_id)
+            if session is None:
+                return
+            comment_id = event.get("id")
+            if comment_id is not None:
+                # 재연결 시 중계 서버가 최근 댓글을 다시 보내도 한 번만 기록
+                if comment_id in session.recent_set:
+                    return
+                if len(session.recent_ids) == session.recent_ids.maxlen:
+                    session.recent_set.discard(session.recent_ids[0])
+                session.recent_ids.append(comment_id)
+                session.recent_set.add(comment_id)
+            if len(session.buffer) == session.buffer.maxlen:
+                session.dropped += 1
+            author = event.get("author")
+            if isinstance(author, dict):
+                author = author.get("screen_name") or author.get("name") or author.get("id")
+            session.buffer.append((
+                _event_time(event.get("created_at")) or received,
+                comment_id,
+                author,
+                event.get("message"),
+            ))
+
+    # === 기록 ===
+
+    def _resolve(self, session: _CommentSession, final: bool) -> bool:
+        """기록 파일 경로와 기준 시각을 정합니다 (녹화 파일 옆, 녹화 시작 기준)."""
+        if session.path is not None:
+            return True
+        media_path, started_at = self.locate(session.user_id)
+        if media_path:
+            media_path = Path(media_path)
+            session.path = media_path.with_name(media_path.stem + COMMENTS_SUFFIX)
+            session.base = started_at or session.opened_at
+            return True
+        if not final and time.time() - session.opened_at < self.locate_timeout:
+            return False
+        # 녹화하지 않는 방송: 녹화 경로 형식으로 직접 만듦
+        base_path = build_output_base(Path(self.get_save_dir()), session.user_id, session.probe_info)
+        session.path = base_path.with_name(base_path.name + COMMENTS_SUFFIX)
+        session.base = started_at or session.opened_at
+        return True
+
+    def _flush(self, session: _CommentSession, final: bool = False):
+        with session.write_lock:
+            self._write(session, final)
+
+    def _write(self, session: _CommentSession, final: bool):
+        with self._lock:
+            if not session.buffer or not self._resolve(session, final):
+                return
+            items = list(session.buffer)
+            session.buffer.clear()
+
+        lines = []
+        if session.written == 0:
+            lines.append(json.dumps({
+                "user_id": session.user_id,
+                "movie_id": session.probe_info.get("movie_id"),
+                "base": round(session.base, 3),
+            }, ensure_ascii=False))
+        for created, comment_id, author, message in items:
+            lines.append(json.dumps(
+                {"t": round(created - session.base, 3), "id": comment_id, "a": author, "m": message},
+                ensure_ascii=False, separators=(",", ":")
+            ))
+
+        try:
+            session.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(session.path, "ab") as f:
+                f.write(gzip.compress(("\n".join(lines) + "\n").encode("utf-8")))
+            session.written += len(items)
+        except OSError:
+            session.dropped += len(items)
+
+    def _writer(self):
+        while not self._stop_event.wait(self.flush_interval):
+            with self._lock:
+                sessions = list(self.sessions.values())
+            for session in sessions:
+                self._flush(session)
+
+    def close(self):
+        """모든 세션을 기록하고 연결을 종료합니다."""
+        self._stop_event.set()
+        self._subscriber.close()
+        with self._lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for session in sessions:
+            self._flush(session, final=True)
@@ -0,0 +1,260 @@
+"""푸시 기반 방송 시작 감지 모듈
+
+채널 묶음(batch)마다 이벤트 서버에 장시간 유지되는 HTTP 스트림 연결을 하나씩 열고,
+방송 시작/종료 이벤트가 도착하는 즉시 콜백을 호출합니다.
+주기적인 check_stream_status 확인은 느린 보정(reconciliation) 용도로 유지됩니다.
+
+이벤트 스트림 형식 (GET {endpoint}?channels=id1,id2,...):
+    - Server-Sent Events: ``data: {"user_id": "...", "is_live": true}``
+    - 또는 줄 단위 JSON (NDJSON): ``{"user_id": "...", "is_live": true}``
+    - ``:`` 로 시작하는 줄과 빈 줄은 하트비트로 무시
+    - SSE ``id:`` 필드가 있으면 재연결 시 ``Last-Event-ID`` 헤더로 보내 놓친 이벤트를 다시 받음
+
+구독 목록은 연결 URL에 포함되므로, 구독 변경이 다른 채널의 이벤트를 끊지 않도록:
+    - 구독 해제는 연결을 유지한 채 해당 채널의 이벤트만 전달하지 않음 (다시 구독하면 그대로 사용)
+    - 채널 추가는 rebuild_delay 동안 모아서 묶음마다 한 번만 새 연결로 바꾸고,
+      새 연결이 열린 뒤 기존 연결을 닫음 (중복 이벤트는 받는 쪽에서 id로 걸러냄)
+"""
+
+import json
+import threading
+import urllib.request
+from urllib.parse import urlencode
+
+
+class _BatchConnection:
+    """채널 묶음 하나에 대한 이벤트 스트림 연결"""
+
+    def __init__(self, endpoint: str, channels: tuple, on_event, read_timeout: float, max_backoff: float,
+                 last_event_id: str = None):
+        self.endpoint = endpoint
+        self.channels = channels  # 연결 URL에 포함된 채널
+        self.active = set(channels)  # 이벤트를 전달할 채널 (구독 해제된 채널은 연결을 유지한 채 빠짐)
+        self.on_event = on_event
+        self.read_timeout = read_timeout
+        self.max_backoff = max_backoff
+        self.last_event_id = last_event_id
+        self.connected = False
+        self.opened = threading.Event()  # 처음 연결되면 set
+        self.retiring = []  # 이 연결이 열리면 닫을 이전 구성의 연결 (열리기 전까지 이벤트를 대신 받음)
+        self._stop_event = threading.Event()
+        self._response = None
+        self._thread = threading.Thread(target=self._run, name=f"event-batch-{channels[0]}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        response = self._response
+        if response is not None:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+    @property
+    def url(self) -> str:
+        separator = "&" if "?" in self.endpoint else "?"
+        return f"{self.endpoint}{separator}{urlencode({'channels': ','.join(self.channels)})}"
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            try:
+                headers = {"Accept": "text/event-stream, application/x-ndjson"}
+                if self.last_event_id:
+                    headers["Last-Event-ID"] = self.last_event_id
+                request = urllib.request.Request(self.url, headers=headers)
+                with urllib.request.urlopen(request, timeout=self.read_timeout) as response:
+                    self._response = response
+                    self.connected = True
+                    self.opened.set()
+                    self._retire()
+                    backoff = 1.0
+                    for raw_line in response:
+                        if self._stop_event.is_set():
+                            break
+                        self._handle_line(raw_line)
+            except Exception:
+                # 연결 실패 / 읽기 타임아웃 / 서버 종료 -> 재연결
+                pass
+            finally:
+                self._response = None
+                self.connected = False
+
+            self._stop_event.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def _retire(self):
+        retiring, self.retiring = self.retiring, []
+        for connection in retiring:
+            connection.stop()
+
+    def _handle_line(self, raw_line: bytes):
+        line = raw_line.decode("utf-8", errors="ignore").strip()
+        if not line or line.startswith(":"):
+            return
+
+        # SSE의 data 필드와 id 필드만 사용 (event/retry 필드는 무시)
+        if line.startswith("id:"):
+            self.last_event_id = line[3:].strip() or None
+            return
+        if line.startswith("data:"):
+            line = line[5:].strip()
+        elif not line.startswith("{"):
+            return
+
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return
+
+        user_id = event.get("user_id")
+        if user_id in self.active and self.on_event:
+            self.on_event(user_id, event)
+
+
+class LiveEventSubscriber:
+    """채널 묶음 단위로 이벤트 스트림을 구독하는 클래스"""
+
+    def __init__(
+        self,
+        endpoint: str,
+        on_event=None,
+        batch_size: int = 50,
+        read_timeout: float = 90.0,
+        max_backoff: float = 60.0,
+        rebuild_delay: float = 0.5
+    ):
+        """
+        Args:
+            endpoint: 이벤트 서버 URL (예: http://127.0.0.1:8765/events)
+            on_event: 이벤트 콜백 (user_id, event dict) - 구독 스레드에서 호출됨
+            batch_size: 연결 하나가 담당하는 최대 채널 수
+            read_timeout: 이 시간 동안 아무 데이터(하트비트 포함)도 없으면 재연결 (초)
+            max_backoff: 재연결 대기 시간 상한 (초)
+            rebuild_delay: 채널 추가를 모아서 연결을 다시 만들기까지 기다리는 시간 (초)
+        """
+        self.endpoint = endpoint
+        self.on_event = on_event
+        self.batch_size = max(1, batch_size)
+        self.read_timeout = read_timeout
+        self.max_backoff = max_backoff
+        self.rebuild_delay = rebuild_delay
+        self.connections = []  # [_BatchConnection]
+        self._pending = []  # 아직 연결에 넣지 않은 구독 (입력 순서)
+        self._timer = None
+        self._lock = threading.Lock()
+
+    @property
+    def channels(self) -> set:
+        """구독 중인 채널 목록 (연결 대기 중인 채널 포함)"""
+        with self._lock:
+            return {user_id for c in self.connections for user_id in c.active} | set(self._pending)
+
+    def _replace(self, index: int, channels: tuple):
+        """
+        묶음 하나를 새 채널 구성의 연결로 바꿉니다. 새 연결이 열린 뒤 기존 연결을 닫아
+        묶음의 다른 채널 이벤트가 끊기지 않게 하고, 마지막 이벤트 id부터 이어 받습니다.
+        """
+        old = self.connections[index]
+        new = _BatchConnection(
+            self.endpoint, channels, self.on_event, self.read_timeout, self.max_backoff, old.last_event_id
+        )
+        # 기존 연결이 아직 열리지 않은 교체 연결이면 그 연결이 대신하던 연결도 함께 넘겨받음
+        new.retiring = old.retiring + [old]
+        old.retiring = []
+        # 새 연결이 열리기 전까지는 기존 연결이 계속 이벤트를 전달
+        self.connections[index] = new
+        new.start()
+
+    def _open(self, channels: tuple) -> _BatchConnection:
+        connection = _BatchConnection(
+            self.endpoint, channels, self.on_event, self.read_timeout, self.max_backoff
+        )
+        connection.start()
+        return connection
+
+    def _add_pending(self, user_id: str) -> bool:
+        """구독할 채널을 대기 목록에 넣습니다 (잠금 안에서 호출). 이미 구독 중이면 False."""
+        if user_id in self._pending or any(user_id in c.active for c in self.connections):
+            return False
+        for connection in self.connections:
+            if user_id in connection.channels:
+                # 구독 해제 후에도 연결에 남아 있는 채널 - 다시 연결하지 않고 전달만 재개
+                connection.active.add(user_id)
+                return False
+        self._pending.append(user_id)
+        return True
+
+    def _flush(self):
+        """대기 중인 구독을 묶음마다 한 번의 연결 교체 / 새 연결로 반영합니다."""
+        with self._lock:
+            self._timer = None
+            pending, self._pending = self._pending, []
+            for index, connection in enumerate(list(self.connections)):
+                if not pending:
+                    break
+                room = self.batch_size - len(connection.active)
+                if room <= 0:
+                    continue
+                added, pending = pending[:room], pending[room:]
+                # 구독 해제된 채널은 이번 재구성에서 뺌
+                kept = tuple(c for c in connection.channels if c in connection.active)
+                self._replace(index, kept + tuple(added))
+            for start in range(0, len(pending), self.batch_size):
+                self.connections.append(self._open(tuple(pending[start:start + self.batch_size])))
+
+    def subscribe(self, user_id: str):
+        """
+        채널 구독을 추가합니다. 여유가 있는 기존 묶음에 우선 배정하며,
+        rebuild_delay 동안 들어온 구독을 모아서 연결을 한 번만 바꿉니다.
+        """
+        with self._lock:
+            if not self._add_pending(user_id) or self._timer is not None:
+                return
+            self._timer = threading.Timer(self.rebuild_delay, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def subscribe_many(self, user_ids):
+        """여러 채널을 한 번에 구독합니다 (기다리지 않고 바로 반영)."""
+        with self._lock:
+            for user_id in user_ids:
+                self._add_pending(user_id)
+            if self._timer is not None:
+                self._timer.cancel()
+        self._flush()
+
+    def unsubscribe(self, user_id: str):
+        """채널 구독을 해제합니다 (묶음의 다른 채널이 있으면 연결은 유지)."""
+        with self._lock:
+            if user_id in self._pending:
+                self._pending.remove(user_id)
+                return
+            for index, connection in enumerate(self.connections):
+                if user_id in connection.active:
+                    connection.active.discard(user_id)
+                    if not connection.active:
+                        connection.stop()
+                        connection._retire()
+                        del self.connections[index]
+                    return
+
+    def connected_count(self) -> int:
+        """현재 연결된 스트림 수를 반환합니다."""
+        with self._lock:
+            return sum(1 for c in self.connections if c.connected)
+
+    def close(self):
+        """모든 연결을 종료합니다."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending.clear()
+            for connection in self.connections:
+                connection.stop()
+                connection._retire()
+            self.connections.clear()
@@ -0,0 +1,434 @@
+"""구조화 로그 저장 모듈
+
+GUI 로그 창과 별도로 모든 감시/녹화 이벤트를 JSON lines 파일에 기록합니다.
+
+- 기록은 큐에 넣기만 하고 백그라운드 스레드가 묶어서 파일에 씀
+- 현재 파일이 일정 크기를 넘으면 회전하고, 회전된 파일은 블록 단위 gzip 멤버로 압축
+- 블록마다 시간 범위 / 최고 심각도 / 채널 목록을 SQLite에 색인하여,
+  검색 시 조건에 맞는 블록만 압축 해제
+"""
+
+import gzip
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+_CURRENT = "current.jsonl"
+_PENDING = re.compile(r"^pending-(\d+)\.jsonl$")
+_SEGMENT = re.compile(r"^segment-(\d+)\.jsonl\.gz$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    start_ts REAL,
+    end_ts REAL,
+    lines INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS blocks (
+    id INTEGER PRIMARY KEY,
+    segment_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    max_level INTEGER NOT NULL,
+    lines INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_blocks_time ON blocks(end_ts, start_ts);
+
+CREATE TABLE IF NOT EXISTS block_channels (
+    block_id INTEGER NOT NULL,
+    channel TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_block_channels ON block_channels(channel, block_id);
+"""
+
+
+def _matches(record: dict, channel: str, since: float, until: float, min_level: int, text: str) -> bool:
+    if channel and record.get("channel") != channel:
+        return False
+    ts = record.get("ts", 0)
+    if since and ts < since:
+        return False
+    if until and ts > until:
+        return False
+    if min_level and LEVELS.get(record.get("level"), 0) < min_level:
+        return False
+    if text and text not in record.get("msg", ""):
+        return False
+    return True
+
+
+class EventLogReader:
+    """로그 검색 전용 (쓰기/회전/압축 스레드 없음, 실행 중인 프로그램의 로그를 명령줄에서 읽을 때 사용)"""
+
+    def __init__(self, directory: str = "logs"):
+        """
+        Args:
+            directory: 로그 디렉토리
+        """
+        self.directory = Path(directory)
+        self.index_path = self.directory / "index.db"
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.index_path, timeout=10.0)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _pending_files(self) -> list[tuple[int, Path]]:
+        """회전 후 아직 압축하지 않은 파일 [(순번, 경로)] (오래된 순)"""
+        pending = []
+        for entry in os.scandir(self.directory):
+            match = _PENDING.match(entry.name)
+            if match:
+                pending.append((int(match.group(1)), Path(entry.path)))
+        return sorted(pending)
+
+    # === 검색 ===
+
+    def search(self, channel: str = None, since: float = None, until: float = None, level: str = None,
+               text: str = None, limit: int = 1000) -> list[dict]:
+        """
+        조건에 맞는 로그를 최신순으로 찾습니다.
+
+        Args:
+            channel: 채널 ID
+            since: 시작 시각 (epoch 초)
+            until: 끝 시각 (epoch 초)
+            level: 최소 심각도 (debug, info, warning, error)
+            text: 메시지 검색어 (부분 일치)
+            limit: 최대 결과 수
+
+        Returns:
+            list[dict]: 최신순 로그 목록
+        """
+        min_level = LEVELS.get(level, 0) if level else 0
+        results = []
+
+        def scan(lines):
+            for line in reversed(lines):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if _matches(record, channel, since, until, min_level, text):
+                    results.append(record)
+                    if len(results) >= limit:
+                        return True
+            return False
+
+        if not self.directory.is_dir():
+            return results
+
+        # 아직 압축되지 않은 파일 (현재 파일, 회전 대기 파일) - 최신순
+        raw_files = [self.directory / _CURRENT] + [path for _, path in reversed(self._pending_files())]
+        for path in raw_files:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    if scan(f.readlines()):
+                        return results
+            except OSError:
+                continue
+
+        # 압축된 블록 중 조건에 맞을 수 있는 블록만 읽기
+        conditions = []
+        params = []
+        if since:
+            conditions.append("b.end_ts >= ?")
+            params.append(since)
+        if until:
+            conditions.append("b.start_ts <= ?")
+            params.append(until)
+        if min_level:
+            conditions.append("b.max_level >= ?")
+            params.append(min_level)
+        if channel:
+            conditions.append("b.id IN (SELECT block_id FROM block_channels WHERE channel = ?)")
+            params.append(channel)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        if not self.index_path.exists():
+            return results
+        with closing(self._connect()) as conn:
+            blocks = conn.execute(
+                f"SELECT s.name, b.offset, b.length FROM blocks b JOIN segments s ON s.id = b.segment_id "
+                f"{where} ORDER BY s.id DESC, b.offset DESC",
+                params
+            ).fetchall()
+
+        handles = {}
+        try:
+            for name, offset, length in blocks:
+                f = handles.get(name)
+                if f is None:
+                    try:
+                        f = handles[name] = open(self.directory / name, "rb")
+                    except OSError:
+                        continue
+                f.seek(offset)
+                try:
+                    lines = gzip.decompress(f.read(length)).decode("utf-8").splitlines()
+                except (OSError, EOFError):
+                    continue
+                if scan(lines):
+                    break
+        finally:
+            for f in handles.values():
+                f.close()
+        return results
+
+
+class EventLog(EventLogReader):
+    """회전/압축/색인을 지원하는 JSON lines 로그"""
+
+    def __init__(
+        self,
+        directory: str = "logs",
+        max_segment_mb: float = 16,
+        keep_segments: int = 100,
+        block_lines: int = 4096,
+        batch_size: int = 500,
+        flush_interval: float = 0.5
+    ):
+        """
+        Args:
+            directory: 로그 디렉토리
+            max_segment_mb: 회전 기준 크기 (MB, 압축 전)
+            keep_segments: 보관할 압축 파일 수 (초과 시 오래된 파일 삭제)
+            block_lines: 압축/색인 블록 하나의 줄 수
+            batch_size: 한 번에 기록할 최대 줄 수
+            flush_interval: 쓰기 대기 최대 시간 (초)
+        """
+        super().__init__(directory)
+        self.max_segment_bytes = int(max_segment_mb * 1024 * 1024)
+        self.keep_segments = keep_segments
+        self.block_lines = block_lines
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._compress_lock = threading.Lock()
+        self._seq = self._last_seq()
+        self.rotate_retry = 30.0  # 회전 실패 후 다시 시도할 때까지의 시간 (초)
+
+        # 이전 실행에서 압축하지 못한 파일 정리
+        threading.Thread(target=self._compress_pending, name="eventlog-compress", daemon=True).start()
+
+        self._thread = threading.Thread(target=self._writer, name="eventlog-writer", daemon=True)
+        self._thread.start()
+
+    def _last_seq(self) -> int:
+        seq = 0
+        for entry in os.scandir(self.directory):
+            match = _PENDING.match(entry.name) or _SEGMENT.match(entry.name)
+            if match:
+                seq = max(seq, int(match.group(1)))
+        return seq
+
+    # === 쓰기 (논블로킹) ===
+
+    def write(self, message: str, level: str = "info", channel: str = None, source: str = "app", **fields):
+        """로그 한 줄을 기록합니다 (큐에 넣기만 하고 바로 반환)."""
+        record = {"ts": time.time(), "level": level, "channel": channel, "source": source, "msg": message}
+        if fields:
+            record.update(fields)
+        self._queue.put(record)
+
+    def _writer(self):
+        """큐에 쌓인 기록을 묶어서 현재 파일에 추가하고, 크기를 넘으면 회전합니다."""
+        current = self.directory / _CURRENT
+        f = self._open_current()
+        retry_at = 0.0
+        try:
+            while not (self._stop_event.is_set() and self._queue.empty()):
+                try:
+                    batch = [self._queue.get(timeout=self.flush_interval)]
+                except queue.Empty:
+                    continue
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                waiters = [item for item in batch if isinstance(item, threading.Event)]
+                lines = [
+                    json.dumps(item, ensure_ascii=False, default=str) + "\n"
+                    for item in batch if not isinstance(item, threading.Event)
+                ]
+                if f is None:
+                    f = self._open_current()
+                if f is not None:
+                    try:
+                        f.writelines(lines)
+                        f.flush()
+                        full = f.tell() >= self.max_segment_bytes
+                    except OSError:
+                        full = False
+
+                    if full and time.monotonic() >= retry_at:
+                        f, rotated = self._rotate(f, current)
+                        if rotated:
+                            threading.Thread(
+                                target=self._compress_pending, name="eventlog-compress", daemon=True
+                            ).start()
+                        else:
+                            retry_at = time.monotonic() + self.rotate_retry
+
+                for waiter in waiters:
+                    waiter.set()
+        finally:
+            if f is not None:
+                f.close()
+
+    def _open_current(self):
+        """현재 파일을 추가 모드로 엽니다 (실패하면 None - 다음 기록 때 다시 시도)."""
+        try:
+            return open(self.directory / _CURRENT, "a", encoding="utf-8")
+        except OSError:
+            return None
+
+    def _rotate(self, f, current: Path):
+        """
+        현재 파일을 회전 대기 파일로 바꿉니다. 실패하면 현재 파일에 계속 씁니다.
+
+        Returns:
+            tuple: (새로 연 현재 파일 | None, 회전 여부)
+        """
+        f.close()
+        try:
+            current.rename(self.directory / f"pending-{self._seq + 1:06d}.jsonl")
+        except OSError:
+            return self._open_current(), False
+        self._seq += 1
+        return self._open_current(), True
+
+    def flush(self, timeout: float = 5.0):
+        """지금까지 기록한 줄이 파일에 쓰일 때까지 기다립니다."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        """남은 기록을 쓰고 스레드를 종료합니다."""
+        self._stop_event.set()
+        self._thread.join(timeout=5.0)
+
+    # === 압축 / 색인 ===
+
+    def _compress_pending(self):
+        """회전된 파일을 블록 단위 gzip 멤버로 압축하고 블록을 색인합니다."""
+        with self._compress_lock:
+            for seq, path in self._pending_files():
+                self._compress(seq, path)
+            self._trim()
+
+    def _compress(self, seq: int, source: Path):
+        name = f"segment-{seq:06d}.jsonl.gz"
+        target = self.directory / name
+        blocks = []
+        total = 0
+
+        with open(source, "r", encoding="utf-8") as src, open(target, "wb") as dst:
+            block = []
+
+            def write_block():
+                records = []
+                for line in block:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        pass
+                data = gzip.compress("".join(block).encode("utf-8"))
+                offset = dst.tell()
+                dst.write(data)
+                timestamps = [record.get("ts", 0) for record in records] or [0]
+                blocks.append({
+                    "offset": offset,
+                    "length": len(data),
+                    "start_ts": min(timestamps),
+                    "end_ts": max(timestamps),
+                    "max_level": max((LEVELS.get(record.get("level"), 0) for record in records), default=0),
+                    "lines": len(block),
+                    "channels": {record["channel"] for record in records if record.get("channel")},
+                })
+
+            for line in src:
+                block.append(line)
+                if len(block) >= self.block_lines:
+                    write_block()
+                    total += len(block)
+                    block = []
+            if block:
+                write_block()
+                total += len(block)
+
+        with closing(self._connect()) as conn, conn:
+            # 이전 압축이 색인까지 쓰고 원본을 지우지 못한 경우, 이전 색인을 블록까지 지우고 다시 씀
+            for (segment_id,) in conn.execute("SELECT id FROM segments WHERE name = ?", (name,)).fetchall():
+                self._delete_segment(conn, segment_id)
+            cursor = conn.execute(
+                "INSERT INTO segments (name, start_ts, end_ts, lines) VALUES (?, ?, ?, ?)",
+                (name, min((b["start_ts"] for b in blocks), default=None),
+                 max((b["end_ts"] for b in blocks), default=None), total)
+            )
+            segment_id = cursor.lastrowid
+            for block in blocks:
+                cursor = conn.execute(
+                    "INSERT INTO blocks (segment_id, offset, length, start_ts, end_ts, max_level, lines) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (segment_id, block["offset"], block["length"], block["start_ts"], block["end_ts"],
+                     block["max_level"], block["lines"])
+                )
+                conn.executemany(
+                    "INSERT INTO block_channels (block_id, channel) VALUES (?, ?)",
+                    [(cursor.lastrowid, channel) for channel in block["channels"]]
+                )
+        source.unlink()
+
+    def _trim(self):
+        """보관 개수를 넘은 오래된 압축 파일과 색인을 삭제합니다."""
+        with closing(self._connect()) as conn, conn:
+            old = conn.execute(
+                "SELECT id, name FROM segments ORDER BY id DESC LIMIT -1 OFFSET ?", (self.keep_segments,)
+            ).fetchall()
+            for segment_id, name in old:
+                self._delete_segment(conn, segment_id)
+                try:
+                    (self.directory / name).unlink()
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _delete_segment(conn: sqlite3.Connection, segment_id: int):
+        """압축 파일 하나의 색인 (채널 목록, 블록, 파일 행)을 삭제합니다."""
+        conn.execute(
+            "DELETE FROM block_channels WHERE block_id IN (SELECT id FROM blocks WHERE segment_id = ?)",
+            (segment_id,)
+        )
+        conn.execute("DELETE FROM blocks WHERE segment_id = ?", (segment_id,))
+        conn.execute("DELETE FROM segments WHERE id = ?", (segment_id,))
+
+
+def format_record(record: dict) -> str:
+    """검색 결과 한 줄 표시 형식"""
+    t = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.get("ts", 0)))
+    channel = f"[{record['channel']}] " if record.get("channel") else ""
+    return f"{t} {record.get('level', 'info').upper():<7} {channel}{record.get('msg', '')}"
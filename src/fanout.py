@@ -0,0 +1,267 @@
+"""단일 다운로드 다중 출력 모듈
+
+yt-dlp가 표준 출력으로 내보내는 스트림(MPEG-TS)을 한 번만 받아서
+원본 복사 ffmpeg와 변환(저해상도/오디오 전용 등) ffmpeg들에 나눠 전달합니다.
+네트워크 사용량은 한 벌이고, 변환 프로세스는 낮은 우선순위로 실행됩니다.
+무결성 목록을 사용하면 원본 ffmpeg 출력을 직접 파일에 쓰면서 해시를 함께 계산합니다.
+"""
+
+import json
+import queue
+import subprocess
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from .integrity import ManifestWriter, TransportStreamMonitor
+from .process_manager import process_manager
+
+
+# 출력 프리셋 (config.json의 channel_outputs에서 이름으로 사용)
+OUTPUT_PRESETS = {
+    "720p": {
+        "ext": "mp4",
+        "args": ["-vf", "scale=-2:720", "-c:v", "libx264", "-preset", "veryfast", "-crf", "26",
+                 "-c:a", "aac", "-b:a", "128k"],
+    },
+    "480p": {
+        "ext": "mp4",
+        "args": ["-vf", "scale=-2:480", "-c:v", "libx264", "-preset", "veryfast", "-crf", "28",
+                 "-c:a", "aac", "-b:a", "96k"],
+    },
+    "audio": {
+        "ext": "m4a",
+        "args": ["-vn", "-c:a", "aac", "-b:a", "128k"],
+    },
+}
+
+_CHUNK_SIZE = 64 * 1024
+_INVALID_CHARS = str.maketrans({c: "_" for c in '\\/:*?"<>|\n\r\t'})
+
+
+def resolve_outputs(specs: list) -> list[dict]:
+    """
+    채널별 출력 설정을 ffmpeg 인자로 변환합니다.
+
+    Args:
+        specs: 프리셋 이름 또는 {"name", "ext", "args"} 딕셔너리 목록
+
+    Returns:
+        list[dict]: [{"name": str, "ext": str, "args": list[str]}]
+    """
+    outputs = []
+    for spec in specs or []:
+        if isinstance(spec, str):
+            preset = OUTPUT_PRESETS.get(spec)
+            if preset:
+                outputs.append({"name": spec, **preset})
+        elif isinstance(spec, dict) and spec.get("name") and spec.get("args"):
+            outputs.append({"name": spec["name"], "ext": spec.get("ext", "mp4"), "args": list(spec["args"])})
+    return outputs
+
+
+def build_output_base(save_dir: Path, user_id: str, probe_info: dict = None) -> Path:
+    """
+    yt-dlp 출력 템플릿과 같은 형식의 저장 경로(확장자 제외)를 만듭니다.
+
+    형식: 저장경로/채널명/[날짜]_제목(ID)/[날짜]_제목(ID)
+    """
+    info = {}
+    if probe_info and probe_info.get("info_json"):
+        try:
+            info = json.loads(probe_info["info_json"])
+        except json.JSONDecodeError:
+            pass
+
+    now = datetime.now()
+    upload_date = info.get("upload_date") or now.strftime("%Y%m%d")
+    title = (info.get("title") or (probe_info or {}).get("title") or user_id).translate(_INVALID_CHARS).strip()
+    movie_id = str(info.get("id") or (probe_info or {}).get("movie_id") or now.strftime("%H%M%S"))
+
+    name = f"[{upload_date}]_{title}({movie_id})"
+    return save_dir / user_id / name / name
+
+
+class _Sink:
+    """ffmpeg 하나에 데이터를 전달하는 출력 (변환 출력은 밀리면 청크를 버림)"""
+
+    def __init__(self, name: str, process: subprocess.Popen, path: Path, lossless: bool, max_chunks: int):
+        self.name = name
+        self.process = process
+        self.path = path
+        self.lossless = lossless
+        self.dropped = 0
+        self.failed = False
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._thread = threading.Thread(target=self._write, name=f"fanout-{name}", daemon=True)
+        self._thread.start()
+
+    def put(self, chunk: bytes):
+        if self.failed:
+            return
+        if self.lossless:
+            # 원본은 절대 버리지 않음
+            self._queue.put(chunk)
+            return
+        try:
+            self._queue.put_nowait(chunk)
+        except queue.Full:
+            # 변환이 밀리면 원본을 지연시키지 않도록 버림 (MPEG-TS는 다음 패킷에서 재동기화)
+            self.dropped += 1
+
+    def close(self):
+        self._queue.put(None)
+
+    def _write(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                break
+            try:
+                self.process.stdin.write(chunk)
+            except (BrokenPipeError, OSError, ValueError):
+                self.failed = True
+                break
+        try:
+            self.process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+    def join(self, timeout: float):
+        self._thread.join(timeout)
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process_manager.kill_tree(self.process)
+            self.process.wait()
+        process_manager.release(self.process)
+
+
+class FanoutPipeline:
+    """yt-dlp 표준 출력을 원본/변환 ffmpeg들로 나눠 전달하는 파이프라인"""
+
+    def __init__(self, source: subprocess.Popen, ffmpeg_path: str, output_base: Path, outputs: list[dict],
+                 max_buffer_mb: int = 64, manifest: bool = False):
+        """
+        Args:
+            source: stdout=PIPE로 실행된 yt-dlp 프로세스
+            ffmpeg_path: ffmpeg 실행 파일 경로
+            output_base: 확장자를 제외한 저장 경로
+            outputs: resolve_outputs 결과 (변환 출력 목록)
+            max_buffer_mb: 변환 출력 하나당 최대 대기 버퍼 (MB)
+            manifest: True이면 원본을 쓰면서 무결성 목록(해시, 타임스탬프 끊김)을 함께 기록
+        """
+        self.source = source
+        self.output_base = output_base
+        self.original_path = output_base.with_name(output_base.name + ".mp4")
+        output_base.parent.mkdir(parents=True, exist_ok=True)
+
+        self.manifest = ManifestWriter(self.original_path) if manifest else None
+        self.stream_monitor = None
+        if self.manifest:
+            self.stream_monitor = self.manifest.stream = TransportStreamMonitor()
+        self.integrity = None  # finish() 후 무결성 목록
+
+        max_chunks = max(1, max_buffer_mb * 1024 * 1024 // _CHUNK_SIZE)
+        self.sinks = []
+        self._writer_thread = None
+        try:
+            self.sinks.append(self._open_sink(
+                ffmpeg_path, "original", self.original_path,
+                # 중단되어도 재생 가능한 fragmented mp4로 원본 복사 (파이프 출력도 가능)
+                ["-c", "copy", "-movflags", "+frag_keyframe+empty_moov"],
+                lossless=True, max_chunks=max_chunks, to_pipe=bool(self.manifest)
+            ))
+            if self.manifest:
+                self._writer_thread = threading.Thread(
+                    target=self._write_original, args=(self.sinks[0].process.stdout,),
+                    name="fanout-writer", daemon=True
+                )
+                self._writer_thread.start()
+            for output in outputs:
+                path = output_base.with_name(f"{output_base.name}.{output['name']}.{output['ext']}")
+                self.sinks.append(self._open_sink(
+                    ffmpeg_path, output["name"], path, output["args"], lossless=False, max_chunks=max_chunks
+                ))
+        except Exception:
+            # 뒤의 ffmpeg 실행에 실패하면 이미 실행한 출력을 남기지 않음
+            self.stop_outputs()
+            raise
+
+        self._thread = threading.Thread(target=self._pump, name="fanout-pump", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _open_sink(ffmpeg_path: str, name: str, path: Path, args: list, lossless: bool, max_chunks: int,
+                   to_pipe: bool = False) -> _Sink:
+        # to_pipe: 파일 대신 표준 출력으로 내보내고 파이프라인이 직접 파일에 씀
+        target = ["-f", "mp4", "pipe:1"] if to_pipe else [str(path)]
+        cmd = [ffmpeg_path, "-hide_banner", "-loglevel", "error", "-y", "-i", "pipe:0", "-map", "0", *args, *target]
+        # 변환은 "encode" 우선순위(녹화보다 낮음)로 실행
+        process = process_manager.popen(
+            "record" if lossless else "encode",
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE if to_pipe else subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        return _Sink(name, process, path, lossless, max_chunks)
+
+    def _write_original(self, stream):
+        """원본 ffmpeg 출력을 파일에 쓰면서 무결성 목록 해시를 계산합니다."""
+        try:
+            with open(self.original_path, "wb") as f:
+                while True:
+                    chunk = stream.read1(_CHUNK_SIZE) if hasattr(stream, "read1") else stream.read(_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    self.manifest.update(chunk)
+        except (OSError, ValueError):
+            pass
+        finally:
+            stream.close()
+
+    def _pump(self):
+        stream = self.source.stdout
+        try:
+            while True:
+                chunk = stream.read1(_CHUNK_SIZE) if hasattr(stream, "read1") else stream.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if self.stream_monitor:
+                    self.stream_monitor.feed(chunk)
+                for sink in self.sinks:
+                    sink.put(chunk)
+        except (OSError, ValueError):
+            pass
+        finally:
+            # yt-dlp 종료 -> 모든 ffmpeg 입력을 닫아 파일 마무리
+            for sink in self.sinks:
+                sink.close()
+
+    def finish(self, timeout: float = 30.0) -> dict:
+        """
+        소스 종료 후 모든 출력이 마무리될 때까지 기다립니다.
+
+        Returns:
+            dict: {출력 이름: 버린 청크 수}
+        """
+        self._thread.join(timeout)
+        for sink in self.sinks:
+            sink.join(timeout)
+        if self._writer_thread:
+            self._writer_thread.join(timeout)
+            self.integrity = self.manifest.finish()
+        return {sink.name: sink.dropped for sink in self.sinks}
+
+    def stop_outputs(self):
+        """모든 출력 프로세스를 즉시 종료합니다 (시작 실패 시 정리용)."""
+        for sink in self.sinks:
+            sink.close()
+            if sink.process.poll() is None:
+                process_manager.kill_tree(sink.process)
+                sink.process.wait()
+            process_manager.release(sink.process)
+        if self._writer_thread:
+            self._writer_thread.join(5)
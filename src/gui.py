@@ -1,7 +1,11 @@
 """트위캐스트 감시 프로그램 GUI 모듈 - 채널별 독립 제어"""
 
 import asyncio
+import re
 import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
 from pathlib import Path
 from tkinter import filedialog
 import pystray
@@ -11,55 +15,90 @@ import customtkinter as ctk
 
 from .recorder import StreamRecorder
 from .stream_checker import check_stream_status
-from .utils import extract_user_id
+from .utils import normalize_user_id, parse_channel_list
 from .config import ConfigManager
-
-
-class ChannelMonitor(ctk.CTkFrame):
-    """개별 채널 감시 UI 컴포넌트"""
-
-    def __init__(self, parent, channel_num: int, gui_instance):
-        super().__init__(parent)
+from .event_detector import LiveEventSubscriber
+from .sharding import LeaseCoordinator
+from .history import HistoryStore
+from .eventlog import EventLog, LEVELS, format_record
+from .gui_bridge import CommandQueue, SettingsStore
+from .library import RecordingLibrary, format_duration, format_row, format_size
+from .channels import ChannelDirectory, STATUS_NOT_FOUND, format_channel
+from .retention import RetentionEngine
+from .backfill import BackfillQueue
+from .comments import CommentRecorder
+from .watchdog import StallWatchdog
+from .standby import StandbyPool, predict_live
+from .admission import AdmissionController, DEGRADE, QUEUE
+from .circuit_breaker import BreakerRegistry
+from .egress import EgressPool
+from .process_manager import process_manager
+from .tracing import tracer, profiler
+
+
+# 로그 메시지에서 채널 번호와 심각도 추정 (구조화 로그용)
+_CHANNEL_TAG = re.compile(r"\[채널(\d+)\]")
+_ERROR_MARKERS = ("❌",)
+_WARNING_MARKERS = ("⚠️", "🚫", "⏸️")
+
+
+class ChannelMonitor:
+    """개별 채널 감시 - 감시 상태는 계속 유지하고, UI는 창을 다시 만들 때마다 현재 상태로 구성"""
+
+    def __init__(self, channel_num: int, gui_instance):
         self.channel_num = channel_num
         self.gui = gui_instance
 
         # 상태 변수
         self.is_monitoring = False
         self.was_live = False
+        self.live_ended_at = None  # 마지막으로 방송 종료를 확인한 시각 (대기 녹화 예측용)
+        self.live_movie_id = None  # 방송 중인 방송 ID (백필 제외용)
+        self.backfill_pending = False  # 첫 확인 후 지난 방송 백필 대기열 추가
         self.monitoring_thread = None
         self.user_id = None
-        
-        self.configure(fg_color=self.gui.colors["navy"])
+        self.loop = None
+        self.wake_event = None
+
+        # UI 상태 (창이 없을 때도 유지)
+        self.url = ""
+        self.display_name = None
+        self.status = ("⚫ 대기", "#95a5a6")
+        self.frame = None
+        self.channel_label = None
+        self.status_label = None
+        self.url_input = None
+        self.toggle_button = None
+
+    def build(self, parent) -> ctk.CTkFrame:
+        """채널 UI 구성 (현재 감시 상태 반영)"""
+        self.frame = ctk.CTkFrame(parent, fg_color=self.gui.colors["navy"])
 
-        self.init_ui()
-
-    def init_ui(self):
-        """채널 UI 초기화"""
         # 채널 번호 표시
         header = ctk.CTkFrame(
-            self, 
+            self.frame, 
             fg_color="transparent",
         )
         header.pack(fill="x", padx=10, pady=(10, 5))
 
-        channel_label = ctk.CTkLabel(
+        self.channel_label = ctk.CTkLabel(
             header,
-            text=f"채널 {self.channel_num}",
+            text=self._label_text(),
             font=ctk.CTkFont(size=13, weight="bold"),
             text_color=self.gui.colors["pale_lavender"]
         )
-        channel_label.pack(side="left")
+        self.channel_label.pack(side="left")
 
         self.status_label = ctk.CTkLabel(
             header,
-            text="⚫ 대기",
+            text=self.status[0],
             font=ctk.CTkFont(size=11),
-            text_color="#95a5a6"
+            text_color=self.status[1]
         )
         self.status_label.pack(side="right")
 
         # URL 입력
-        url_row = ctk.CTkFrame(self, fg_color="transparent")
+        url_row = ctk.CTkFrame(self.frame, fg_color="transparent")
         url_row.pack(fill="x", padx=10, pady=(0, 5))
 
         self.url_input = ctk.CTkEntry(
@@ -69,6 +108,9 @@ class ChannelMonitor(ctk.CTkFrame):
             font=ctk.CTkFont(size=10)
         )
         self.url_input.pack(side="left", fill="x", expand=True, padx=(0, 5))
+        if self.url:
+            self.url_input.insert(0, self.url)
+        self.url_input.bind("<FocusOut>", lambda e: self.gui.save_settings())
 
         # 시작/중지 버튼
         self.toggle_button = ctk.CTkButton(
@@ -86,9 +128,62 @@ class ChannelMonitor(ctk.CTkFrame):
         self.toggle_button.pack(side="right")
 
         # 구분선
-        separator = ctk.CTkFrame(self, height=1, fg_color=self.gui.colors["pale_lavender"])
+        separator = ctk.CTkFrame(self.frame, height=1, fg_color=self.gui.colors["pale_lavender"])
         separator.pack(fill="x", padx=5, pady=(5, 0))
 
+        self._apply_monitoring_state()
+        return self.frame
+
+    def teardown(self):
+        """채널 UI 제거 (입력값은 상태로 보관)"""
+        if self.frame is None:
+            return
+        self.url = self.url_input.get().strip()
+        self.frame.destroy()
+        self.frame = None
+        self.channel_label = None
+        self.status_label = None
+        self.url_input = None
+        self.toggle_button = None
+
+    def get_url(self) -> str:
+        """입력된 URL (창이 없으면 보관된 값)"""
+        return self.url_input.get().strip() if self.url_input else self.url
+
+    def set_url(self, url: str):
+        self.url = url
+        if self.url_input:
+            self.url_input.delete(0, "end")
+            self.url_input.insert(0, url)
+
+    def _label_text(self) -> str:
+        if self.display_name:
+            return f"채널 {self.channel_num} · {self.display_name}"
+        return f"채널 {self.channel_num}"
+
+    def set_display_name(self, name: str | None):
+        """채널 정보 캐시의 표시 이름 반영 (GUI 스레드 전용)"""
+        self.display_name = name
+        if self.channel_label:
+            self.channel_label.configure(text=self._label_text())
+
+    def set_status(self, text: str, color: str):
+        """상태 표시 갱신 (GUI 스레드 전용, 창이 없으면 상태만 보관)"""
+        self.status = (text, color)
+        if self.status_label:
+            self.status_label.configure(text=text, text_color=color)
+
+    def _apply_monitoring_state(self):
+        """감시 여부에 맞게 입력칸/버튼 표시"""
+        if not self.frame:
+            return
+        if self.is_monitoring:
+            self.url_input.configure(state="disabled")
+            self.toggle_button.configure(text="중지", fg_color=self.gui.colors["soft_pink"], hover_color="#FF8FB8")
+        else:
+            self.url_input.configure(state="normal")
+            self.toggle_button.configure(text="시작", fg_color=self.gui.colors["deep_purple"], hover_color=self.gui.colors["lavender"])
+
     def toggle_monitoring(self):
         """감시 시작/중지"""
         if not self.is_monitoring:
@@ -96,29 +191,49 @@ class ChannelMonitor(ctk.CTkFrame):
         else:
             self.stop_monitoring()
 
-    def start_monitoring(self):
-        """감시 시작"""
-        url_or_id = self.url_input.get().strip()
+    def start_monitoring(self, subscribe: bool = True):
+        """
+        감시 시작
+
+        Args:
+            subscribe: 푸시 이벤트를 바로 구독할지 여부 (전체 시작은 모아서 한 번에 구독)
+        """
+        url_or_id = self.get_url()
         if not url_or_id:
             self.gui.log_message(f"[채널{self.channel_num}] ❌ URL을 입력해주세요.")
             return
 
-        user_id = extract_user_id(url_or_id)
+        user_id = normalize_user_id(url_or_id)
         if not user_id:
-            self.gui.log_message(f"[채널{self.channel_num}] ❌ 올바른 URL이 아닙니다.")
+            self.gui.log_message(f"[채널{self.channel_num}] ❌ 올바른 URL 또는 ID가 아닙니다: {url_or_id}")
             return
 
+        # 이미 없는 채널로 확인된 ID는 경고만 하고 감시 (나중에 만들어질 수 있음)
+        cached = self.gui.channels.cached([user_id]).get(user_id)
+        if cached and cached["status"] == STATUS_NOT_FOUND:
+            self.gui.log_message(f"[채널{self.channel_num}] ⚠️ {user_id}: 없는 채널로 확인된 ID입니다.")
+
         self.user_id = user_id
         self.is_monitoring = True
         self.was_live = False
+        self.live_movie_id = None
+
+        # 포커스를 옮기지 않고 바로 시작한 경우에도 최신 입력값으로 감시
+        self.gui.publish_settings()
 
         # UI 업데이트
-        self.url_input.configure(state="disabled")
-        self.toggle_button.configure(text="중지", fg_color=self.gui.colors["soft_pink"], hover_color="#FF8FB8")
-        self.status_label.configure(text="⏳ 확인 중...", text_color=self.gui.colors["lavender"])
+        self._apply_monitoring_state()
+        self.set_status("⏳ 확인 중...", self.gui.colors["lavender"])
 
         self.gui.log_message(f"[채널{self.channel_num}] ✅ {user_id} 감시 시작")
 
+        # 푸시 이벤트 구독
+        if subscribe and self.gui.event_subscriber:
+            self.gui.event_subscriber.subscribe(user_id)
+
+        # 놓친 지난 방송은 첫 확인 후(방송 중인지 알고 나서) 백필 대기열에 추가
+        self.backfill_pending = bool(self.gui.backfill and self.gui.config.get("backfill", {}).get("on_start", True))
+
         # 감시 스레드 시작
         self.monitoring_thread = threading.Thread(
             target=self.run_monitoring_loop,
@@ -126,107 +241,514 @@ class ChannelMonitor(ctk.CTkFrame):
         )
         self.monitoring_thread.start()
 
+        if self.gui.standby:
+            self.gui.standby.wake()
+
     def stop_monitoring(self):
         """감시 중지"""
         self.is_monitoring = False
+        self.wake()
+
+        if self.user_id and self.gui.event_subscriber:
+            self.gui.event_subscriber.unsubscribe(self.user_id)
+
+        if self.user_id and self.was_live:
+            self.gui.history.session_ended(self.user_id, datetime.now())
+            self.was_live = False
+            self.live_movie_id = None
+            if self.gui.comments:
+                self.gui.stop_comments_async(self.user_id)
+
+        if self.user_id:
+            self.gui.admission.cancel(self.user_id)
+            self.gui.breakers.remove(self.user_id)
 
-        # 녹화 중이면 중지
+        # 녹화 중이면 중지 (프로세스 종료 대기로 GUI가 멈추지 않도록 백그라운드에서)
         if self.user_id and self.gui.recorder.is_recording(self.user_id):
-            self.gui.recorder.stop_recording(self.user_id)
-            self.gui.log_message(f"[채널{self.channel_num}] ⏹️  {self.user_id} 녹화 중지")
+            self.gui.stop_recording_async(self.user_id, self.channel_num)
 
         # UI 업데이트
-        self.url_input.configure(state="normal")
-        self.toggle_button.configure(text="시작", fg_color=self.gui.colors["deep_purple"], hover_color=self.gui.colors["lavender"])
-        self.status_label.configure(text="⚫ 대기", text_color="#95a5a6")
+        self._apply_monitoring_state()
+        self.set_status("⚫ 대기", "#95a5a6")
 
         self.gui.log_message(f"[채널{self.channel_num}] ⏹️  {self.user_id} 감시 중지")
-        self.user_id = None
 
-        # 스레드 참조 정리
-        self.monitoring_thread = None
+        # 임대 반납 (다른 인스턴스가 바로 인계할 수 있도록)
+        if self.user_id and self.gui.shard:
+            self.gui.shard.release(self.user_id)
+
+        # user_id / 스레드 참조는 감시 스레드가 끝난 뒤 정리 (확인 중인 주기가 아직 사용할 수 있음)
+        if self.monitoring_thread is None:
+            self.user_id = None
+
+        if self.gui.standby:
+            self.gui.standby.wake()
 
     def run_monitoring_loop(self):
         """백그라운드 감시 루프"""
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+        self.loop = loop
 
         try:
             loop.run_until_complete(self.monitor_stream())
         except Exception as e:
-            self.gui.after(0, lambda: self.gui.log_message(
+            self.gui.dispatch(lambda: self.gui.log_message(
                 f"[채널{self.channel_num}] ❌ 오류: {e}"
             ))
         finally:
+            self.loop = None
+            self.wake_event = None
             loop.close()
             # 이벤트 루프 참조 정리
             asyncio.set_event_loop(None)
+            self.gui.dispatch(lambda thread=threading.current_thread(): self._thread_exited(thread))
+
+    def _thread_exited(self, thread: threading.Thread):
+        """감시 스레드 종료 후 정리 (GUI 스레드). 그사이 다시 시작했으면 새 스레드의 상태는 유지"""
+        if self.monitoring_thread is thread:
+            self.monitoring_thread = None
+            if not self.is_monitoring:
+                self.user_id = None
+
+    def wake(self):
+        """대기 중인 감시 루프를 즉시 깨웁니다 (다른 스레드에서 호출 가능)."""
+        loop, wake_event = self.loop, self.wake_event
+        if loop and wake_event:
+            try:
+                loop.call_soon_threadsafe(wake_event.set)
+            except RuntimeError:
+                # 루프가 이미 종료됨
+                pass
 
     async def monitor_stream(self):
-        """스트림 감시"""
-        ytdlp_path = self.gui.ytdlp_path_input.get().strip()
-
-        if not ytdlp_path:
-            self.gui.after(0, lambda: self.gui.log_message(
+        """스트림 감시 (GUI 위젯 대신 설정 스냅샷만 읽음)"""
+        if not self.gui.settings.current.ytdlp_path:
+            self.gui.dispatch(lambda: self.gui.log_message(
                 f"[채널{self.channel_num}] ❌ yt-dlp 경로를 설정해주세요."
             ))
-            self.gui.after(0, self.stop_monitoring)
+            self.gui.dispatch(self.stop_monitoring)
             return
 
-        check_interval = self.gui.get_check_interval()
-
-        while self.is_monitoring:
-            status = await check_stream_status(self.user_id, ytdlp_path)
+        self.wake_event = asyncio.Event()
+        deferred = False
+
+        # 중지 후 바로 다시 시작한 경우 이전 스레드는 새 스레드에 맡기고 종료
+        while self.is_monitoring and self.monitoring_thread is threading.current_thread():
+            # 확인 도중 감시가 중지되어도 이번 주기는 같은 채널 ID로 처리 (user_id는 스레드 종료 후 정리)
+            user_id = self.user_id
+            # 주기마다 최신 스냅샷 사용 (설정 변경이 다음 확인부터 반영됨)
+            settings = self.gui.settings.current
+            ytdlp_path = settings.ytdlp_path
+            check_interval = settings.check_interval
+            # 푸시 이벤트 사용 시 주기 확인은 느린 보정 용도로만 사용
+            if self.gui.event_subscriber:
+                check_interval = max(check_interval, self.gui.get_reconcile_interval())
+
+            # 다중 인스턴스: 임대를 획득한 채널만 확인 (다른 인스턴스가 죽으면 인계)
+            shard = self.gui.shard
+            if shard and not shard.try_acquire(user_id):
+                if not deferred:
+                    deferred = True
+                    self.gui.dispatch(lambda user_id=user_id:
+                        self.gui.log_message(f"[채널{self.channel_num}] 🔒 {user_id} 다른 인스턴스가 담당 중"))
+                    self.gui.dispatch(lambda:
+                        self.set_status("🔒 다른 인스턴스", "#95a5a6"))
+                await self.wait_next(min(check_interval, shard.ttl / 3))
+                continue
+            deferred = False
+
+            # 서킷 브레이커: 실패가 이어지는 채널 / 사이트 요청 제한 시 확인 중단
+            allowed, reason, remaining = self.gui.breakers.before_probe(user_id)
+            if not allowed:
+                await self.wait_next(max(1.0, min(remaining, check_interval)) if remaining else check_interval)
+                continue
+
+            # 출구 분산: 채널에 배정된 출구로 확인 (모든 출구가 한도 초과 / 제외면 대기)
+            egress = self.gui.egress
+            endpoint = None
+            if egress:
+                endpoint, wait = egress.acquire(user_id)
+                if endpoint is None:
+                    self.gui.breakers.cancel_probe(user_id)
+                    await self.wait_next(min(wait, check_interval))
+                    continue
+
+            status = await check_stream_status(
+                user_id,
+                ytdlp_path,
+                proxy=endpoint.proxy if endpoint else None,
+                source_address=endpoint.source_address if endpoint else None
+            )
             timestamp = status["checked_at"].strftime("%H:%M:%S")
+            global_scope = True
+            if endpoint:
+                excluded = egress.report(endpoint, status)
+                if excluded:
+                    self.gui.dispatch(lambda name=endpoint.name, reason=excluded:
+                        self.gui.log_message(f"[채널{self.channel_num}] 🚫 출구 {name} 제외 ({reason})"))
+                # 요청 제한은 해당 출구만 쉬게 하고, 남은 출구가 없을 때만 전체 확인 중단
+                global_scope = egress.usable_count() == 0
+            if not self.is_monitoring or self.user_id != user_id:
+                # 확인 도중 감시 중지 - 결과를 반영하지 않음 (중지 후 세션/녹화를 새로 시작하지 않도록)
+                break
+            opened = self.gui.breakers.after_probe(user_id, status, global_scope=global_scope)
+            self.gui.history.record_probe(user_id, status)
 
             if "error" in status:
-                self.gui.after(0, lambda t=timestamp, err=status['error']:
-                    self.gui.log_message(f"[{t}] [채널{self.channel_num}] ⚠️  {err}"))
+                self.gui.dispatch(lambda t=timestamp, err=status['error'], kind=status.get('error_kind'):
+                    self.gui.log_message(f"[{t}] [채널{self.channel_num}] ⚠️  [{kind}] {err}"))
+                if opened:
+                    scope, delay = opened
+                    if scope == "global":
+                        message = f"⛔ 사이트 요청 제한 - 모든 채널 확인 {delay:.0f}초 중단"
+                    else:
+                        message = f"⛔ [{status.get('error_kind')}] {user_id} 확인 {delay:.0f}초 중단"
+                    self.gui.dispatch(lambda m=message:
+                        self.gui.log_message(f"[채널{self.channel_num}] {m}"))
+                    self.gui.dispatch(lambda:
+                        self.set_status("⛔ 확인 중단", "#e67e22"))
             elif status["is_live"]:
                 if not self.was_live:
                     # 방송 시작
-                    self.gui.after(0, lambda t=timestamp:
-                        self.gui.log_message(f"\n🔴 [{t}] [채널{self.channel_num}] {self.user_id} 방송 시작!"))
+                    self.gui.dispatch(lambda t=timestamp, user_id=user_id:
+                        self.gui.log_message(f"\n🔴 [{t}] [채널{self.channel_num}] {user_id} 방송 시작!"))
 
                     if status["title"]:
-                        self.gui.after(0, lambda title=status['title']:
+                        self.gui.dispatch(lambda title=status['title']:
                             self.gui.log_message(f"   📺 제목: {title}"))
 
-                    self.gui.after(0, lambda:
-                        self.status_label.configure(text="🔴 방송 중", text_color="#e74c3c"))
+                    self.gui.dispatch(lambda:
+                        self.set_status("🔴 방송 중", "#e74c3c"))
 
                     self.was_live = True
+                    self.live_movie_id = status.get("movie_id")
+                    self.gui.history.session_started(
+                        user_id, status.get("movie_id"), status["title"], status["checked_at"]
+                    )
+                    self.gui.channels.mark_live(user_id, status["checked_at"])
+                    if self.gui.comments:
+                        self.gui.comments.start(user_id, status)
 
                     # 자동 녹화
-                    if self.gui.auto_record_var.get():
-                        self.gui.start_recording(self.user_id, self.channel_num)
+                    if settings.auto_record:
+                        self.gui.start_recording(user_id, self.channel_num, probe_info=status)
                 else:
                     # 방송 중
-                    self.gui.after(0, lambda t=timestamp:
+                    self.gui.dispatch(lambda t=timestamp:
                         self.gui.log_message(f"[{t}] [채널{self.channel_num}] 🔴 방송 중"))
             else:
                 if self.was_live:
                     # 방송 종료
-                    self.gui.after(0, lambda t=timestamp:
-                        self.gui.log_message(f"\n⚫ [{t}] [채널{self.channel_num}] {self.user_id} 방송 종료"))
+                    self.gui.dispatch(lambda t=timestamp, user_id=user_id:
+                        self.gui.log_message(f"\n⚫ [{t}] [채널{self.channel_num}] {user_id} 방송 종료"))
 
-                    self.gui.after(0, lambda:
-                        self.status_label.configure(text="⚫ 종료", text_color="#95a5a6"))
+                    self.gui.dispatch(lambda:
+                        self.set_status("⚫ 종료", "#95a5a6"))
 
-                    self.was_live = False
+                    self.live_ended_at = status["checked_at"]
+                    self.end_session(user_id, status["checked_at"])
+                    if self.gui.standby:
+                        # 방송이 끊겨 다시 시작할 수 있으므로 바로 대기 프로세스 배정
+                        self.gui.standby.wake()
 
                     # 녹화 중지
-                    if self.gui.recorder.is_recording(self.user_id):
-                        self.gui.recorder.stop_recording(self.user_id)
-                        self.gui.log_message(f"[채널{self.channel_num}] ⏹️  {self.user_id} 녹화 중지")
+                    if self.gui.recorder.is_recording(user_id):
+                        self.gui.recorder.stop_recording(user_id)
+                        self.gui.dispatch(lambda user_id=user_id:
+                            self.gui.log_message(f"[채널{self.channel_num}] ⏹️  {user_id} 녹화 중지"))
                 else:
                     # 대기 중
-                    self.gui.after(0, lambda t=timestamp:
+                    self.gui.dispatch(lambda t=timestamp:
                         self.gui.log_message(f"[{t}] [채널{self.channel_num}] ⏳ 대기 중"))
-                    self.gui.after(0, lambda:
-                        self.status_label.configure(text="⏳ 대기 중", text_color="#3498db"))
+                    self.gui.dispatch(lambda:
+                        self.set_status("⏳ 대기 중", "#3498db"))
+
+            if self.backfill_pending and "error" not in status:
+                self.backfill_pending = False
+                self.gui.queue_backfill(user_id)
+
+            await self.wait_next(check_interval)
+
+    def end_session(self, user_id: str, ended_at: datetime):
+        """방송 세션 종료 처리 (기록 종료, 대기 중인 승인 취소, 댓글 기록 중지) - 녹화 중지는 호출한 쪽에서"""
+        was_live = self.was_live
+        self.was_live = False
+        self.live_movie_id = None
+        if was_live:
+            self.gui.history.session_ended(user_id, ended_at)
+        self.gui.admission.cancel(user_id)
+        if was_live and self.gui.comments:
+            self.gui.stop_comments_async(user_id)
+
+    async def wait_next(self, timeout: float):
+        """다음 확인까지 대기 (푸시 이벤트 도착 시 즉시 확인)"""
+        try:
+            await asyncio.wait_for(self.wake_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.wake_event.clear()
+
+
+class LibraryWindow(ctk.CTkToplevel):
+    """녹화 목록 검색 창 (색인만 조회, 파일 시스템 접근 없음)"""
+
+    def __init__(self, gui_instance):
+        super().__init__(gui_instance)
+        self.gui = gui_instance
+        self.title("녹화 목록")
+        self.geometry("900x600")
+
+        filter_row = ctk.CTkFrame(self, fg_color="transparent")
+        filter_row.pack(fill="x", padx=8, pady=8)
+
+        self.channel_input = ctk.CTkEntry(filter_row, placeholder_text="채널 ID", width=140, height=26)
+        self.channel_input.pack(side="left", padx=(0, 4))
+        self.text_input = ctk.CTkEntry(filter_row, placeholder_text="제목 검색", height=26)
+        self.text_input.pack(side="left", fill="x", expand=True, padx=(0, 4))
+        self.since_input = ctk.CTkEntry(filter_row, placeholder_text="YYYY-MM-DD 부터", width=120, height=26)
+        self.since_input.pack(side="left", padx=(0, 4))
+
+        ctk.CTkButton(filter_row, text="검색", command=self.search, width=60, height=26).pack(side="left", padx=(0, 4))
+        self.rescan_button = ctk.CTkButton(filter_row, text="다시 검사", command=self.rescan, width=70, height=26)
+        self.rescan_button.pack(side="left")
+
+        for entry in (self.channel_input, self.text_input, self.since_input):
+            entry.bind("<Return>", lambda e: self.search())
+
+        self.summary_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=10), anchor="w")
+        self.summary_label.pack(fill="x", padx=8)
+
+        self.results = ctk.CTkTextbox(self, font=ctk.CTkFont(family="Consolas", size=10), wrap="none")
+        self.results.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+
+        self.search()
+
+    def search(self):
+        """입력한 조건으로 색인 조회"""
+        rows = self.gui.library.query(
+            user_id=self.channel_input.get().strip() or None,
+            text=self.text_input.get().strip() or None,
+            since=self.since_input.get().strip() or None
+        )
+        self.results.delete("1.0", "end")
+        self.results.insert("end", "\n".join(format_row(row) for row in rows))
+        total_bytes = sum(row["bytes"] for row in rows)
+        total_duration = sum(row["duration"] or 0 for row in rows)
+        self.summary_label.configure(
+            text=f"{len(rows)}개 파일 / {format_size(total_bytes)} / {format_duration(total_duration)}"
+        )
+
+    def rescan(self):
+        """저장 경로를 다시 검사하여 색인 갱신 (백그라운드)"""
+        save_path = self.gui.settings.current.save_path or str(Path.cwd())
+        self.rescan_button.configure(state="disabled")
+
+        def run():
+            result = self.gui.library.reconcile(save_path, full=True)
+
+            def done():
+                if self.winfo_exists():
+                    self.rescan_button.configure(state="normal")
+                    self.search()
+
+            self.gui.log_message(
+                f"📚 녹화 목록 갱신: 디렉토리 {result['scanned']}개 검사, "
+                f"{result['added']}개 추가, {result['removed']}개 제거"
+            )
+            self.gui.dispatch_ui(done)
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+class LogViewerWindow(ctk.CTkToplevel):
+    """저장된 구조화 로그 검색 창"""
 
-            await asyncio.sleep(check_interval)
+    def __init__(self, gui_instance):
+        super().__init__(gui_instance)
+        self.gui = gui_instance
+        self.title("로그 검색")
+        self.geometry("1000x600")
+
+        filter_row = ctk.CTkFrame(self, fg_color="transparent")
+        filter_row.pack(fill="x", padx=8, pady=8)
+
+        self.channel_input = ctk.CTkEntry(filter_row, placeholder_text="채널 ID", width=120, height=26)
+        self.channel_input.pack(side="left", padx=(0, 4))
+        self.level_var = ctk.StringVar(value="info")
+        ctk.CTkOptionMenu(
+            filter_row, values=list(LEVELS), variable=self.level_var, width=90, height=26
+        ).pack(side="left", padx=(0, 4))
+        self.since_input = ctk.CTkEntry(filter_row, placeholder_text="YYYY-MM-DD HH:MM 부터", width=150, height=26)
+        self.since_input.pack(side="left", padx=(0, 4))
+        self.text_input = ctk.CTkEntry(filter_row, placeholder_text="검색어", height=26)
+        self.text_input.pack(side="left", fill="x", expand=True, padx=(0, 4))
+        self.search_button = ctk.CTkButton(filter_row, text="검색", command=self.search, width=60, height=26)
+        self.search_button.pack(side="left")
+
+        for entry in (self.channel_input, self.since_input, self.text_input):
+            entry.bind("<Return>", lambda e: self.search())
+
+        self.summary_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=10), anchor="w")
+        self.summary_label.pack(fill="x", padx=8)
+
+        self.results = ctk.CTkTextbox(self, font=ctk.CTkFont(family="Consolas", size=10), wrap="none")
+        self.results.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+
+        self.search()
+
+    def search(self):
+        """입력한 조건으로 로그 검색 (백그라운드)"""
+        since = None
+        since_text = self.since_input.get().strip()
+        if since_text:
+            try:
+                since = datetime.fromisoformat(since_text).timestamp()
+            except ValueError:
+                self.summary_label.configure(text="⚠️ 시작 시각 형식: YYYY-MM-DD HH:MM")
+                return
+
+        query = {
+            "channel": self.channel_input.get().strip() or None,
+            "level": self.level_var.get(),
+            "since": since,
+            "text": self.text_input.get().strip() or None,
+        }
+        self.search_button.configure(state="disabled")
+        self.summary_label.configure(text="검색 중...")
+
+        def run():
+            started = time.perf_counter()
+            records = self.gui.event_log.search(**query, limit=2000)
+            elapsed = time.perf_counter() - started
+
+            def done():
+                if not self.winfo_exists():
+                    return
+                self.results.delete("1.0", "end")
+                self.results.insert("end", "\n".join(format_record(record) for record in reversed(records)))
+                self.results.see("end")
+                self.summary_label.configure(text=f"{len(records)}줄 ({elapsed:.2f}초)")
+                self.search_button.configure(state="normal")
+
+            self.gui.dispatch_ui(done)
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+class ImportWindow(ctk.CTkToplevel):
+    """채널 일괄 가져오기 창 (URL 목록 붙여넣기 또는 텍스트/CSV 파일)"""
+
+    def __init__(self, gui_instance):
+        super().__init__(gui_instance)
+        self.gui = gui_instance
+        self.title("채널 가져오기")
+        self.geometry("700x600")
+        self.user_ids = []
+        self.resolved = {}
+        self.cancel_event = threading.Event()
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        button_row = ctk.CTkFrame(self, fg_color="transparent")
+        button_row.pack(fill="x", padx=8, pady=8)
+
+        ctk.CTkButton(button_row, text="파일 열기", command=self.open_file, width=80, height=26).pack(side="left", padx=(0, 4))
+        self.check_button = ctk.CTkButton(button_row, text="확인", command=self.check, width=60, height=26)
+        self.check_button.pack(side="left", padx=(0, 4))
+        self.refresh_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(button_row, text="캐시 무시", variable=self.refresh_var, font=ctk.CTkFont(size=10)).pack(side="left")
+        self.add_button = ctk.CTkButton(button_row, text="추가", command=self.add, state="disabled", width=60, height=26)
+        self.add_button.pack(side="right")
+
+        self.input = ctk.CTkTextbox(self, font=ctk.CTkFont(family="Consolas", size=10), wrap="none", height=180)
+        self.input.pack(fill="x", padx=8)
+
+        self.summary_label = ctk.CTkLabel(self, text="한 줄에 하나씩 URL 또는 ID (CSV 가능)", font=ctk.CTkFont(size=10), anchor="w")
+        self.summary_label.pack(fill="x", padx=8)
+
+        self.results = ctk.CTkTextbox(self, font=ctk.CTkFont(family="Consolas", size=10), wrap="none")
+        self.results.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+
+    def open_file(self):
+        """텍스트/CSV 파일 내용을 입력칸에 불러오기"""
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="채널 목록 선택",
+            filetypes=[("채널 목록", "*.txt *.csv"), ("모든 파일", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            text = Path(path).read_text(encoding="utf-8-sig", errors="replace")
+        except OSError as e:
+            self.summary_label.configure(text=f"⚠️ 파일을 읽을 수 없습니다: {e}")
+            return
+        self.input.delete("1.0", "end")
+        self.input.insert("1.0", text)
+
+    def check(self):
+        """입력한 채널을 정규화/중복 제거 후 병렬로 확인 (백그라운드)"""
+        user_ids, invalid = parse_channel_list(self.input.get("1.0", "end"))
+        self.user_ids = user_ids
+        self.add_button.configure(state="disabled")
+        self.results.delete("1.0", "end")
+        if invalid:
+            self.results.insert("end", "\n".join(f"❌ {entry}  (형식 오류)" for entry in invalid) + "\n")
+        if not user_ids:
+            self.summary_label.configure(text=f"가져올 채널 없음 (형식 오류 {len(invalid)}개)")
+            return
+
+        self.check_button.configure(state="disabled")
+        self.summary_label.configure(text=f"{len(user_ids)}개 채널 확인 중...")
+        refresh = self.refresh_var.get()
+
+        def on_progress(done, total):
+            # 수천 개를 확인할 때 GUI 갱신이 몰리지 않도록 10개마다 표시
+            if done % 10 and done != total:
+                return
+
+            def show():
+                if self.winfo_exists():
+                    self.summary_label.configure(text=f"{len(user_ids)}개 채널 확인 중... ({done}/{total})")
+
+            self.gui.dispatch_ui(show)
+
+        def run():
+            started = time.perf_counter()
+            resolved = self.gui.channels.resolve_many(
+                user_ids, refresh=refresh, progress=on_progress, cancel=self.cancel_event
+            )
+            elapsed = time.perf_counter() - started
+
+            def done():
+                if not self.winfo_exists():
+                    return
+                self.resolved = resolved
+                self.results.insert("end", "\n".join(format_channel(user_id, resolved.get(user_id)) for user_id in user_ids))
+                missing = sum(1 for info in resolved.values() if info["status"] == STATUS_NOT_FOUND)
+                self.summary_label.configure(
+                    text=f"{len(user_ids)}개 채널 / 없는 채널 {missing}개 / 형식 오류 {len(invalid)}개 ({elapsed:.1f}초)"
+                )
+                self.check_button.configure(state="normal")
+                self.add_button.configure(state="normal")
+
+            self.gui.dispatch_ui(done)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def add(self):
+        """없는 채널을 뺀 나머지를 채널 감시 목록에 추가"""
+        user_ids = [
+            user_id for user_id in self.user_ids
+            if self.resolved.get(user_id, {}).get("status") != STATUS_NOT_FOUND
+        ]
+        added, existing = self.gui.import_channels(user_ids, self.resolved)
+        self.summary_label.configure(text=f"{added}개 채널 추가 (이미 있는 채널 {existing}개)")
+        self.add_button.configure(state="disabled")
+
+    def close(self):
+        self.cancel_event.set()
+        self.destroy()
 
 
 class TwitCastingMonitorGUI(ctk.CTk):
@@ -243,21 +765,211 @@ class TwitCastingMonitorGUI(ctk.CTk):
         # 설정 관리자
         self.config = ConfigManager()
 
+        # 워커 스레드용 설정 스냅샷 / GUI 갱신 명령 큐
+        self.settings = SettingsStore()
+        self.commands = CommandQueue(on_error=self.on_command_error)
+
+        # 구조화 로그 파일 (백그라운드 기록, 회전/압축/색인)
+        self.event_log = EventLog(
+            self.config.get("log_dir", "logs"),
+            max_segment_mb=float(self.config.get("log_max_segment_mb", 16)),
+            keep_segments=int(self.config.get("log_keep_segments", 100))
+        )
+
         # 녹화 관리
         self.recorder = StreamRecorder()
         self.recorder.set_output_callback(self.on_recording_output)
+        self.recorder.set_finished_callback(self.on_recording_finished)
+        self.recorder.set_part_callback(self.on_recording_part_finished)
+
+        # 녹화 시작 시각 (헤더에서 재생 시간을 읽을 수 없을 때 사용)
+        self.recording_started_at = {}
 
         # 로그 토글 상태
         self.log_visible = True
 
+        # 트레이 저전력 모드: 창을 숨기면 위젯을 모두 제거하고, 그동안의 로그는 최근 1000줄만 보관
+        self.ui_visible = True
+        self.ui_generation = 0  # 창을 제거할 때마다 증가 (이전 창에 예약된 위젯 콜백 무시)
+        self.log_backlog = deque(maxlen=1000)
+        self._process_count_job = None
+        self.library_window = None
+        self.log_viewer_window = None
+        self.import_window = None
+
+        # 채널 정보 캐시 (표시 이름 / 마지막 방송 / ID 확인 결과)
+        channel_cache = self.config.get("channel_cache", {})
+        self.channels = ChannelDirectory(
+            self.config.get("channels_db", "channels.db"),
+            ttl=float(channel_cache.get("ttl_days", 7)) * 86400,
+            concurrency=int(channel_cache.get("concurrency", 8))
+        )
+
         # 트레이 아이콘
         self.tray_icon = None
 
+        # 푸시 이벤트 구독 (설정된 경우)
+        self.event_subscriber = None
+
+        # 다중 인스턴스 채널 분담 (설정된 경우)
+        self.shard = None
+
         # UI 초기화
         self.init_ui()
 
         # 설정 불러오기
         self.load_settings()
+        self.publish_settings()
+        self.after(20, self.drain_commands)
+
+        # 하위 프로세스 한도 / 자원 제한
+        process_manager.configure(
+            budget=self.config.get("process_budget"),
+            limits=self.config.get("process_limits"),
+            priorities=self.config.get("process_priorities")
+        )
+
+        # 채널별 / 전역 서킷 브레이커
+        self.breakers = BreakerRegistry()
+
+        # 확인 요청 출구 분산 (설정된 경우)
+        self.egress = None
+        egress = self.config.get("egress", {})
+        if egress.get("endpoints"):
+            self.egress = EgressPool(
+                egress["endpoints"],
+                rate_per_minute=float(egress.get("rate_per_minute", 30)),
+                health_interval=float(egress.get("health_interval", 30)),
+                health_host=egress.get("health_host", "twitcasting.tv"),
+                health_port=int(egress.get("health_port", 443)),
+                rate_limit_cooldown=float(egress.get("rate_limit_cooldown", 300))
+            )
+            self.egress.start()
+
+        # 동시 녹화 승인 제어
+        admission = self.config.get("admission", {})
+        self.admission = AdmissionController(
+            self.recorder,
+            on_admit=self.on_recording_admitted,
+            max_concurrent=int(admission.get("max_concurrent", 0)),
+            max_bandwidth_mbps=float(admission.get("max_bandwidth_mbps", 0)),
+            max_disk_mbps=float(admission.get("max_disk_mbps", 0)),
+            degrade_format=admission.get("degrade_format", "worst")
+        )
+
+        # 확인/방송/녹화 기록 저장소
+        self.history = HistoryStore(self.config.get("history_db", "history.db"))
+        threading.Thread(
+            target=self.history.compact,
+            args=(int(self.config.get("history_retention_days", 180)),),
+            daemon=True
+        ).start()
+
+        # 녹화 파일 색인 (시작 시 변경된 디렉토리만 다시 검사, 전체 검사는 --rescan / 다시 검사 버튼)
+        self.library = RecordingLibrary(self.config.get("library_db", "library.db"))
+        threading.Thread(
+            target=self.library.reconcile,
+            args=(self.config.get("save_path", "") or str(Path.cwd()),),
+            daemon=True
+        ).start()
+
+        # 보존 정책 (설정된 경우)
+        self.retention = None
+        retention = self.config.get("retention", {})
+        if retention.get("global") or retention.get("channels"):
+            self.retention = RetentionEngine(
+                self.library,
+                get_save_dir=lambda: self.settings.current.save_path or str(Path.cwd()),
+                rules=retention,
+                protected=self.get_active_recording_dirs,
+                on_delete=self.on_retention_delete,
+                interval=float(retention.get("interval", 600)),
+                delete_rate=float(retention.get("delete_rate", 20)),
+                dry_run=bool(retention.get("dry_run", False))
+            )
+            self.retention.start()
+
+        # 녹화 정지 감시 (멈춘 녹화를 이어서 녹화 파일로 다시 시작)
+        self.watchdog = None
+        watchdog = self.config.get("watchdog", {})
+        if watchdog.get("enabled", True):
+            self.watchdog = StallWatchdog(
+                self.recorder,
+                stall_timeout=float(watchdog.get("stall_timeout", 60)),
+                interval=float(watchdog.get("interval", 5)),
+                max_restarts=int(watchdog.get("max_restarts", 5)),
+                on_event=lambda user_id, message: self.log_message(
+                    f"[{user_id}] {message}" if user_id else message, channel=user_id
+                )
+            )
+            self.watchdog.start()
+
+        # 대기 녹화 프로세스 (설정된 경우) - 방송 시작이 예상되는 채널의 녹화 프로세스를 미리 실행
+        self.standby = None
+        standby = self.config.get("standby", {})
+        if int(standby.get("size", 0)) > 0:
+            self.standby = StandbyPool(
+                self.recorder,
+                rank=self.rank_standby,
+                size=int(standby["size"]),
+                idle_timeout=float(standby.get("idle_timeout", 600)),
+                refresh_interval=float(standby.get("refresh_interval", 30)),
+                on_event=lambda user_id, message: self.log_message(f"[{user_id}] {message}", channel=user_id)
+            )
+            self.recorder.standby = self.standby
+            self.standby.start()
+
+        # 지난 방송 백필 (설정된 경우)
+        self.backfill = None
+        backfill = self.config.get("backfill", {})
+        if backfill.get("enabled"):
+            self.backfill = BackfillQueue(
+                self.library,
+                get_settings=lambda: self.settings.current,
+                db_path=self.config.get("backfill_db", "backfill.db"),
+                live_count=lambda: len(self.recorder.get_recording_channels()),
+                live_movies=self.live_movies,
+                history=self.history,
+                on_event=self.on_backfill_event,
+                fragment_budget=int(backfill.get("fragment_budget", 8)),
+                fragments_per_job=int(backfill.get("fragments_per_job", 4)),
+                busy_budget=int(backfill.get("busy_budget", 2)),
+                max_attempts=int(backfill.get("max_attempts", 3)),
+                list_concurrency=int(backfill.get("list_concurrency", 2))
+            )
+            self.backfill.start()
+
+        # 라이브 댓글 기록 (설정된 경우)
+        self.comments = None
+        comments = self.config.get("comments", {})
+        if comments.get("endpoint"):
+            self.comments = CommentRecorder(
+                comments["endpoint"],
+                get_save_dir=lambda: self.settings.current.save_path or str(Path.cwd()),
+                locate=self.locate_recording,
+                batch_size=int(comments.get("batch_size", 50)),
+                flush_interval=float(comments.get("flush_interval", 5)),
+                max_buffer=int(comments.get("max_buffer", 2000))
+            )
+
+        event_endpoint = self.config.get("event_endpoint", "")
+        if event_endpoint:
+            self.event_subscriber = LiveEventSubscriber(
+                event_endpoint,
+                on_event=self.on_live_event,
+                batch_size=int(self.config.get("event_batch_size", 50))
+            )
+
+        shard_store = self.config.get("shard_store", "")
+        if shard_store:
+            self.shard = LeaseCoordinator(
+                shard_store,
+                ttl=float(self.config.get("shard_lease_ttl", 30)),
+                busy_check=self.recorder.is_recording,
+                on_lost=self.on_shard_lost,
+                skew=float(self.config.get("shard_clock_skew", 5))
+            )
+            self.shard.start()
 
         # 자동 저장 바인딩
         self.bind_auto_save()
@@ -275,7 +987,8 @@ class TwitCastingMonitorGUI(ctk.CTk):
         # 메뉴 생성
         menu = pystray.Menu(
             pystray.MenuItem("열기", self.show_from_tray),
-            pystray.MenuItem("완전 종료", self.quit_app)
+            # 트레이 스레드에서 호출되므로 GUI 스레드로 넘겨서 종료
+            pystray.MenuItem("완전 종료", lambda: self.dispatch(self.quit_app))
         )
 
         # 트레이 아이콘 생성
@@ -287,8 +1000,10 @@ class TwitCastingMonitorGUI(ctk.CTk):
         )
 
     def hide_to_tray(self):
-        """트레이로 숨기기"""
+        """트레이로 숨기기 (저전력 모드에서는 위젯까지 제거)"""
         self.withdraw()  # 윈도우 숨김
+        if self.config.get("tray_teardown", True):
+            self.teardown_ui()
 
         if self.tray_icon is None:
             self.create_tray_icon()
@@ -296,8 +1011,13 @@ class TwitCastingMonitorGUI(ctk.CTk):
             threading.Thread(target=self.tray_icon.run, daemon=True).start()
 
     def show_from_tray(self):
-        """트레이에서 복원"""
-        self.after(0, self.deiconify)  # 윈도우 표시
+        """트레이에서 복원 (트레이 스레드에서 호출됨)"""
+        self.dispatch(self.restore_from_tray)
+
+    def restore_from_tray(self):
+        """메인 창을 다시 구성하고 표시합니다 (GUI 스레드)."""
+        self.restore_ui()
+        self.deiconify()
 
     def quit_app(self):
         """완전 종료"""
@@ -308,9 +1028,34 @@ class TwitCastingMonitorGUI(ctk.CTk):
             if monitor.is_monitoring:
                 monitor.is_monitoring = False
 
+        # 푸시 이벤트 연결 종료
+        if self.event_subscriber:
+            self.event_subscriber.close()
+
         # 모든 녹화 중지
+        if self.watchdog:
+            self.watchdog.stop()
+        if self.standby:
+            self.standby.close()
         self.recorder.stop_all_recordings()
 
+        # 임대 반납
+        if self.shard:
+            self.shard.stop()
+
+        # 남은 기록 저장
+        self.admission.stop()
+        if self.egress:
+            self.egress.stop()
+        if self.backfill:
+            self.backfill.stop()
+        if self.comments:
+            self.comments.close()
+        if self.retention:
+            self.retention.stop()
+        self.event_log.close()
+        self.history.close()
+
         # 트레이 아이콘 종료
         if self.tray_icon:
             self.tray_icon.stop()
@@ -341,8 +1086,15 @@ class TwitCastingMonitorGUI(ctk.CTk):
         # 메인 윈도우 배경 - 라이트 그레이
         self.configure(fg_color=self.colors["deep_purple"])
 
+        # 채널 감시 (UI와 별개로 유지)
+        self.channel_monitors = [ChannelMonitor(i, self) for i in range(1, 5)]
+
+        self.build_ui()
+
+    def build_ui(self):
+        """메인 창 위젯 구성 (트레이에서 복원할 때 현재 상태로 다시 구성)"""
         # 메인 컨테이너
-        main_container = ctk.CTkFrame(self, fg_color="transparent")
+        self.main_container = main_container = ctk.CTkFrame(self, fg_color="transparent")
         main_container.pack(fill="both", expand=True, padx=10, pady=10)
 
         # 좌우 분할 레이아웃
@@ -352,7 +1104,8 @@ class TwitCastingMonitorGUI(ctk.CTk):
 
         # 오른쪽: 로그 (확장)
         self.right_frame = ctk.CTkFrame(main_container, fg_color=self.colors["lavender"], corner_radius=15, border_width=0)
-        self.right_frame.pack(side="right", fill="both", expand=True, padx=(5, 0))
+        if self.log_visible:
+            self.right_frame.pack(side="right", fill="both", expand=True, padx=(5, 0))
 
         # === 왼쪽 영역 ===
         # 제목
@@ -482,7 +1235,7 @@ class TwitCastingMonitorGUI(ctk.CTk):
 
         # 저장 경로
         save_row = ctk.CTkFrame(settings_frame, fg_color="transparent")
-        save_row.pack(fill="x", padx=8, pady=(0, 8))
+        save_row.pack(fill="x", padx=8, pady=(0, 4))
 
         ctk.CTkLabel(
             save_row,
@@ -510,6 +1263,48 @@ class TwitCastingMonitorGUI(ctk.CTk):
             fg_color=self.colors["navy"]
         ).pack(side="right")
 
+        # 진단 (트레이스 / 프로파일러)
+        diag_row = ctk.CTkFrame(settings_frame, fg_color="transparent")
+        diag_row.pack(fill="x", padx=8, pady=(0, 8))
+
+        ctk.CTkLabel(
+            diag_row,
+            text="진단",
+            font=ctk.CTkFont(size=9),
+            width=50,
+            anchor="w"
+        ).pack(side="left", padx=(0, 3))
+
+        self.trace_var = ctk.BooleanVar(value=tracer.enabled)
+        ctk.CTkCheckBox(
+            diag_row,
+            text="트레이스 기록",
+            variable=self.trace_var,
+            command=self.toggle_trace,
+            font=ctk.CTkFont(size=10)
+        ).pack(side="left")
+
+        self.profile_button = ctk.CTkButton(
+            diag_row,
+            text="프로파일 30초",
+            state="disabled" if profiler.is_running else "normal",
+            command=self.run_profiler,
+            width=90,
+            height=24,
+            font=ctk.CTkFont(size=9),
+            fg_color=self.colors["navy"]
+        )
+        self.profile_button.pack(side="right")
+
+        self.process_count_label = ctk.CTkLabel(
+            diag_row,
+            text="",
+            font=ctk.CTkFont(size=9),
+            text_color=self.colors["pale_lavender"]
+        )
+        self.process_count_label.pack(side="right", padx=(0, 6))
+        self.update_process_count()
+
         # 채널 모니터링 영역
         channels_frame = ctk.CTkFrame(
             left_frame, 
@@ -520,20 +1315,32 @@ class TwitCastingMonitorGUI(ctk.CTk):
         )
         channels_frame.pack(fill="both", expand=True, padx=10, pady=(0, 8))
 
+        channels_header = ctk.CTkFrame(channels_frame, fg_color="transparent")
+        channels_header.pack(fill="x", padx=8, pady=(8, 5))
+
         channels_title = ctk.CTkLabel(
-            channels_frame,
+            channels_header,
             text="채널 감시",
             font=ctk.CTkFont(size=13, weight="bold"),
             text_color=self.colors["pale_lavender"]
         )
-        channels_title.pack(anchor="w", padx=8, pady=(8, 5))
+        channels_title.pack(side="left")
 
-        # 4개의 채널 모니터 생성
-        self.channel_monitors = []
-        for i in range(1, 5):
-            monitor = ChannelMonitor(channels_frame, i, self)
-            monitor.pack(fill="x", padx=5, pady=(0, 3))
-            self.channel_monitors.append(monitor)
+        ctk.CTkButton(
+            channels_header,
+            text="채널 가져오기",
+            command=self.open_import,
+            width=90,
+            height=24,
+            font=ctk.CTkFont(size=10),
+            fg_color=self.colors["navy"]
+        ).pack(side="right")
+
+        # 채널 모니터 UI (가져온 채널이 많으면 스크롤)
+        self.channel_list = ctk.CTkScrollableFrame(channels_frame, fg_color="transparent")
+        self.channel_list.pack(fill="both", expand=True, padx=0, pady=(0, 3))
+        for monitor in self.channel_monitors:
+            monitor.build(self.channel_list).pack(fill="x", padx=5, pady=(0, 3))
 
         # 버튼 영역
         button_frame = ctk.CTkFrame(
@@ -585,7 +1392,7 @@ class TwitCastingMonitorGUI(ctk.CTk):
         # 로그 토글 버튼 (왼쪽 하단)
         self.toggle_log_button = ctk.CTkButton(
             left_frame,
-            text="◀ 로그 숨기기",
+            text="◀ 로그 숨기기" if self.log_visible else "▶ 로그 보기",
             command=self.toggle_log,
             height=32,
             font=ctk.CTkFont(size=11),
@@ -607,6 +1414,30 @@ class TwitCastingMonitorGUI(ctk.CTk):
         )
         log_title.pack(side="left")
 
+        ctk.CTkButton(
+            log_header,
+            text="녹화 목록",
+            command=self.open_library,
+            width=80,
+            height=26,
+            font=ctk.CTkFont(size=11),
+            text_color=self.colors["pale_lavender"],
+            fg_color=self.colors["navy"],
+            hover_color="#3d4f7a"
+        ).pack(side="right")
+
+        ctk.CTkButton(
+            log_header,
+            text="로그 검색",
+            command=self.open_log_viewer,
+            width=80,
+            height=26,
+            font=ctk.CTkFont(size=11),
+            text_color=self.colors["pale_lavender"],
+            fg_color=self.colors["navy"],
+            hover_color="#3d4f7a"
+        ).pack(side="right", padx=(0, 4))
+
         # 로그 출력 영역
         self.log_output = ctk.CTkTextbox(
             self.right_frame,
@@ -615,6 +1446,66 @@ class TwitCastingMonitorGUI(ctk.CTk):
         )
         self.log_output.pack(fill="both", expand=True, padx=5, pady=(0, 5))
 
+        # 숨겨져 있던 동안의 로그를 한 번에 표시
+        if self.log_backlog:
+            self.log_output.insert("end", "\n".join(self.log_backlog) + "\n")
+            self.log_output.see("end")
+            self.log_backlog.clear()
+
+    def teardown_ui(self):
+        """메인 창 위젯을 모두 제거합니다 (트레이 저전력 모드). 감시/녹화는 계속 동작."""
+        if not self.ui_visible:
+            return
+        self.save_settings()
+
+        # 화면의 최근 로그는 복원 시 다시 표시
+        lines = self.log_output.get("1.0", "end-1c").splitlines()
+        self.log_backlog.extend(lines[-self.log_backlog.maxlen:])
+
+        # 이전 창에 예약된 위젯 콜백은 실행하지 않음 (주기 갱신은 취소)
+        self.ui_generation += 1
+        if self._process_count_job:
+            self.after_cancel(self._process_count_job)
+            self._process_count_job = None
+        if self.import_window is not None and self.import_window.winfo_exists():
+            self.import_window.close()  # 진행 중인 채널 확인도 취소
+        for window in (self.library_window, self.log_viewer_window):
+            if window is not None and window.winfo_exists():
+                window.destroy()
+        self.library_window = None
+        self.log_viewer_window = None
+        self.import_window = None
+
+        self.ui_visible = False
+        for monitor in self.channel_monitors:
+            monitor.teardown()
+        self.main_container.destroy()
+        self.main_container = None
+        self.channel_list = None
+        self.right_frame = None
+        self.log_output = None
+        self.toggle_log_button = None
+        self.process_count_label = None
+        self.profile_button = None
+        self.interval_input = None
+        self.ytdlp_path_input = None
+        self.ffmpeg_path_input = None
+        self.save_path_input = None
+
+    def restore_ui(self):
+        """트레이에서 복원 시 현재 상태로 메인 창을 다시 구성합니다 (설정 파일/네트워크 접근 없음)."""
+        if self.ui_visible:
+            return
+        self.build_ui()
+        # 창을 제거할 때 발행한 스냅샷이 마지막 입력값 (채널 칸은 각 ChannelMonitor가 상태로 보관)
+        settings = self.settings.current
+        self.fill_settings_inputs(
+            settings.check_interval, settings.auto_record,
+            settings.ytdlp_path, settings.ffmpeg_path, settings.save_path
+        )
+        self.bind_auto_save()
+        self.ui_visible = True
+
     def toggle_log(self):
         """로그 영역 토글"""
         if self.log_visible:
@@ -630,19 +1521,151 @@ class TwitCastingMonitorGUI(ctk.CTk):
             self.log_visible = True
             self.geometry("1100x750")
 
+    def open_library(self):
+        """녹화 목록 창 열기 (이미 열려 있으면 앞으로)"""
+        if self.library_window is not None and self.library_window.winfo_exists():
+            self.library_window.focus()
+            return
+        self.library_window = LibraryWindow(self)
+
+    def open_log_viewer(self):
+        """로그 검색 창 열기 (이미 열려 있으면 앞으로)"""
+        if self.log_viewer_window is not None and self.log_viewer_window.winfo_exists():
+            self.log_viewer_window.focus()
+            return
+        self.log_viewer_window = LogViewerWindow(self)
+
+    def open_import(self):
+        """채널 가져오기 창 열기 (이미 열려 있으면 앞으로)"""
+        if self.import_window is not None and self.import_window.winfo_exists():
+            self.import_window.focus()
+            return
+        self.import_window = ImportWindow(self)
+
+    def add_channel_monitor(self) -> ChannelMonitor:
+        """채널 감시 칸을 하나 늘립니다 (GUI 스레드 전용)."""
+        monitor = ChannelMonitor(len(self.channel_monitors) + 1, self)
+        self.channel_monitors.append(monitor)
+        if self.channel_list is not None:
+            monitor.build(self.channel_list).pack(fill="x", padx=5, pady=(0, 3))
+        return monitor
+
+    def import_channels(self, user_ids: list[str], resolved: dict = None) -> tuple[int, int]:
+        """
+        채널을 감시 목록에 추가합니다. 빈 칸을 먼저 채우고 모자라면 칸을 늘립니다.
+
+        Returns:
+            tuple[int, int]: (추가한 채널 수, 이미 있어서 건너뛴 수)
+        """
+        existing = set()
+        for monitor in self.channel_monitors:
+            user_id = normalize_user_id(monitor.get_url()) if monitor.get_url() else None
+            if user_id:
+                existing.add(user_id.lower())
+
+        empty = [monitor for monitor in self.channel_monitors if not monitor.get_url() and not monitor.is_monitoring]
+        added = skipped = 0
+        for user_id in user_ids:
+            if user_id.lower() in existing:
+                skipped += 1
+                continue
+            existing.add(user_id.lower())
+            monitor = empty.pop(0) if empty else self.add_channel_monitor()
+            monitor.set_url(user_id)
+            monitor.set_display_name((resolved or {}).get(user_id, {}).get("display_name"))
+            added += 1
+
+        if added:
+            self.save_settings()
+            self.log_message(f"📥 채널 {added}개 가져옴 (이미 있는 채널 {skipped}개)")
+        return added, skipped
+
+    def refresh_channel_names(self):
+        """채널 칸의 표시 이름을 채널 정보 캐시로 채웁니다 (유효한 정보는 다시 가져오지 않음, 백그라운드)."""
+        targets = {}
+        for monitor in self.channel_monitors:
+            user_id = normalize_user_id(monitor.get_url()) if monitor.get_url() else None
+            if user_id:
+                targets[monitor] = user_id
+        if not targets:
+            return
+
+        def run():
+            resolved = self.channels.resolve_many(list(dict.fromkeys(targets.values())))
+
+            def done():
+                for monitor, user_id in targets.items():
+                    info = resolved.get(user_id)
+                    if info and info.get("display_name"):
+                        monitor.set_display_name(info["display_name"])
+
+            self.dispatch(done)
+
+        threading.Thread(target=run, daemon=True).start()
+
     def get_check_interval(self) -> int:
-        """확인 주기 가져오기"""
+        """확인 주기 가져오기 (GUI 스레드 전용)"""
         try:
             interval = int(self.interval_input.get())
             return max(10, interval)  # 최소 10초
         except:
             return 60  # 기본값
 
+    def publish_settings(self):
+        """입력값을 읽어 워커 스레드용 설정 스냅샷을 발행합니다 (GUI 스레드 전용)."""
+        if not self.ui_visible:
+            return
+        self.settings.publish(
+            check_interval=self.get_check_interval(),
+            auto_record=bool(self.auto_record_var.get()),
+            ytdlp_path=self.ytdlp_path_input.get().strip(),
+            ffmpeg_path=self.ffmpeg_path_input.get().strip(),
+            save_path=self.save_path_input.get().strip()
+        )
+
+    def get_reconcile_interval(self) -> int:
+        """푸시 이벤트 사용 시 보정 확인 주기 가져오기"""
+        try:
+            return max(10, int(self.config.get("reconcile_interval", 300)))
+        except (TypeError, ValueError):
+            return 300
+
+    def on_live_event(self, user_id: str, event: dict):
+        """푸시 이벤트 콜백 - 해당 채널의 감시 루프를 즉시 깨움"""
+        tracer.instant("event.received", "event", user_id=user_id, is_live=event.get("is_live"))
+        for monitor in self.channel_monitors:
+            if monitor.is_monitoring and monitor.user_id == user_id:
+                monitor.wake()
+
+    def on_shard_lost(self, user_id: str):
+        """임대를 잃은 채널 처리 - 중복 녹화 방지를 위해 즉시 녹화 중지 (방송 종료와 같은 정리)"""
+        for monitor in self.channel_monitors:
+            if monitor.user_id == user_id:
+                monitor.end_session(user_id, datetime.now())
+
+        if self.recorder.is_recording(user_id):
+            self.recorder.stop_recording(user_id)
+            self.dispatch(lambda: self.log_message(f"🔒 {user_id} 임대 상실 - 녹화 중지"))
+
+    def stop_recording_async(self, user_id: str, channel_num: int):
+        """녹화를 백그라운드 스레드에서 중지합니다 (GUI 스레드가 프로세스 종료를 기다리지 않도록)."""
+        def run():
+            self.recorder.stop_recording(user_id)
+            self.dispatch(lambda: self.log_message(f"[채널{channel_num}] ⏹️  {user_id} 녹화 중지"))
+
+        threading.Thread(target=run, name=f"stop-{user_id}", daemon=True).start()
+
     def start_all(self):
         """모든 채널 시작"""
+        started = []
         for monitor in self.channel_monitors:
-            if not monitor.is_monitoring and monitor.url_input.get().strip():
-                monitor.start_monitoring()
+            if not monitor.is_monitoring and monitor.get_url():
+                monitor.start_monitoring(subscribe=False)
+                if monitor.is_monitoring:
+                    started.append(monitor.user_id)
+        # 채널마다 연결을 다시 만들지 않도록 한 번에 구독
+        if started and self.event_subscriber:
+            self.event_subscriber.subscribe_many(started)
 
     def stop_all(self):
         """모든 채널 중지"""
@@ -650,8 +1673,41 @@ class TwitCastingMonitorGUI(ctk.CTk):
             if monitor.is_monitoring:
                 monitor.stop_monitoring()
 
-    def log_message(self, message: str):
-        """로그 메시지 추가 (최대 1000줄 유지)"""
+    def log_message(self, message: str, level: str = None, channel: str = None):
+        """
+        로그 메시지 추가 (화면은 최대 1000줄 유지, 로그 파일에는 모두 기록)
+
+        Args:
+            level: 심각도 (None이면 메시지 표시 기호로 추정)
+            channel: 채널 ID (None이면 [채널N] 표시로 추정)
+        """
+        if level is None:
+            if any(marker in message for marker in _ERROR_MARKERS):
+                level = "error"
+            elif any(marker in message for marker in _WARNING_MARKERS):
+                level = "warning"
+            else:
+                level = "info"
+        if channel is None:
+            match = _CHANNEL_TAG.search(message)
+            if match and 1 <= int(match.group(1)) <= len(self.channel_monitors):
+                channel = self.channel_monitors[int(match.group(1)) - 1].user_id
+        self.event_log.write(message.strip(), level=level, channel=channel, source="gui")
+
+        if not self.ui_visible:
+            # 창이 없으면 GUI 스레드를 깨우지 않고 보관만 함
+            self.log_backlog.append(message)
+        elif threading.current_thread() is not threading.main_thread():
+            # 워커 스레드에서 호출된 경우 화면 출력만 GUI 스레드로 넘김
+            self.dispatch(lambda: self._append_log(message))
+        else:
+            self._append_log(message)
+
+    def _append_log(self, message: str):
+        """로그 창에 한 줄 추가 (GUI 스레드 전용)"""
+        if self.log_output is None:
+            self.log_backlog.append(message)
+            return
         self.log_output.insert("end", message + "\n")
         self.log_output.see("end")
 
@@ -660,8 +1716,84 @@ class TwitCastingMonitorGUI(ctk.CTk):
         if line_count > 1000:
             self.log_output.delete("1.0", f"{line_count - 1000}.0")
 
+    def dispatch(self, callback):
+        """워커 스레드의 콜백을 명령 큐에 넣어 GUI 스레드에서 실행하도록 예약합니다."""
+        if tracer.enabled:
+            queued_at = time.perf_counter()
+
+            def traced():
+                delay_ms = (time.perf_counter() - queued_at) * 1000
+                with tracer.span("gui.dispatch", "gui", queued_ms=f"{delay_ms:.2f}"):
+                    callback()
+
+            self.commands.put(traced)
+        else:
+            self.commands.put(callback)
+
+    def on_command_error(self, error: Exception, details: str):
+        """GUI 명령 실행 오류 콜백 (GUI 스레드에서 호출됨)"""
+        self.log_message(f"❌ GUI 갱신 오류: {error!r}", level="error")
+        self.event_log.write(details, level="error", source="gui")
+
+    def dispatch_ui(self, callback):
+        """창 위젯을 다루는 콜백을 예약합니다. 실행 전에 창을 제거했으면(트레이 저전력 모드) 버립니다."""
+        generation = self.ui_generation
+
+        def run():
+            if self.ui_visible and self.ui_generation == generation:
+                callback()
+
+        self.dispatch(run)
+
+    def drain_commands(self):
+        """명령 큐를 프레임 단위로 처리합니다 (밀려 있으면 바로 다음 프레임, 아니면 20ms 후)."""
+        self.commands.drain()
+        if self.commands.pending():
+            delay = 1
+        else:
+            # 창이 없으면 화면 갱신이 없으므로 덜 자주 확인
+            delay = 20 if self.ui_visible else 250
+        self.after(delay, self.drain_commands)
+
+    def toggle_trace(self):
+        """트레이스 기록 켜기/끄기 (끌 때 파일로 저장)"""
+        if self.trace_var.get():
+            tracer.enable()
+            self.log_message("🧭 트레이스 기록 시작")
+        else:
+            tracer.disable()
+            path = f"trace_{datetime.now():%Y%m%d_%H%M%S}.json"
+            count = tracer.export(path)
+            self.log_message(f"🧭 트레이스 저장: {path} ({count}개 이벤트)")
+
+    def run_profiler(self, duration: int = 30):
+        """샘플링 프로파일러를 지정 시간 동안 실행합니다."""
+        path = f"profile_{datetime.now():%Y%m%d_%H%M%S}.txt"
+
+        def on_done(output_path, count):
+            self.dispatch(lambda: self.log_message(f"📊 프로파일 저장: {output_path} ({count}개 샘플)"))
+            self.dispatch_ui(lambda: self.profile_button.configure(state="normal"))
+
+        if profiler.start(duration, path, on_done=on_done):
+            self.profile_button.configure(state="disabled")
+            self.log_message(f"📊 프로파일링 시작 ({duration}초)")
+        else:
+            self.log_message("📊 프로파일링이 이미 실행 중입니다.")
+
+    def update_process_count(self):
+        """살아있는 하위 프로세스 수 표시 (2초마다 갱신)"""
+        counts = process_manager.counts()
+        total = sum(counts.values())
+        detail = ", ".join(f"{kind} {count}" for kind, count in sorted(counts.items()))
+        text = f"프로세스 {total}" + (f" ({detail})" if detail else "")
+        if self.egress:
+            text += f" · 출구 {self.egress.usable_count()}/{len(self.egress.endpoints)}"
+        self.process_count_label.configure(text=text)
+        self._process_count_job = self.after(2000, self.update_process_count)
+
     def clear_log(self):
         """로그 지우기"""
+        self.log_backlog.clear()
         self.log_output.delete("1.0", "end")
 
     def browse_ytdlp(self):
@@ -691,11 +1823,18 @@ class TwitCastingMonitorGUI(ctk.CTk):
             self.save_path_input.delete(0, "end")
             self.save_path_input.insert(0, dirname)
 
-    def start_recording(self, user_id: str, channel_num: int):
-        """녹화 시작"""
-        ytdlp_path = self.ytdlp_path_input.get().strip()
-        ffmpeg_path = self.ffmpeg_path_input.get().strip()
-        save_path = self.save_path_input.get().strip()
+    def start_recording(self, user_id: str, channel_num: int, probe_info: dict = None, admitted: str = None):
+        """
+        녹화 시작
+
+        Args:
+            probe_info: 방금 확인한 방송 정보 (있으면 재추출 생략)
+            admitted: 대기열에서 승인된 경우 승인 결과 (None이면 승인 여부를 새로 결정)
+        """
+        # 감시 스레드에서도 호출되므로 위젯 대신 설정 스냅샷 사용
+        settings = self.settings.current
+        ytdlp_path = settings.ytdlp_path
+        ffmpeg_path = settings.ffmpeg_path
 
         if not ytdlp_path or not Path(ytdlp_path).exists():
             self.log_message(f"[채널{channel_num}] ⚠️  yt-dlp 경로가 올바르지 않습니다.")
@@ -705,53 +1844,221 @@ class TwitCastingMonitorGUI(ctk.CTk):
             self.log_message(f"[채널{channel_num}] ⚠️  ffmpeg 경로가 올바르지 않습니다.")
             return
 
+        # 임대가 없으면 녹화하지 않음 (다른 인스턴스와 중복 녹화 방지)
+        if self.shard and not self.shard.owns(user_id):
+            self.log_message(f"[채널{channel_num}] 🔒 {user_id} 임대가 없어 녹화하지 않습니다.")
+            return
+
+        # 동시 녹화 승인 (대역폭/디스크 한도, 채널 우선순위)
+        decision = admitted
+        if decision is None:
+            priority = int(self.config.get("channel_priority", {}).get(user_id, 0))
+            decision, reason = self.admission.request(user_id, priority, (channel_num, probe_info))
+            if decision == QUEUE:
+                self.log_message(f"[채널{channel_num}] ⏸️  {user_id} 녹화 대기: {reason}")
+                monitor = self.channel_monitors[channel_num - 1]
+                self.dispatch(lambda: monitor.set_status("⏸️ 녹화 대기", "#f39c12"))
+                return
+            if decision == DEGRADE:
+                self.log_message(f"[채널{channel_num}] 📉 {user_id} 저화질 녹화: {reason}")
+        format_selector = self.admission.degrade_format if decision == DEGRADE else None
+
         success, message = self.recorder.start_recording(
             user_id=user_id,
-            ytdlp_path=ytdlp_path,
-            ffmpeg_path=ffmpeg_path,
-            save_path=save_path or None
+            probe_info=probe_info,
+            format_selector=format_selector,
+            **self.recording_options(user_id)
         )
 
         if success:
             self.log_message(f"[채널{channel_num}] 🎬 {message}")
+            self.recording_started_at[user_id] = time.monotonic()
+            self.history.recording_started(
+                user_id, probe_info.get("title") if probe_info else None, datetime.now()
+            )
         else:
             self.log_message(f"[채널{channel_num}] ❌ {message}")
+            self.admission.release(user_id)
+
+    def recording_options(self, user_id: str) -> dict:
+        """채널의 녹화 옵션 (녹화 시작과 대기 녹화 프로세스가 같은 값을 사용, 워커 스레드에서도 호출됨)"""
+        settings = self.settings.current
+        return {
+            "ytdlp_path": settings.ytdlp_path,
+            "ffmpeg_path": settings.ffmpeg_path,
+            "save_path": settings.save_path or None,
+            "outputs": self.config.get("channel_outputs", {}).get(user_id),
+            "manifest": bool(self.config.get("integrity_manifest", False)),
+        }
 
-    def on_recording_output(self, user_id: str, line: str):
-        """녹화 출력 콜백"""
-        self.after(0, lambda: self.log_message(f"[yt-dlp][{user_id}] {line}"))
+    def rank_standby(self) -> list:
+        """
+        대기 녹화 프로세스를 배정할 채널 순위 (대기 녹화 스레드에서 호출됨)
+
+        Returns:
+            list: [(user_id, 점수, 녹화 옵션)] - 자동 녹화로 감시 중이고 아직 방송 중이 아닌 채널만
+        """
+        settings = self.settings.current
+        if not settings.auto_record or not settings.ytdlp_path or not settings.ffmpeg_path:
+            return []
+        monitors = [
+            monitor for monitor in self.channel_monitors
+            if monitor.is_monitoring and monitor.user_id and not monitor.was_live
+            and (not self.shard or self.shard.owns(monitor.user_id))
+        ]
+        if not monitors:
+            return []
+
+        options = self.config.get("standby", {})
+        days = int(options.get("days", 14))
+        recent = float(options.get("recent_minutes", 30)) * 60
+        now = datetime.now()
+        # 기록은 백그라운드에서 저장되므로 방금 끝난 방송은 감시 루프가 확인한 시각도 함께 사용
+        last_live = self.history.last_live_probes(now - timedelta(seconds=recent))
+        for monitor in monitors:
+            if monitor.live_ended_at and monitor.live_ended_at > last_live.get(monitor.user_id, datetime.min):
+                last_live[monitor.user_id] = monitor.live_ended_at
+        ranked = predict_live(
+            [monitor.user_id for monitor in monitors],
+            self.history.session_starts(days),
+            last_live,
+            now,
+            lead=float(options.get("lead_minutes", 30)) * 60,
+            recent=recent,
+            days=days
+        )
+        return [(user_id, score, self.recording_options(user_id)) for user_id, score in ranked]
+
+    def on_recording_admitted(self, user_id: str, payload, decision: str, reason: str):
+        """대기 중이던 녹화 승인 콜백 (승인 제어 스레드에서 호출됨)"""
+        channel_num, probe_info = payload
+
+        def start():
+            monitor = next((m for m in self.channel_monitors if m.user_id == user_id), None)
+            # 대기 중 방송이 끝났거나 감시가 중지되었으면 무시
+            if not monitor or not monitor.is_monitoring or not monitor.was_live:
+                self.admission.release(user_id)
+                return
+            if decision == DEGRADE:
+                self.log_message(f"[채널{channel_num}] 📉 {user_id} 대기 해제 (저화질): {reason}")
+            else:
+                self.log_message(f"[채널{channel_num}] ▶️  {user_id} 대기 해제")
+            # 프로세스 실행은 GUI 스레드를 막지 않도록 작업 스레드에서 (stop_recording_async와 같은 방식)
+            threading.Thread(
+                target=self.start_recording, args=(user_id, channel_num, probe_info, decision),
+                name=f"start-{user_id}", daemon=True
+            ).start()
+
+        self.dispatch(start)
+
+    def on_recording_finished(self, user_id: str, file_path: str, size: int, error: str):
+        """녹화 종료 콜백"""
+        self.history.recording_finished(user_id, datetime.now(), file_path, size, error)
+        self.admission.release(user_id)
+
+        started_at = self.recording_started_at.pop(user_id, None)
+        if file_path and size:
+            elapsed = time.monotonic() - started_at if started_at else None
+            self.library.add(file_path, duration=elapsed)
+        if self.retention:
+            self.retention.wake()
+        if self.backfill:
+            self.backfill.wake()
+
+    def on_recording_part_finished(self, user_id: str, file_path: str, size: int):
+        """이어서 녹화로 끝난 부분 파일 콜백 (정지 감시 스레드에서 호출됨)"""
+        now = time.monotonic()
+        started_at = self.recording_started_at.get(user_id)
+        # 다음 부분의 재생 시간은 이어서 녹화한 시각부터
+        self.recording_started_at[user_id] = now
+        if size:
+            self.library.add(file_path, duration=now - started_at if started_at else None)
+
+    def get_active_recording_dirs(self) -> set:
+        """녹화 중인 방송 디렉토리 (보존 정책 삭제 제외 대상)"""
+        dirs = set()
+        for user_id in self.recorder.get_recording_channels():
+            file_path = self.recorder.get_output_file(user_id)
+            if file_path:
+                dirs.add(str(Path(file_path).parent))
+        return dirs
+
+    def on_retention_delete(self, session: dict, reason: str):
+        """보존 정책 삭제 콜백 (보존 정책 스레드에서 호출됨)"""
+        action = "삭제 예정" if self.retention.dry_run else "삭제"
+        message = f"🧹 {action}: {Path(session['dir']).name} ({format_size(session['bytes'])}, {reason})"
+        self.dispatch(lambda: self.log_message(message))
+
+    def queue_backfill(self, user_id: str):
+        """채널의 지난 방송 목록을 가져와 받지 않은 방송을 백필 대기열에 추가합니다 (백필 작업자 풀)."""
+        self.backfill.request_listing(user_id)
+
+    def live_movies(self) -> dict:
+        """방송 중인 채널 {user_id: 방송 ID | None} (백필 스레드에서 호출됨)"""
+        return {
+            monitor.user_id: monitor.live_movie_id
+            for monitor in list(self.channel_monitors)
+            if monitor.is_monitoring and monitor.user_id and monitor.was_live
+        }
 
-    def load_settings(self):
-        """설정 불러오기"""
-        # 공통 설정
-        interval = self.config.get("check_interval", "60")
-        self.interval_input.delete(0, "end")
-        self.interval_input.insert(0, str(interval))
+    def locate_recording(self, user_id: str) -> tuple[str | None, float | None]:
+        """녹화 중인 파일 경로와 녹화 시작 시각(epoch 초) - 댓글 파일 위치/기준 시각용"""
+        started = self.recording_started_at.get(user_id)
+        started_at = time.time() - (time.monotonic() - started) if started else None
+        return self.recorder.get_output_file(user_id), started_at
 
-        auto_record = self.config.get("auto_record", False)
-        self.auto_record_var.set(auto_record)
+    def stop_comments_async(self, user_id: str):
+        """댓글 기록을 백그라운드에서 마무리합니다 (남은 댓글 기록 / 연결 정리)."""
+        def run():
+            result = self.comments.stop(user_id)
+            if result and result["written"]:
+                dropped = f", {result['dropped']}개 누락" if result["dropped"] else ""
+                self.log_message(f"💬 {user_id} 댓글 {result['written']}개 기록{dropped}", channel=user_id)
 
-        ytdlp_path = self.config.get("ytdlp_path", "")
-        if ytdlp_path:
-            self.ytdlp_path_input.delete(0, "end")
-            self.ytdlp_path_input.insert(0, ytdlp_path)
+        threading.Thread(target=run, name=f"comments-{user_id}", daemon=True).start()
 
-        ffmpeg_path = self.config.get("ffmpeg_path", "")
-        if ffmpeg_path:
-            self.ffmpeg_path_input.delete(0, "end")
-            self.ffmpeg_path_input.insert(0, ffmpeg_path)
+    def on_backfill_event(self, user_id: str, message: str):
+        """백필 상태 콜백 (백필 스레드에서 호출됨)"""
+        self.log_message(f"[{user_id}] {message}", channel=user_id)
 
-        save_path = self.config.get("save_path", "")
-        if save_path:
-            self.save_path_input.delete(0, "end")
-            self.save_path_input.insert(0, save_path)
+    def on_recording_output(self, user_id: str, line: str):
+        """녹화 출력 콜백 (출력 읽기 스레드에서 호출됨, 창이 없으면 GUI 스레드를 깨우지 않음)"""
+        self.log_message(f"[yt-dlp][{user_id}] {line}", level="debug", channel=user_id)
+
+    def fill_settings_inputs(self, check_interval, auto_record: bool, ytdlp_path: str, ffmpeg_path: str,
+                             save_path: str):
+        """공통 설정 입력칸 채우기 (GUI 스레드 전용)"""
+        self.interval_input.delete(0, "end")
+        self.interval_input.insert(0, str(check_interval))
+        self.auto_record_var.set(auto_record)
+        for entry, value in (
+            (self.ytdlp_path_input, ytdlp_path),
+            (self.ffmpeg_path_input, ffmpeg_path),
+            (self.save_path_input, save_path),
+        ):
+            if value:
+                entry.delete(0, "end")
+                entry.insert(0, value)
+
+    def load_settings(self):
+        """설정 불러오기 (시작 시 한 번)"""
+        # 공통 설정
+        self.fill_settings_inputs(
+            self.config.get("check_interval", "60"),
+            self.config.get("auto_record", False),
+            self.config.get("ytdlp_path", ""),
+            self.config.get("ffmpeg_path", ""),
+            self.config.get("save_path", "")
+        )
 
-        # 채널별 URL
+        # 채널별 URL (가져온 채널이 4개보다 많으면 칸을 늘림)
         urls = self.config.get("channel_urls", ["", "", "", ""])
-        for i, url in enumerate(urls[:4]):
-            if url and i < len(self.channel_monitors):
-                self.channel_monitors[i].url_input.delete(0, "end")
-                self.channel_monitors[i].url_input.insert(0, url)
+        while len(self.channel_monitors) < len(urls):
+            self.add_channel_monitor()
+        for i, url in enumerate(urls):
+            if url:
+                self.channel_monitors[i].set_url(url)
+        self.refresh_channel_names()
 
     def bind_auto_save(self):
         """자동 저장 바인딩"""
@@ -760,14 +2067,14 @@ class TwitCastingMonitorGUI(ctk.CTk):
         self.ffmpeg_path_input.bind("<FocusOut>", lambda e: self.save_settings())
         self.save_path_input.bind("<FocusOut>", lambda e: self.save_settings())
 
-        for monitor in self.channel_monitors:
-            monitor.url_input.bind("<FocusOut>", lambda e: self.save_settings())
-
         self.auto_record_var.trace_add("write", lambda *args: self.save_settings())
 
     def save_settings(self):
         """설정 저장"""
-        channel_urls = [monitor.url_input.get().strip() for monitor in self.channel_monitors]
+        if not self.ui_visible:
+            # 창을 제거할 때 이미 저장했고, 그 뒤로 바뀐 입력값이 없음
+            return
+        channel_urls = [monitor.get_url() for monitor in self.channel_monitors]
 
         self.config.update({
             "check_interval": self.interval_input.get().strip(),
@@ -778,3 +2085,4 @@ class TwitCastingMonitorGUI(ctk.CTk):
             "channel_urls": channel_urls
         })
         self.config.save_config()
+        self.publish_settings()
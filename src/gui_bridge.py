@@ -0,0 +1,110 @@
+"""GUI와 워커 스레드 사이 연결 모듈
+
+- 설정 스냅샷: GUI 스레드가 입력값이 바뀔 때마다 변경 불가 스냅샷을 발행하고,
+  워커 스레드는 Tk 위젯 대신 최신 스냅샷만 읽음
+- 명령 큐: 워커 스레드의 GUI 갱신 요청을 큐에 모아, 메인 루프가 프레임마다 정해진 양만 처리
+"""
+
+import queue
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, replace
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """워커 스레드가 읽는 설정 값 (변경 불가)"""
+
+    version: int = 0
+    check_interval: int = 60
+    auto_record: bool = False
+    ytdlp_path: str = ""
+    ffmpeg_path: str = ""
+    save_path: str = ""
+
+
+class SettingsStore:
+    """최신 설정 스냅샷 보관 (발행은 GUI 스레드, 읽기는 모든 스레드)"""
+
+    def __init__(self):
+        self._snapshot = SettingsSnapshot()
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> SettingsSnapshot:
+        """최신 스냅샷 (참조 하나만 읽으므로 잠금 없이 안전)"""
+        return self._snapshot
+
+    def publish(self, **values) -> SettingsSnapshot:
+        """
+        값이 바뀐 경우에만 새 스냅샷을 발행합니다.
+
+        Returns:
+            SettingsSnapshot: 발행 후 최신 스냅샷
+        """
+        with self._lock:
+            current = self._snapshot
+            if all(getattr(current, key) == value for key, value in values.items()):
+                return current
+            self._snapshot = replace(current, version=current.version + 1, **values)
+            return self._snapshot
+
+
+class CommandQueue:
+    """워커 스레드 -> GUI 스레드 명령 큐 (프레임당 처리량 제한)"""
+
+    def __init__(self, max_per_frame: int = 200, budget_ms: float = 8.0, on_error=None):
+        """
+        Args:
+            max_per_frame: 한 번에 처리할 최대 명령 수
+            budget_ms: 한 번에 처리할 최대 시간 (밀리초)
+            on_error: 명령 실행 오류 콜백 on_error(예외, traceback 문자열)
+        """
+        self.max_per_frame = max_per_frame
+        self.budget_ms = budget_ms
+        self.on_error = on_error
+        self._queue = queue.SimpleQueue()
+
+    def put(self, callback):
+        """GUI 스레드에서 실행할 콜백을 넣습니다 (모든 스레드에서 호출 가능)."""
+        self._queue.put(callback)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def drain(self) -> int:
+        """
+        쌓인 명령을 처리합니다 (GUI 스레드에서 호출). 처리량/시간 한도를 넘으면 다음 프레임으로 미룸.
+
+        Returns:
+            int: 처리한 명령 수
+        """
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        count = 0
+        while count < self.max_per_frame:
+            try:
+                callback = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback()
+            except Exception as e:
+                # 명령 하나의 오류가 나머지 명령 처리를 막지 않도록 함 (로그로 보고만)
+                self._report(e)
+            count += 1
+            if time.perf_counter() >= deadline:
+                break
+        return count
+
+    def _report(self, error: Exception):
+        details = traceback.format_exc()
+        if self.on_error is not None:
+            try:
+                self.on_error(error, details)
+                return
+            except Exception:
+                details += traceback.format_exc()
+        # 보고할 곳이 없거나 보고 중 오류가 나면 표준 오류로
+        sys.stderr.write(details)
@@ -0,0 +1,268 @@
+"""확인/방송/녹화 기록 저장 모듈
+
+감시 루프가 알게 된 정보(확인 결과, 방송 세션, 녹화 파일)를 SQLite(WAL 모드)에 저장합니다.
+쓰기는 큐에 넣기만 하고 백그라운드 스레드가 묶어서 기록하므로 확인 주기를 지연시키지 않습니다.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    checked_at TEXT NOT NULL,
+    is_live INTEGER NOT NULL,
+    title TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_probes_user_time ON probes(user_id, checked_at);
+CREATE INDEX IF NOT EXISTS idx_probes_time ON probes(checked_at);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    movie_id TEXT,
+    title TEXT,
+    started_at TEXT NOT NULL,
+    ended_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_user_time ON sessions(user_id, started_at);
+
+CREATE TABLE IF NOT EXISTS recordings (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    title TEXT,
+    started_at TEXT NOT NULL,
+    ended_at TEXT,
+    file_path TEXT,
+    bytes INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_recordings_user_time ON recordings(user_id, started_at);
+"""
+
+
+class HistoryStore:
+    """SQLite 기반 기록 저장소 (백그라운드 일괄 쓰기)"""
+
+    def __init__(self, db_path: str = "history.db", batch_size: int = 500, flush_interval: float = 1.0):
+        """
+        Args:
+            db_path: 데이터베이스 파일 경로
+            batch_size: 한 트랜잭션에 기록할 최대 행 수
+            flush_interval: 쓰기 대기 최대 시간 (초)
+        """
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+        self._thread = threading.Thread(target=self._writer, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10.0)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # === 쓰기 (논블로킹) ===
+
+    def _enqueue(self, sql: str, params: tuple):
+        self._queue.put((sql, params))
+
+    def record_probe(self, user_id: str, status: dict):
+        """확인 결과를 기록합니다."""
+        self._enqueue(
+            "INSERT INTO probes (user_id, checked_at, is_live, title, error) VALUES (?, ?, ?, ?, ?)",
+            (user_id, status["checked_at"].isoformat(), int(bool(status.get("is_live"))),
+             status.get("title"), status.get("error"))
+        )
+
+    def session_started(self, user_id: str, movie_id: str, title: str, started_at: datetime):
+        """방송 시작을 기록합니다."""
+        self._enqueue(
+            "INSERT INTO sessions (user_id, movie_id, title, started_at) VALUES (?, ?, ?, ?)",
+            (user_id, movie_id, title, started_at.isoformat())
+        )
+
+    def session_ended(self, user_id: str, ended_at: datetime):
+        """진행 중인 방송 세션을 종료 처리합니다."""
+        self._enqueue(
+            "UPDATE sessions SET ended_at = ? WHERE user_id = ? AND ended_at IS NULL",
+            (ended_at.isoformat(), user_id)
+        )
+
+    def recording_started(self, user_id: str, title: str, started_at: datetime):
+        """녹화 시작을 기록합니다."""
+        self._enqueue(
+            "INSERT INTO recordings (user_id, title, started_at) VALUES (?, ?, ?)",
+            (user_id, title, started_at.isoformat())
+        )
+
+    def recording_finished(self, user_id: str, ended_at: datetime, file_path: str = None,
+                           size: int = None, error: str = None):
+        """진행 중인 녹화를 종료 처리합니다."""
+        self._enqueue(
+            "UPDATE recordings SET ended_at = ?, file_path = ?, bytes = ?, error = ? "
+            "WHERE user_id = ? AND ended_at IS NULL",
+            (ended_at.isoformat(), file_path, size, error, user_id)
+        )
+
+    def _writer(self):
+        """큐에 쌓인 쓰기를 묶어서 한 트랜잭션으로 기록합니다."""
+        conn = self._connect()
+        try:
+            while not (self._stop_event.is_set() and self._queue.empty()):
+                try:
+                    batch = [self._queue.get(timeout=self.flush_interval)]
+                except queue.Empty:
+                    continue
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                waiters = []
+                try:
+                    with conn:
+                        for sql, params in batch:
+                            if sql is None:
+                                waiters.append(params)
+                            else:
+                                conn.execute(sql, params)
+                except sqlite3.Error:
+                    # 기록 실패는 감시/녹화에 영향을 주지 않음
+                    pass
+                for waiter in waiters:
+                    waiter.set()
+        finally:
+            conn.close()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """지금까지 요청된 쓰기가 모두 커밋될 때까지 기다립니다."""
+        done = threading.Event()
+        self._queue.put((None, done))
+        return done.wait(timeout)
+
+    def close(self):
+        """남은 쓰기를 모두 기록하고 종료합니다."""
+        self._stop_event.set()
+        self._thread.join(timeout=10)
+
+    # === 보존 기간 / 압축 ===
+
+    def compact(self, retention_days: int = 180, vacuum: bool = False) -> int:
+        """
+        보존 기간이 지난 기록을 삭제합니다.
+
+        Args:
+            retention_days: 보존 기간 (일)
+            vacuum: 삭제 후 파일 크기 축소 (VACUUM) 여부
+
+        Returns:
+            int: 삭제된 행 수
+        """
+        cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+        with closing(self._connect()) as conn:
+            with conn:
+                deleted = conn.execute("DELETE FROM probes WHERE checked_at < ?", (cutoff,)).rowcount
+                deleted += conn.execute(
+                    "DELETE FROM sessions WHERE started_at < ? AND ended_at IS NOT NULL", (cutoff,)
+                ).rowcount
+                deleted += conn.execute(
+                    "DELETE FROM recordings WHERE started_at < ? AND ended_at IS NOT NULL", (cutoff,)
+                ).rowcount
+            if vacuum:
+                conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return deleted
+
+    # === 조회 ===
+
+    def sessions_for(self, user_id: str, days: int = 30) -> list[dict]:
+        """채널의 최근 방송 세션 목록을 반환합니다 (최신순)."""
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT user_id, movie_id, title, started_at, ended_at FROM sessions "
+                "WHERE user_id = ? AND started_at >= ? ORDER BY started_at DESC",
+                (user_id, since)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def recorded_movie_ids(self, user_id: str) -> set[str]:
+        """
+        채널의 방송 중 녹화했거나 녹화 중인 방송 ID (백필 제외용).
+        방송 세션 기간 안에 시작한 녹화가 진행 중이거나 파일을 남겼으면 녹화한 방송으로 봅니다.
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT s.movie_id FROM sessions s WHERE s.user_id = ? AND s.movie_id IS NOT NULL "
+                "AND EXISTS (SELECT 1 FROM recordings r WHERE r.user_id = s.user_id "
+                "AND r.started_at >= s.started_at AND (s.ended_at IS NULL OR r.started_at <= s.ended_at) "
+                "AND (r.ended_at IS NULL OR r.file_path IS NOT NULL))",
+                (user_id,)
+            ).fetchall()
+        return {str(row[0]) for row in rows}
+
+    def session_starts(self, days: int = 14) -> dict:
+        """모든 채널의 최근 방송 시작/종료 시각 {user_id: [(started_at, ended_at | None)]} (대기 녹화 예측용)"""
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        result = {}
+        with closing(self._connect()) as conn:
+            for user_id, started_at, ended_at in conn.execute(
+                "SELECT user_id, started_at, ended_at FROM sessions WHERE started_at >= ?", (since,)
+            ):
+                result.setdefault(user_id, []).append((
+                    datetime.fromisoformat(started_at),
+                    datetime.fromisoformat(ended_at) if ended_at else None,
+                ))
+        return result
+
+    def last_live_probes(self, since: datetime) -> dict:
+        """채널별 마지막으로 방송 중으로 확인된 시각 {user_id: datetime} (since 이후만)"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT user_id, MAX(checked_at) FROM probes WHERE checked_at >= ? AND is_live = 1 GROUP BY user_id",
+                (since.isoformat(),)
+            ).fetchall()
+        return {user_id: datetime.fromisoformat(checked_at) for user_id, checked_at in rows}
+
+    def recordings_for(self, user_id: str, days: int = 30) -> list[dict]:
+        """채널의 최근 녹화 목록을 반환합니다 (최신순)."""
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT user_id, title, started_at, ended_at, file_path, bytes, error FROM recordings "
+                "WHERE user_id = ? AND started_at >= ? ORDER BY started_at DESC",
+                (user_id, since)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def error_rate_by_channel(self, days: int = 7) -> list[dict]:
+        """채널별 확인 횟수, 오류 횟수, 오류율을 반환합니다 (오류율 높은 순)."""
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT user_id, COUNT(*) AS probes, COUNT(error) AS errors, "
+                "CAST(COUNT(error) AS REAL) / COUNT(*) AS error_rate "
+                "FROM probes WHERE checked_at >= ? GROUP BY user_id ORDER BY error_rate DESC",
+                (since,)
+            ).fetchall()
+        return [dict(row) for row in rows]
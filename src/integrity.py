@@ -0,0 +1,265 @@
+"""녹화 무결성 목록(manifest) 모듈
+
+녹화 데이터가 파일에 쓰이는 동안 함께 계산하여, 나중에 검증/중복 확인 시 영상을 다시 읽지 않도록 합니다.
+
+- 파일 전체 SHA-256 (쓰는 순서대로 누적 계산)과 고정 크기 구간별 SHA-256
+- 입력 MPEG-TS의 PCR 시간 간격으로 타임스탬프 끊김/역행, 연속성 카운터로 패킷 손실 감지
+- 결과는 영상 옆 `{파일명}.manifest.json`에 저장 (녹화 중에도 주기적으로 갱신)
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+_TS_PACKET = 188
+_TS_SYNC = 0x47
+_NULL_PID = 0x1FFF
+_PCR_HZ = 90000
+_MAX_EVENTS = 1000
+
+
+def manifest_path_for(media_path) -> Path:
+    """영상 파일의 무결성 목록 경로"""
+    media_path = Path(media_path)
+    return media_path.with_name(media_path.name + ".manifest.json")
+
+
+class TransportStreamMonitor:
+    """MPEG-TS 스트림의 PCR 간격과 연속성 카운터를 검사하는 클래스"""
+
+    def __init__(self, gap_threshold: float = 1.0):
+        """
+        Args:
+            gap_threshold: 이 시간(초)보다 큰 PCR 간격을 끊김으로 기록
+        """
+        self.gap_threshold = gap_threshold
+        self.packets = 0
+        self.sync_losses = 0
+        self.cc_errors = 0
+        self.duration = 0.0  # 끊김을 제외한 PCR 진행 시간 (초)
+        self.gap_seconds = 0.0
+        self.events = []  # [{"kind", "seconds", "offset", "wall_time"}]
+        self.event_count = 0
+        self._remainder = b""
+        self._offset = 0
+        self._continuity = {}  # {pid: 마지막 연속성 카운터}
+        self._last_pcr = None
+
+    @property
+    def is_transport_stream(self) -> bool:
+        return self.packets > 0
+
+    def _event(self, kind: str, seconds: float, offset: int):
+        self.event_count += 1
+        if len(self.events) < _MAX_EVENTS:
+            self.events.append({
+                "kind": kind,
+                "seconds": round(seconds, 3),
+                "offset": offset,
+                "wall_time": datetime.now().isoformat(timespec="seconds"),
+            })
+
+    def feed(self, data: bytes):
+        """스트림 데이터를 이어서 검사합니다 (청크 경계와 무관)."""
+        buffer = self._remainder + data if self._remainder else data
+        view = memoryview(buffer)
+        position = 0
+        end = len(buffer) - _TS_PACKET
+
+        while position <= end:
+            if buffer[position] != _TS_SYNC:
+                # 동기 바이트를 다시 찾음
+                next_sync = buffer.find(bytes([_TS_SYNC]), position + 1)
+                self.sync_losses += 1
+                if next_sync < 0:
+                    position = len(buffer)
+                    break
+                position = next_sync
+                continue
+
+            packet = view[position:position + _TS_PACKET]
+            self._inspect(packet, self._offset + position)
+            position += _TS_PACKET
+
+        self._offset += position
+        self._remainder = bytes(view[position:]) if position < len(buffer) else b""
+
+    def _inspect(self, packet, offset: int):
+        self.packets += 1
+        pid = ((packet[1] & 0x1F) << 8) | packet[2]
+        if pid == _NULL_PID:
+            return
+        adaptation = (packet[3] >> 4) & 0x3
+        counter = packet[3] & 0x0F
+
+        discontinuity = False
+        if adaptation & 0x2 and packet[4] > 0:
+            flags = packet[5]
+            discontinuity = bool(flags & 0x80)
+            if flags & 0x10 and packet[4] >= 7:
+                pcr_base = (packet[6] << 25) | (packet[7] << 17) | (packet[8] << 9) | (packet[9] << 1) | (packet[10] >> 7)
+                self._check_pcr(pcr_base / _PCR_HZ, discontinuity, offset)
+
+        # 연속성 카운터: 페이로드가 있는 패킷만 증가 (같은 값 1회 반복은 허용)
+        if adaptation & 0x1:
+            last = self._continuity.get(pid)
+            if last is not None and not discontinuity and counter != last and counter != (last + 1) & 0x0F:
+                self.cc_errors += 1
+            self._continuity[pid] = counter
+
+    def _check_pcr(self, pcr: float, discontinuity: bool, offset: int):
+        last = self._last_pcr
+        self._last_pcr = pcr
+        if last is None:
+            return
+        delta = pcr - last
+        if discontinuity:
+            self._event("discontinuity", delta, offset)
+        elif delta < 0:
+            # 33비트 PCR 순환(약 26.5시간)은 역행으로 보지 않음
+            if last > (2 ** 33) / _PCR_HZ - 60 and pcr < 60:
+                self.duration += delta + (2 ** 33) / _PCR_HZ
+            else:
+                self._event("backward", delta, offset)
+        elif delta > self.gap_threshold:
+            self.gap_seconds += delta
+            self._event("gap", delta, offset)
+        else:
+            self.duration += delta
+
+    def summary(self) -> dict:
+        return {
+            "format": "mpegts" if self.is_transport_stream else "unknown",
+            "packets": self.packets,
+            "sync_losses": self.sync_losses,
+            "continuity_errors": self.cc_errors,
+            "duration": round(self.duration, 3),
+            "gap_seconds": round(self.gap_seconds, 3),
+            "event_count": self.event_count,
+            "events": list(self.events),
+        }
+
+
+class ManifestWriter:
+    """파일에 쓰는 데이터로 누적/구간 해시를 계산하여 무결성 목록을 저장하는 클래스"""
+
+    def __init__(self, media_path, segment_size: int = 8 * 1024 * 1024, save_every: int = 8):
+        """
+        Args:
+            media_path: 기록 중인 영상 파일 경로
+            segment_size: 구간 해시 크기 (바이트)
+            save_every: 이 수만큼 구간이 완성될 때마다 목록 파일 갱신 (중단 대비)
+        """
+        self.media_path = Path(media_path)
+        self.path = manifest_path_for(self.media_path)
+        self.segment_size = segment_size
+        self.save_every = save_every
+        self.stream = None  # TransportStreamMonitor (선택)
+        self.started_at = datetime.now()
+        self.bytes = 0
+        self.segments = []  # [{"offset", "length", "sha256"}]
+        self._file_hash = hashlib.sha256()
+        self._segment_hash = hashlib.sha256()
+        self._segment_length = 0
+
+    def update(self, data: bytes):
+        """파일에 쓴 데이터를 해시에 반영합니다."""
+        self._file_hash.update(data)
+        view = memoryview(data)
+        while view:
+            take = min(len(view), self.segment_size - self._segment_length)
+            self._segment_hash.update(view[:take])
+            self._segment_length += take
+            self.bytes += take
+            view = view[take:]
+            if self._segment_length == self.segment_size:
+                self._close_segment()
+                if len(self.segments) % self.save_every == 0:
+                    self.save(complete=False)
+
+    def _close_segment(self):
+        if not self._segment_length:
+            return
+        self.segments.append({
+            "offset": self.bytes - self._segment_length,
+            "length": self._segment_length,
+            "sha256": self._segment_hash.hexdigest(),
+        })
+        self._segment_hash = hashlib.sha256()
+        self._segment_length = 0
+
+    def save(self, complete: bool) -> dict:
+        """무결성 목록을 임시 파일에 쓴 뒤 교체합니다 (쓰는 중 중단되어도 이전 목록 유지)."""
+        manifest = {
+            "file": self.media_path.name,
+            "complete": complete,
+            "algorithm": "sha256",
+            "segment_size": self.segment_size,
+            "bytes": self.bytes,
+            "sha256": self._file_hash.hexdigest() if complete else None,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "finished_at": datetime.now().isoformat(timespec="seconds") if complete else None,
+            "segments": list(self.segments),
+            "stream": self.stream.summary() if self.stream else None,
+        }
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            temp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+        return manifest
+
+    def finish(self) -> dict:
+        """마지막 구간을 닫고 완성된 목록을 저장합니다."""
+        self._close_segment()
+        return self.save(complete=True)
+
+
+def verify_manifest(path, progress=None) -> dict:
+    """
+    무결성 목록과 영상 파일을 비교합니다 (영상을 한 번 읽음).
+
+    Args:
+        path: 영상 파일 또는 목록 파일 경로
+        progress: 구간마다 호출할 콜백 (검사한 구간 수, 전체 구간 수)
+
+    Returns:
+        dict: {"ok", "bytes", "expected_bytes", "bad_segments": [순번], "sha256_match", "elapsed"}
+    """
+    path = Path(path)
+    manifest_path = path if path.name.endswith(".manifest.json") else manifest_path_for(path)
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    media_path = manifest_path.with_name(manifest["file"])
+
+    started = time.perf_counter()
+    file_hash = hashlib.sha256()
+    bad = []
+    size = 0
+    with open(media_path, "rb") as f:
+        for index, segment in enumerate(manifest["segments"]):
+            f.seek(segment["offset"])
+            data = f.read(segment["length"])
+            size += len(data)
+            file_hash.update(data)
+            if hashlib.sha256(data).hexdigest() != segment["sha256"]:
+                bad.append(index)
+            if progress:
+                progress(index + 1, len(manifest["segments"]))
+        tail = f.read()
+        size += len(tail)
+        file_hash.update(tail)
+
+    sha256_match = manifest.get("sha256") is None or file_hash.hexdigest() == manifest["sha256"]
+    return {
+        "ok": not bad and sha256_match and size == manifest["bytes"],
+        "bytes": size,
+        "expected_bytes": manifest["bytes"],
+        "bad_segments": bad,
+        "sha256_match": sha256_match,
+        "elapsed": time.perf_counter() - started,
+    }
@@ -0,0 +1,463 @@
+"""녹화 파일 목록 색인 모듈
+
+저장 경로(`저장경로/채널명/[날짜]_제목(ID)/...`)의 녹화 파일을 SQLite에 색인하여,
+목록 조회/검색 시 디렉토리 트리를 다시 훑지 않도록 합니다.
+
+- 녹화가 끝날 때마다 해당 파일만 추가 (증분 색인)
+- 재검사는 디렉토리 수정 시각(mtime)이 바뀐 곳만 다시 읽음
+- 재생 시간은 mp4 헤더(mvhd)에서 읽고, 읽을 수 없으면 녹화 시간으로 대체
+- 채널별 파일 수/사용량은 트리거로 증분 집계 (보존 정책이 트리를 다시 훑지 않음)
+"""
+
+import os
+import re
+import sqlite3
+import struct
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+
+MEDIA_EXTENSIONS = {".mp4", ".m4a", ".mkv", ".webm", ".ts", ".flv"}
+
+# [20240101]_제목(123456789)
+_SESSION_DIR = re.compile(r"^\[(?P<date>\d{8})\]_(?P<title>.*)\((?P<movie_id>[^()]*)\)$")
+
+# 녹화 중단 후 이어서 녹화한 파일 표시 (.part2, .part2.480p)
+_CONTINUATION = re.compile(r"^part(?P<part>\d+)(?:\.|$)")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    movie_id TEXT,
+    title TEXT,
+    date TEXT,
+    variant TEXT NOT NULL DEFAULT '',
+    bytes INTEGER NOT NULL,
+    duration REAL,
+    mtime REAL NOT NULL,
+    part INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_files_user_date ON files(user_id, date);
+CREATE INDEX IF NOT EXISTS idx_files_date ON files(date);
+
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS usage (
+    user_id TEXT PRIMARY KEY,
+    files INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+"""
+
+# files 변경 시 usage를 함께 갱신 (INSERT OR REPLACE는 삭제 트리거를 실행하지 않으므로 UPSERT 사용)
+_USAGE_TRIGGERS = """
+CREATE TRIGGER trg_files_insert AFTER INSERT ON files BEGIN
+    INSERT INTO usage VALUES (NEW.user_id, 1, NEW.bytes)
+    ON CONFLICT(user_id) DO UPDATE SET files = files + 1, bytes = bytes + excluded.bytes;
+END;
+CREATE TRIGGER trg_files_update AFTER UPDATE OF bytes ON files BEGIN
+    UPDATE usage SET bytes = bytes - OLD.bytes + NEW.bytes WHERE user_id = NEW.user_id;
+END;
+CREATE TRIGGER trg_files_delete AFTER DELETE ON files BEGIN
+    UPDATE usage SET files = files - 1, bytes = bytes - OLD.bytes WHERE user_id = OLD.user_id;
+END;
+INSERT OR REPLACE INTO usage SELECT user_id, COUNT(*), SUM(bytes) FROM files GROUP BY user_id;
+"""
+
+_UPSERT = (
+    "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(path) DO UPDATE SET "
+    "bytes = excluded.bytes, duration = COALESCE(excluded.duration, duration), mtime = excluded.mtime"
+)
+
+
+def mp4_duration(path) -> float | None:
+    """mp4/m4a 파일의 moov/mvhd 상자에서 재생 시간(초)을 읽습니다. 읽을 수 없으면 None."""
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            offset = 0
+            # 최상위 상자를 건너뛰며 moov 찾기 (moov가 파일 끝에 있어도 seek만 반복)
+            while offset + 8 <= size:
+                f.seek(offset)
+                box_size, box_type = struct.unpack(">I4s", f.read(8))
+                header = 8
+                if box_size == 1:
+                    box_size = struct.unpack(">Q", f.read(8))[0]
+                    header = 16
+                elif box_size == 0:
+                    box_size = size - offset
+                if box_size < header:
+                    return None
+                if box_type == b"moov":
+                    moov = f.read(min(box_size - header, 1024 * 1024))
+                    return _mvhd_duration(moov)
+                offset += box_size
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def _mvhd_duration(moov: bytes) -> float | None:
+    position = 0
+    while position + 8 <= len(moov):
+        box_size, box_type = struct.unpack_from(">I4s", moov, position)
+        if box_size < 8:
+            return None
+        if box_type == b"mvhd":
+            version = moov[position + 8]
+            if version == 1:
+                timescale, duration = struct.unpack_from(">IQ", moov, position + 28)
+            else:
+                timescale, duration = struct.unpack_from(">II", moov, position + 20)
+            # fragmented mp4(empty_moov)는 duration이 0
+            return duration / timescale if timescale and duration else None
+        position += box_size
+    return None
+
+
+def parse_recording_path(path: Path) -> dict:
+    """
+    녹화 파일 경로에서 채널/날짜/제목/방송 ID/출력 이름을 추출합니다.
+
+    Returns:
+        dict: {"user_id", "movie_id", "title", "date", "variant", "part"}
+              part는 같은 방송을 이어서 녹화한 순번 (처음 녹화한 파일은 1)
+    """
+    session = path.parent.name
+    match = _SESSION_DIR.match(session)
+    info = {
+        "user_id": path.parent.parent.name,
+        "movie_id": match["movie_id"] if match else None,
+        "title": match["title"] if match else session,
+        "date": None,
+        "variant": "",
+        "part": 1,
+    }
+    if match:
+        info["date"] = f"{match['date'][:4]}-{match['date'][4:6]}-{match['date'][6:]}"
+        # [날짜]_제목(ID).480p.mp4 -> 480p, 이어서 녹화한 파일(.part2)은 같은 방송의 2번째 부분 원본
+        stem = path.name[:-len(path.suffix)] if path.suffix else path.name
+        if stem != session and stem.startswith(session + "."):
+            rest = stem[len(session) + 1:]
+            continuation = _CONTINUATION.match(rest)
+            if continuation:
+                info["part"] = int(continuation["part"])
+                rest = rest[continuation.end():]
+            info["variant"] = rest
+    return info
+
+
+class RecordingLibrary:
+    """SQLite 기반 녹화 파일 색인"""
+
+    def __init__(self, db_path: str = "library.db"):
+        """
+        Args:
+            db_path: 데이터베이스 파일 경로
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._scan_lock = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            has_triggers = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_files_insert'"
+            ).fetchone()
+            if not has_triggers:
+                # 트리거 이전에 만든 색인은 한 번 집계해서 시작
+                conn.executescript(f"BEGIN; {_USAGE_TRIGGERS} COMMIT;")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+            if "part" not in columns:
+                # 이어서 녹화한 파일을 별도 원본으로 색인했던 이전 색인은 경로에서 순번을 다시 읽음
+                with conn:
+                    conn.execute("ALTER TABLE files ADD COLUMN part INTEGER NOT NULL DEFAULT 1")
+                    conn.executemany("UPDATE files SET part = ?, variant = ? WHERE path = ?", [
+                        (info["part"], info["variant"], path)
+                        for path in (row[0] for row in conn.execute("SELECT path FROM files"))
+                        for info in (parse_recording_path(Path(path)),)
+                        if info["part"] != 1
+                    ])
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10.0)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # === 색인 ===
+
+    @staticmethod
+    def _row(path: Path, stat: os.stat_result, duration: float = None) -> tuple:
+        info = parse_recording_path(path)
+        if duration is None and path.suffix in (".mp4", ".m4a"):
+            duration = mp4_duration(path)
+        return (str(path), info["user_id"], info["movie_id"], info["title"], info["date"],
+                info["variant"], stat.st_size, duration, stat.st_mtime, info["part"])
+
+    def add(self, file_path: str, duration: float = None) -> bool:
+        """
+        녹화가 끝난 파일과 같은 디렉토리의 다른 출력 파일을 색인에 추가합니다.
+
+        Args:
+            file_path: 원본 녹화 파일 경로
+            duration: 헤더에서 재생 시간을 읽을 수 없을 때 사용할 녹화 시간 (초)
+        """
+        path = Path(file_path)
+        try:
+            directory = path.parent
+            with os.scandir(directory) as scan:
+                entries = [
+                    (Path(entry.path), entry.stat())
+                    for entry in scan
+                    if entry.is_file() and Path(entry.name).suffix.lower() in MEDIA_EXTENSIONS
+                ]
+            dir_mtime = directory.stat().st_mtime
+        except OSError:
+            return False
+
+        rows = []
+        for entry_path, stat in entries:
+            row = self._row(entry_path, stat)
+            if row[7] is None and entry_path == path:
+                row = row[:7] + (duration,) + row[8:]
+            rows.append(row)
+
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(_UPSERT, rows)
+            conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?)", (str(directory), dir_mtime))
+        return True
+
+    def remove(self, paths: list[str]):
+        """삭제된 파일을 색인에서 제거합니다."""
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("DELETE FROM files WHERE path = ?", [(str(p),) for p in paths])
+
+    def reconcile(self, save_dir: str, full: bool = False) -> dict:
+        """
+        수정 시각이 바뀐 디렉토리만 다시 읽어 색인을 실제 파일과 맞춥니다.
+
+        Args:
+            save_dir: 저장 경로
+            full: True이면 채널 디렉토리의 mtime이 같아도 방송 디렉토리까지 확인
+                  (방송 디렉토리 안에서만 파일이 지워진 경우는 채널 디렉토리 mtime이 바뀌지 않음)
+
+        Returns:
+            dict: {"scanned": 다시 읽은 방송 디렉토리 수, "added": 추가/갱신, "removed": 제거}
+        """
+        root = Path(save_dir)
+        result = {"scanned": 0, "added": 0, "removed": 0}
+        if not root.is_dir():
+            return result
+
+        with self._scan_lock, closing(self._connect()) as conn:
+            known_dirs = {row["path"]: row["mtime"] for row in conn.execute("SELECT path, mtime FROM dirs")}
+            seen_dirs = set()
+            dir_updates = []
+
+            for channel in self._subdirs(root):
+                channel_path, channel_mtime = channel
+                seen_dirs.add(channel_path)
+                channel_changed = known_dirs.get(channel_path) != channel_mtime
+                if not channel_changed and not full:
+                    # 변경 없는 채널은 알고 있는 방송 디렉토리만 그대로 유지
+                    prefix = channel_path + os.sep
+                    seen_dirs.update(path for path in known_dirs if path.startswith(prefix))
+                    continue
+                if channel_changed:
+                    dir_updates.append((channel_path, channel_mtime))
+
+                for session_path, session_mtime in self._subdirs(Path(channel_path)):
+                    seen_dirs.add(session_path)
+                    if known_dirs.get(session_path) == session_mtime:
+                        continue
+                    added, removed = self._rescan_session(conn, Path(session_path))
+                    result["scanned"] += 1
+                    result["added"] += added
+                    result["removed"] += removed
+                    dir_updates.append((session_path, session_mtime))
+
+            # 사라진 채널/방송 디렉토리의 파일 제거
+            gone = [path for path in known_dirs if path not in seen_dirs]
+            with conn:
+                for path in gone:
+                    cursor = conn.execute(
+                        "DELETE FROM files WHERE path LIKE ? ESCAPE '\\'",
+                        (self._like_prefix(path),)
+                    )
+                    result["removed"] += cursor.rowcount
+                conn.executemany("DELETE FROM dirs WHERE path = ?", [(path,) for path in gone])
+                conn.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?)", dir_updates)
+        return result
+
+    @staticmethod
+    def _subdirs(path: Path) -> list[tuple[str, float]]:
+        try:
+            with os.scandir(path) as entries:
+                return [
+                    (entry.path, entry.stat().st_mtime)
+                    for entry in entries if entry.is_dir(follow_symlinks=False)
+                ]
+        except OSError:
+            return []
+
+    @staticmethod
+    def _like_prefix(path: str) -> str:
+        escaped = path.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return escaped + ("\\\\" if os.sep == "\\" else os.sep) + "%"
+
+    def _rescan_session(self, conn: sqlite3.Connection, directory: Path) -> tuple[int, int]:
+        known = {
+            row["path"]: (row["bytes"], row["mtime"])
+            for row in conn.execute("SELECT path, bytes, mtime FROM files WHERE path LIKE ? ESCAPE '\\'",
+                                    (self._like_prefix(str(directory)),))
+        }
+        rows = []
+        present = set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_file() or Path(entry.name).suffix.lower() not in MEDIA_EXTENSIONS:
+                        continue
+                    stat = entry.stat()
+                    present.add(entry.path)
+                    if known.get(entry.path) == (stat.st_size, stat.st_mtime):
+                        continue
+                    rows.append(self._row(Path(entry.path), stat))
+        except OSError:
+            return 0, 0
+
+        removed = [(path,) for path in known if path not in present]
+        with conn:
+            conn.executemany(_UPSERT, rows)
+            conn.executemany("DELETE FROM files WHERE path = ?", removed)
+        return len(rows), len(removed)
+
+    # === 조회 ===
+
+    def query(self, user_id: str = None, text: str = None, since: str = None, until: str = None,
+              include_variants: bool = True, limit: int = 500) -> list[dict]:
+        """
+        색인에서 녹화 파일을 찾습니다 (파일 시스템에 접근하지 않음).
+
+        Args:
+            user_id: 채널 ID
+            text: 제목 검색어 (부분 일치)
+            since: 시작 날짜 (YYYY-MM-DD, 포함)
+            until: 끝 날짜 (YYYY-MM-DD, 포함)
+            include_variants: 변환 출력(480p, audio 등) 포함 여부
+            limit: 최대 결과 수
+
+        Returns:
+            list[dict]: 최신 날짜 순 파일 목록
+        """
+        conditions = []
+        params = []
+        if user_id:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        if text:
+            conditions.append("title LIKE ? ESCAPE '\\'")
+            params.append("%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        if since:
+            conditions.append("date >= ?")
+            params.append(since)
+        if until:
+            conditions.append("date <= ?")
+            params.append(until)
+        if not include_variants:
+            conditions.append("variant = ''")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT * FROM files {where} ORDER BY date DESC, mtime DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def movie_ids(self, user_id: str) -> set[str]:
+        """채널의 색인된 방송 ID 집합 (백필 시 이미 받은 방송 확인용)"""
+        with closing(self._connect()) as conn:
+            return {
+                row["movie_id"]
+                for row in conn.execute("SELECT DISTINCT movie_id FROM files WHERE user_id = ?", (user_id,))
+                if row["movie_id"]
+            }
+
+    def usage(self) -> dict:
+        """{user_id: (파일 수, 총 크기)} - 증분 집계 값이므로 파일 수와 무관하게 즉시 반환"""
+        with closing(self._connect()) as conn:
+            return {
+                row["user_id"]: (row["files"], row["bytes"])
+                for row in conn.execute("SELECT user_id, files, bytes FROM usage WHERE files > 0")
+            }
+
+    def sessions(self) -> list[dict]:
+        """
+        방송(디렉토리) 단위로 묶은 녹화 목록 (오래된 순)
+        이어서 녹화한 부분(.partN)은 별도 방송이 아니라 같은 방송의 부분으로 묶습니다.
+
+        Returns:
+            list[dict]: [{"dir", "user_id", "movie_id", "date", "mtime", "bytes", "parts", "files": [경로]}]
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT path, user_id, movie_id, date, bytes, mtime, part FROM files").fetchall()
+
+        sessions = {}
+        for row in rows:
+            directory = str(Path(row["path"]).parent)
+            session = sessions.get(directory)
+            if session is None:
+                session = sessions[directory] = {
+                    "dir": directory, "user_id": row["user_id"], "movie_id": row["movie_id"], "date": row["date"],
+                    "mtime": row["mtime"], "bytes": 0, "parts": 1, "files": [],
+                }
+            session["bytes"] += row["bytes"]
+            session["parts"] = max(session["parts"], row["part"])
+            session["mtime"] = max(session["mtime"], row["mtime"])
+            session["files"].append(row["path"])
+        return sorted(sessions.values(), key=lambda item: item["mtime"])
+
+    def usage_by_channel(self) -> list[dict]:
+        """채널별 파일 수, 총 크기, 총 재생 시간"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT user_id, COUNT(*) AS files, SUM(bytes) AS bytes, SUM(duration) AS duration "
+                "FROM files GROUP BY user_id ORDER BY bytes DESC"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def format_duration(seconds: float | None) -> str:
+    """재생 시간을 H:MM:SS 문자열로 변환합니다."""
+    if not seconds:
+        return "-:--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def format_size(size: int | None) -> str:
+    """바이트 수를 읽기 쉬운 문자열로 변환합니다."""
+    size = float(size or 0)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f}{unit}" if unit != "B" else f"{int(size)}B"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+def format_row(row: dict) -> str:
+    """조회 결과 한 줄 표시 형식"""
+    variant = f" [{row['variant']}]" if row.get("variant") else ""
+    if row.get("part", 1) > 1:
+        variant = f" (part{row['part']}){variant}"
+    return (f"{row['date'] or datetime.fromtimestamp(row['mtime']).strftime('%Y-%m-%d')}  "
+            f"{row['user_id']:<20} {format_duration(row['duration']):>9} {format_size(row['bytes']):>9}  "
+            f"{row['title']}{variant}")
@@ -0,0 +1,336 @@
+"""하위 프로세스 수명 관리 모듈
+
+확인(yt-dlp 정보 추출)과 녹화(yt-dlp/ffmpeg) 프로세스를 한 곳에서 실행하고 정리합니다.
+
+- 각 프로세스는 별도 프로세스 그룹으로 실행되어, 타임아웃/취소/중지 시 자식까지 한 번에 종료
+- 종료된 프로세스는 모두 회수(wait)하여 좀비/고아 프로세스가 남지 않음
+- 종류별 CPU 시간/메모리/열린 파일 수 제한 (Linux)
+- 종류별 우선순위 (CPU nice / IO 스케줄링 클래스 / CPU 지정) - 부하가 걸려도 라이브 녹화가 먼저 실행됨
+- 제한/우선순위는 실행 직후 부모가 PID로 적용 (스레드가 많은 프로세스에서 preexec_fn은 교착 위험이 있어 사용하지 않음)
+- 전체 프로세스 수 한도 (확인 프로세스는 한도 초과 시 대기)
+"""
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+
+class ProcessBudgetExceeded(RuntimeError):
+    """프로세스 한도를 넘어 새 프로세스를 실행할 수 없음"""
+
+
+# 종류별 기본 우선순위: 녹화는 그대로 두고 나머지를 낮춤 (일반 권한으로는 nice를 올릴 수 없음)
+DEFAULT_PRIORITIES = {
+    "record": {"nice": 0, "io_class": "best-effort", "io_level": 0},
+    # 대기 녹화 프로세스는 녹화로 넘어가므로 녹화와 같은 우선순위로 실행
+    "standby": {"nice": 0, "io_class": "best-effort", "io_level": 0},
+    "probe": {"nice": 5, "io_class": "best-effort", "io_level": 6},
+    "encode": {"nice": 10, "io_class": "best-effort", "io_level": 7},
+    "backfill": {"nice": 15, "io_class": "idle"},
+}
+
+_IO_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_SHIFT = 13
+# ioprio_set 시스템 콜 번호 (Linux 아키텍처별)
+_IOPRIO_SET = {"x86_64": 251, "amd64": 251, "i386": 289, "i686": 289, "aarch64": 30, "arm64": 30,
+               "armv7l": 314, "armv6l": 314, "ppc64le": 273, "riscv64": 30}
+
+
+def _ioprio_setter():
+    """IO 우선순위를 설정하는 함수를 만듭니다 (Linux 전용, 지원하지 않으면 None)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    number = _IOPRIO_SET.get(os.uname().machine)
+    if number is None:
+        return None
+    try:
+        import ctypes
+        syscall = ctypes.CDLL(None, use_errno=True).syscall
+    except (OSError, AttributeError):
+        return None
+
+    def set_ioprio(pid: int, io_class: int, level: int):
+        syscall(number, _IOPRIO_WHO_PROCESS, pid, (io_class << _IOPRIO_CLASS_SHIFT) | level)
+
+    return set_ioprio
+
+
+_set_ioprio = _ioprio_setter()
+
+
+def _windows_priority_class(nice: int) -> int:
+    """nice 값에 해당하는 Windows 우선순위 클래스"""
+    if nice >= 15:
+        return subprocess.IDLE_PRIORITY_CLASS
+    if nice > 0:
+        return subprocess.BELOW_NORMAL_PRIORITY_CLASS
+    if nice < 0:
+        return subprocess.ABOVE_NORMAL_PRIORITY_CLASS
+    return 0
+
+
+def _apply_limits(pid: int, limits: dict, priority: dict):
+    """
+    실행된 자식 프로세스에 자원 제한 / 우선순위를 적용합니다 (POSIX 전용, 자원 제한은 Linux prlimit).
+    권한이 없거나(nice 낮추기, realtime IO) 이미 종료된 프로세스면 그대로 둠
+    """
+    if sys.platform == "win32" or (not limits and not priority):
+        return
+
+    nice = int(priority.get("nice", 0))
+    if nice:
+        try:
+            os.setpriority(os.PRIO_PROCESS, pid, nice)
+        except OSError:
+            pass
+
+    io_class = _IO_CLASSES.get(priority.get("io_class"))
+    if io_class and _set_ioprio:
+        io_level = 0 if io_class == _IO_CLASSES["idle"] else min(7, max(0, int(priority.get("io_level", 4))))
+        _set_ioprio(pid, io_class, io_level)
+
+    cpus = set(priority.get("cpus") or ())
+    if cpus and hasattr(os, "sched_setaffinity"):
+        # 없는 CPU만 지정되면 제한하지 않음
+        cpus &= os.sched_getaffinity(0)
+        if cpus:
+            try:
+                os.sched_setaffinity(pid, cpus)
+            except OSError:
+                pass
+
+    if not limits:
+        return
+    import resource
+    if not hasattr(resource, "prlimit"):
+        return
+    rlimits = []
+    if limits.get("memory_mb"):
+        size = int(limits["memory_mb"]) * 1024 * 1024
+        rlimits.append((resource.RLIMIT_AS, (size, size)))
+    if limits.get("cpu_seconds"):
+        seconds = int(limits["cpu_seconds"])
+        rlimits.append((resource.RLIMIT_CPU, (seconds, seconds + 5)))
+    if limits.get("open_files"):
+        count = int(limits["open_files"])
+        rlimits.append((resource.RLIMIT_NOFILE, (count, count)))
+    for kind, value in rlimits:
+        try:
+            resource.prlimit(pid, kind, value)
+        except (OSError, ValueError):
+            pass
+
+
+class ProcessManager:
+    """하위 프로세스 실행/종료/회수 관리 클래스"""
+
+    def __init__(self, budget: int = 64, budget_wait: float = 30.0):
+        """
+        Args:
+            budget: 동시에 살아있을 수 있는 최대 하위 프로세스 수
+            budget_wait: 확인 프로세스가 한도 여유를 기다리는 최대 시간 (초)
+        """
+        self.budget = budget
+        self.budget_wait = budget_wait
+        self.limits = {}  # {kind: {"memory_mb", "cpu_seconds", "open_files"}}
+        self.priorities = {kind: dict(priority) for kind, priority in DEFAULT_PRIORITIES.items()}
+        self.children = {}  # {pid: (kind, process)}
+        self._lock = threading.Lock()
+
+    def configure(self, budget: int = None, limits: dict = None, priorities: dict = None):
+        """
+        설정 파일 값으로 한도와 종류별 자원 제한/우선순위를 갱신합니다.
+
+        Args:
+            priorities: {kind: {"nice", "io_class", "io_level", "cpus"}} - 지정한 항목만 기본값을 덮어씀
+        """
+        if budget:
+            self.budget = int(budget)
+        if limits:
+            self.limits.update(limits)
+        for kind, priority in (priorities or {}).items():
+            self.priorities.setdefault(kind, {}).update(priority)
+
+    # === 공통 ===
+
+    def _spawn_kwargs(self, kind: str, creationflags: int) -> dict:
+        priority = self.priorities.get(kind, {})
+        if sys.platform == "win32":
+            creationflags |= _windows_priority_class(int(priority.get("nice", 0)))
+            return {"creationflags": creationflags | subprocess.CREATE_NO_WINDOW}
+        return {"start_new_session": True}
+
+    def _register(self, kind: str, process):
+        _apply_limits(process.pid, self.limits.get(kind, {}), self.priorities.get(kind, {}))
+        with self._lock:
+            self.children[process.pid] = (kind, process)
+
+    def _unregister(self, process):
+        with self._lock:
+            self.children.pop(process.pid, None)
+
+    def relabel(self, process, kind: str):
+        """관리 중인 프로세스의 종류를 바꿉니다 (대기 녹화 프로세스를 녹화로 넘길 때)."""
+        with self._lock:
+            if process.pid not in self.children:
+                return
+            self.children[process.pid] = (kind, process)
+        _apply_limits(process.pid, self.limits.get(kind, {}), self.priorities.get(kind, {}))
+
+    def _has_room(self) -> bool:
+        self.reap()
+        with self._lock:
+            return len(self.children) < self.budget
+
+    def live_count(self, kind: str = None) -> int:
+        """살아있는 하위 프로세스 수 (kind 지정 시 해당 종류만)"""
+        self.reap()
+        with self._lock:
+            return sum(1 for k, _ in self.children.values() if kind is None or k == kind)
+
+    def counts(self) -> dict:
+        """{종류: 살아있는 프로세스 수}"""
+        self.reap()
+        result = {}
+        with self._lock:
+            for kind, _ in self.children.values():
+                result[kind] = result.get(kind, 0) + 1
+        return result
+
+    def reap(self):
+        """이미 종료된 프로세스를 회수하고 목록에서 제거합니다."""
+        with self._lock:
+            items = list(self.children.items())
+        for pid, (_, process) in items:
+            if isinstance(process, subprocess.Popen):
+                finished = process.poll() is not None
+            else:
+                finished = process.returncode is not None
+            if finished:
+                with self._lock:
+                    self.children.pop(pid, None)
+
+    @staticmethod
+    def signal_group(process, sig) -> bool:
+        """프로세스 그룹 전체에 시그널을 보냅니다 (POSIX). 실패하면 False."""
+        if sys.platform == "win32":
+            return False
+        try:
+            os.killpg(process.pid, sig)
+            return True
+        except (ProcessLookupError, PermissionError, OSError):
+            return False
+
+    @staticmethod
+    def kill_tree(process):
+        """프로세스와 모든 자식을 강제 종료합니다."""
+        if sys.platform == "win32":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                capture_output=True,
+                creationflags=subprocess.CREATE_NO_WINDOW
+            )
+        elif not ProcessManager.signal_group(process, signal.SIGKILL):
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
+    # === 동기 프로세스 (녹화) ===
+
+    def popen(self, kind: str, cmd: list, creationflags: int = 0, **kwargs) -> subprocess.Popen:
+        """
+        프로세스를 별도 그룹으로 종류별 우선순위에 따라 실행하고 관리 목록에 등록합니다.
+
+        녹화 프로세스는 이미 승인 제어를 거쳤으므로 한도를 넘어도 실행하지만 개수에는 포함됩니다.
+        """
+        process = subprocess.Popen(cmd, **self._spawn_kwargs(kind, creationflags), **kwargs)
+        self._register(kind, process)
+        return process
+
+    def terminate(self, process: subprocess.Popen, timeout: float = 3.0, graceful_signal=signal.SIGINT):
+        """
+        프로세스 그룹을 정상 종료 시도 후, 시간이 지나면 강제 종료하고 회수합니다 (POSIX).
+        yt-dlp/ffmpeg는 SIGINT를 받으면 저장 중인 파일을 마무리합니다.
+        """
+        try:
+            if process.poll() is None:
+                if not self.signal_group(process, graceful_signal):
+                    process.terminate()
+                try:
+                    process.wait(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    self.kill_tree(process)
+                    process.wait()
+            else:
+                # 본 프로세스가 먼저 끝났어도 그룹에 남은 자식 정리
+                self.signal_group(process, signal.SIGKILL)
+        finally:
+            self._unregister(process)
+
+    def release(self, process):
+        """종료를 직접 처리한 프로세스를 관리 목록에서 제거합니다."""
+        self._unregister(process)
+
+    def wait_room(self, timeout: float = None):
+        """
+        프로세스 한도 여유가 생길 때까지 기다립니다 (동기로 실행하는 확인 프로세스용).
+
+        Raises:
+            ProcessBudgetExceeded: timeout(기본 budget_wait) 동안 여유가 생기지 않음
+        """
+        deadline = time.monotonic() + (self.budget_wait if timeout is None else timeout)
+        while not self._has_room():
+            if time.monotonic() >= deadline:
+                raise ProcessBudgetExceeded(f"프로세스 한도 초과 ({self.budget})")
+            time.sleep(0.2)
+
+    # === 비동기 프로세스 (확인) ===
+
+    async def spawn_async(self, kind: str, cmd: list, **kwargs) -> asyncio.subprocess.Process:
+        """
+        프로세스 한도 여유가 생길 때까지 기다린 뒤 비동기 프로세스를 실행합니다.
+
+        Raises:
+            ProcessBudgetExceeded: budget_wait 동안 여유가 생기지 않음
+        """
+        deadline = time.monotonic() + self.budget_wait
+        while not self._has_room():
+            if time.monotonic() >= deadline:
+                raise ProcessBudgetExceeded(f"프로세스 한도 초과 ({self.budget})")
+            await asyncio.sleep(0.2)
+
+        process = await asyncio.create_subprocess_exec(*cmd, **self._spawn_kwargs(kind, 0), **kwargs)
+        self._register(kind, process)
+        return process
+
+    async def communicate_async(self, process: asyncio.subprocess.Process, timeout: float) -> tuple[bytes, bytes]:
+        """
+        출력을 읽고 종료를 기다립니다. 타임아웃이나 취소 시 프로세스 그룹 전체를 종료하고 회수합니다.
+
+        Raises:
+            asyncio.TimeoutError: 타임아웃
+        """
+        try:
+            return await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            self.kill_tree(process)
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5.0)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            raise
+        finally:
+            if process.returncode is not None:
+                # 본 프로세스 종료 후 그룹에 남은 자식 정리
+                self.signal_group(process, signal.SIGKILL)
+            self._unregister(process)
+
+
+# 전역 인스턴스
+process_manager = ProcessManager()
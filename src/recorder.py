@@ -1,39 +1,202 @@
 """트위캐스트 스트림 녹화 관리 모듈"""
 
+import json
 import subprocess
 import sys
+import tempfile
 import threading
+import time
+from datetime import datetime
 from pathlib import Path
 
+from .fanout import FanoutPipeline, build_output_base, resolve_outputs
+from .process_manager import process_manager
+from .tracing import tracer
+
 
 class StreamRecorder:
     """스트림 녹화 관리 클래스 - 다중 채널 지원"""
 
+    # 탐지 결과(스트림 URL 포함)를 재사용할 수 있는 최대 경과 시간 (초)
+    PROBE_INFO_MAX_AGE = 60.0
+
     def __init__(self):
         self.processes = {}  # {user_id: process}
         self.output_threads = {}  # {user_id: thread}
+        self.info_files = {}  # {user_id: Path} - 재사용 중인 탐지 정보 파일
+        self.output_files = {}  # {user_id: str} - yt-dlp 출력에서 파악한 저장 파일
+        self.fanouts = {}  # {user_id: FanoutPipeline} - 다중 출력 녹화
+        self.start_args = {}  # {user_id: dict} - 이어서 녹화할 때 사용할 시작 인자
+        self.parts = {}  # {user_id: int} - 이어서 녹화한 횟수 + 1
+        self.last_activity = {}  # {user_id: monotonic} - 마지막 출력 시각 (정지 감시용)
+        self._lock = threading.RLock()  # 중지와 이어서 녹화가 겹치지 않도록
+        self.standby = None  # StandbyPool - 방송 시작이 예상되는 채널의 대기 녹화 프로세스
         self.output_callback = None
+        self.finished_callback = None
+        self.part_callback = None
 
     def set_output_callback(self, callback):
         """출력 콜백 함수를 설정합니다."""
         self.output_callback = callback
 
+    def set_finished_callback(self, callback):
+        """녹화 종료 콜백 함수를 설정합니다. (user_id, file_path, size, error)"""
+        self.finished_callback = callback
+
+    def set_part_callback(self, callback):
+        """이어서 녹화로 끝난 부분 파일 콜백 함수를 설정합니다. (user_id, file_path, size)"""
+        self.part_callback = callback
+
+    def _track_output_file(self, user_id: str, line: str):
+        """yt-dlp 출력에서 저장 파일 경로를 파악합니다."""
+        if "Destination: " in line:
+            self.output_files[user_id] = line.split("Destination: ", 1)[1].strip()
+        elif "Merging formats into " in line:
+            self.output_files[user_id] = line.split("Merging formats into ", 1)[1].strip().strip('"')
+
+    def get_output_file(self, user_id: str) -> str | None:
+        """녹화 중인 파일 경로를 반환합니다 (아직 모르면 None)."""
+        return self.output_files.get(user_id)
+
     def _read_output(self, user_id: str):
         """프로세스 출력을 읽어서 콜백으로 전달합니다."""
         process = self.processes.get(user_id)
-        if process and process.stdout:
-            for line in iter(process.stdout.readline, b''):
-                if line and user_id in self.processes:  # 프로세스가 아직 관리 중인지 확인
+        # 다중 출력 녹화는 stdout이 영상 데이터이므로 stderr에서 로그를 읽음
+        stream = (process.stderr or process.stdout) if process else None
+        if stream:
+            for line in iter(stream.readline, b''):
+                if line and self.processes.get(user_id) is process:  # 프로세스가 아직 관리 중인지 확인
+                    self.last_activity[user_id] = time.monotonic()
                     decoded_line = line.decode('utf-8', errors='ignore').strip()
+                    if decoded_line and user_id not in self.fanouts:
+                        self._track_output_file(user_id, decoded_line)
                     if decoded_line and self.output_callback:
                         self.output_callback(user_id, decoded_line)
 
+    def _fresh_info_json(self, probe_info: dict) -> str | None:
+        """탐지 결과가 충분히 최신이면 추출 정보(JSON 문자열)를 반환합니다."""
+        if not probe_info or not probe_info.get("info_json"):
+            return None
+
+        checked_at = probe_info.get("checked_at")
+        if not checked_at or (datetime.now() - checked_at).total_seconds() > self.PROBE_INFO_MAX_AGE:
+            return None
+        return probe_info["info_json"]
+
+    def _write_probe_info(self, user_id: str, probe_info: dict) -> Path | None:
+        """
+        탐지 결과가 충분히 최신이면 yt-dlp가 읽을 정보 파일로 저장합니다.
+
+        Returns:
+            Path | None: 정보 파일 경로 (오래되었거나 정보가 없으면 None)
+        """
+        info_json = self._fresh_info_json(probe_info)
+        if not info_json:
+            return None
+
+        info_path = Path(tempfile.gettempdir()) / f"twitcast_{user_id}_{probe_info.get('movie_id')}.info.json"
+        try:
+            info_path.write_text(info_json, encoding="utf-8")
+        except OSError:
+            return None
+        return info_path
+
+    def _remove_info_file(self, user_id: str):
+        """재사용한 탐지 정보 파일을 삭제합니다."""
+        info_path = self.info_files.pop(user_id, None)
+        if info_path:
+            try:
+                info_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    @staticmethod
+    def standby_key(ytdlp_path: str, ffmpeg_path: str, save_path: str = None, outputs: list = None,
+                    format_selector: str = None, manifest: bool = False) -> str:
+        """대기 녹화 프로세스를 넘겨받을 수 있는지 비교하는 녹화 옵션 키"""
+        return json.dumps(
+            [ytdlp_path, ffmpeg_path, save_path or str(Path.cwd()), outputs, format_selector, bool(manifest)],
+            sort_keys=True, default=str
+        )
+
+    @staticmethod
+    def _build_command(user_id: str, ytdlp_path: str, ffmpeg_path: str, save_dir: Path, source: list,
+                       use_pipeline: bool, output_base: Path = None) -> list:
+        """yt-dlp 녹화 명령어 구성"""
+        if use_pipeline:
+            # 다중 출력: yt-dlp는 표준 출력으로 스트림만 내보내고 파이프라인이 나눠 저장
+            return [
+                ytdlp_path,
+                "-v",  # verbose
+                "--ffmpeg-location", ffmpeg_path,
+                "-o", "-",
+                *source
+            ]
+
+        # yt-dlp 출력 템플릿 설정
+        # 형식: 채널명/[날짜]_제목(ID)/[날짜]_제목(ID).확장자
+        if output_base:
+            output_template = str(output_base).replace("%", "%%") + ".mp4"
+        else:
+            output_template = str(save_dir / user_id / "[%(upload_date)s]_%(title)s(%(id)s)/[%(upload_date)s]_%(title)s(%(id)s).mp4")
+        return [
+            ytdlp_path,
+            "-v",  # verbose
+            "-c",  # continue (resume)
+            "--no-part",  # .part 확장자 사용 안 함
+            "--ffmpeg-location", ffmpeg_path,
+            "-o", output_template,
+            "--embed-thumbnail",
+            "--merge-output-format", "mp4",
+            *source
+        ]
+
+    @staticmethod
+    def _popen(kind: str, cmd: list, use_pipeline: bool, stdin=None) -> subprocess.Popen:
+        return process_manager.popen(
+            kind,
+            cmd,
+            stdin=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE if use_pipeline else subprocess.STDOUT,
+            bufsize=0 if use_pipeline else 1,  # 줄 단위 버퍼링
+            universal_newlines=False
+        )
+
+    def spawn_standby(
+        self,
+        user_id: str,
+        ytdlp_path: str,
+        ffmpeg_path: str,
+        save_path: str = None,
+        outputs: list = None,
+        format_selector: str = None,
+        manifest: bool = False
+    ) -> subprocess.Popen:
+        """
+        대기 녹화 프로세스를 실행합니다. yt-dlp는 시작/옵션 해석까지 마친 뒤
+        표준 입력에서 추출 정보(JSON)를 기다리며, start_recording이 넘겨받아 확인 결과의 추출 정보를 보냅니다.
+        """
+        save_dir = Path(save_path or Path.cwd())
+        save_dir.mkdir(parents=True, exist_ok=True)
+        source = ["--load-info-json", "-"]
+        if format_selector:
+            source = ["-f", format_selector, *source]
+        use_pipeline = bool(resolve_outputs(outputs)) or manifest
+        cmd = self._build_command(user_id, ytdlp_path, ffmpeg_path, save_dir, source, use_pipeline)
+        return self._popen("standby", cmd, use_pipeline, stdin=subprocess.PIPE)
+
     def start_recording(
         self,
         user_id: str,
         ytdlp_path: str,
         ffmpeg_path: str,
-        save_path: str = None
+        save_path: str = None,
+        probe_info: dict = None,
+        outputs: list = None,
+        format_selector: str = None,
+        manifest: bool = False,
+        output_base: Path = None
     ) -> tuple[bool, str]:
         """
         녹화를 시작합니다.
@@ -43,6 +206,15 @@ class StreamRecorder:
             ytdlp_path: yt-dlp 실행 파일 경로
             ffmpeg_path: ffmpeg 실행 파일 경로
             save_path: 저장 경로 (None이면 현재 디렉토리)
+            probe_info: check_stream_status 결과. 최신이면 추출 과정을 건너뛰고
+                바로 다운로드를 시작하며, 오래되었으면 URL에서 다시 추출합니다.
+                최신이고 채널의 대기 녹화 프로세스가 있으면 그 프로세스에 추출 정보를 보내 넘겨받습니다.
+            outputs: 원본 외 추가 출력 (프리셋 이름 또는 ffmpeg 인자 설정 목록).
+                지정하면 한 번 다운로드한 스트림을 원본과 변환 출력으로 나눠 저장합니다.
+            format_selector: yt-dlp 포맷 선택 (-f). 저화질 녹화 시 사용
+            manifest: 무결성 목록(구간 해시, 타임스탬프 끊김) 기록 여부.
+                파이프라인 방식으로 녹화하므로 추가 출력이 없어도 썸네일은 포함되지 않습니다.
+            output_base: 저장 경로(확장자 제외)를 직접 지정 (정지 후 이어서 녹화할 때 사용)
 
         Returns:
             tuple[bool, str]: (성공 여부, 메시지)
@@ -57,41 +229,84 @@ class StreamRecorder:
         save_dir = Path(save_path)
         save_dir.mkdir(parents=True, exist_ok=True)
 
-        # yt-dlp 출력 템플릿 설정
-        # 형식: 채널명/[날짜]_제목(ID)/[날짜]_제목(ID).확장자
-        output_template = str(save_dir / user_id / "[%(upload_date)s]_%(title)s(%(id)s)/[%(upload_date)s]_%(title)s(%(id)s).mp4")
+        extra_outputs = resolve_outputs(outputs)
+        use_pipeline = bool(extra_outputs) or manifest
 
-        # yt-dlp 명령어 구성
-        url = f"https://twitcasting.tv/{user_id}"
-        cmd = [
-            ytdlp_path,
-            "-v",  # verbose
-            "-c",  # continue (resume)
-            "--no-part",  # .part 확장자 사용 안 함
-            "--ffmpeg-location", ffmpeg_path,
-            "-o", output_template,
-            "--embed-thumbnail",
-            "--merge-output-format", "mp4",
-            url
-        ]
+        # 최신 탐지 정보가 있고 옵션이 같은 대기 녹화 프로세스가 있으면 넘겨받음
+        # (프로세스 시작/초기화와 재추출 모두 생략, 탐지 정보가 없으면 URL에서 추출해야 하므로 새로 실행)
+        process = None
+        info_json = self._fresh_info_json(probe_info)
+        if self.standby is not None and output_base is None and info_json:
+            process = self.standby.claim(
+                user_id, self.standby_key(ytdlp_path, ffmpeg_path, save_path, outputs, format_selector, manifest)
+            )
 
+        warm = process is not None
+        info_path = None
         try:
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
-                bufsize=1,  # 줄 단위 버퍼링
-                universal_newlines=False
-            )
+            if warm:
+                with tracer.span("recorder.handoff", "recorder", user_id=user_id):
+                    # 표준 입력 인코딩(Windows 코드 페이지)과 무관하도록 ASCII JSON으로 보냄
+                    process.stdin.write(json.dumps(json.loads(info_json)).encode("ascii"))
+                    process.stdin.close()
+                process_manager.relabel(process, "record")
+            else:
+                # yt-dlp 명령어 구성
+                # 최신 탐지 정보가 있으면 --load-info-json으로 재추출 생략
+                info_path = self._write_probe_info(user_id, probe_info)
+                if info_path:
+                    source = ["--load-info-json", str(info_path)]
+                else:
+                    source = [f"https://twitcasting.tv/{user_id}"]
+                if format_selector:
+                    source = ["-f", format_selector, *source]
+                cmd = self._build_command(user_id, ytdlp_path, ffmpeg_path, save_dir, source, use_pipeline, output_base)
+
+                with tracer.span("recorder.start", "recorder", user_id=user_id):
+                    process = self._popen("record", cmd, use_pipeline)
 
             self.processes[user_id] = process
+            if info_path:
+                self.info_files[user_id] = info_path
+
+            if use_pipeline:
+                try:
+                    pipeline = FanoutPipeline(
+                        process, ffmpeg_path, output_base or build_output_base(save_dir, user_id, probe_info),
+                        extra_outputs, manifest=manifest
+                    )
+                except Exception:
+                    process_manager.kill_tree(process)
+                    process.wait()
+                    process_manager.release(process)
+                    raise
+                self.fanouts[user_id] = pipeline
+                self.output_files[user_id] = str(pipeline.original_path)
+            elif output_base:
+                self.output_files[user_id] = str(output_base) + ".mp4"
+
+            self.start_args[user_id] = {
+                "ytdlp_path": ytdlp_path, "ffmpeg_path": ffmpeg_path, "save_path": save_path,
+                "outputs": outputs, "format_selector": format_selector, "manifest": manifest,
+            }
+            self.last_activity[user_id] = time.monotonic()
 
             # 출력 읽기 스레드 시작
             output_thread = threading.Thread(target=self._read_output, args=(user_id,), daemon=True)
             output_thread.start()
             self.output_threads[user_id] = output_thread
 
+            suffix = []
+            if warm:
+                suffix.append("대기 프로세스 사용 / 탐지 정보 재사용")
+            elif info_path:
+                suffix.append("탐지 정보 재사용")
+            if extra_outputs:
+                suffix.append("추가 출력: " + ", ".join(o["name"] for o in extra_outputs))
+            if manifest:
+                suffix.append("무결성 목록 기록")
+            if suffix:
+                return True, f"녹화 시작: {user_id} ({' / '.join(suffix)})"
             return True, f"녹화 시작: {user_id}"
 
         except Exception as e:
@@ -99,8 +314,43 @@ class StreamRecorder:
                 del self.processes[user_id]
             if user_id in self.output_threads:
                 del self.output_threads[user_id]
+            if process is not None and process.poll() is None:
+                # 넘겨받은 대기 프로세스에 URL을 보내지 못한 경우 등
+                process_manager.kill_tree(process)
+                process.wait()
+                process_manager.release(process)
+            if info_path:
+                info_path.unlink(missing_ok=True)
+            self.info_files.pop(user_id, None)
+            self.fanouts.pop(user_id, None)
+            self.output_files.pop(user_id, None)
+            self.start_args.pop(user_id, None)
             return False, f"녹화 시작 오류: {e}"
 
+    @staticmethod
+    def _terminate(process):
+        """녹화 프로세스를 정상 종료 시도 후 자식까지 정리합니다."""
+        if sys.platform == "win32":
+            import signal
+            # 먼저 CTRL+C 시그널 전송 (정상 종료 시도)
+            try:
+                process.send_signal(signal.CTRL_C_EVENT)
+            except:
+                pass
+
+            # 2초 대기
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                # 여전히 살아있으면 자식까지 강제 종료
+                process_manager.kill_tree(process)
+                # 프로세스 정리 (zombie 방지)
+                process.wait()
+            process_manager.release(process)
+        else:
+            # Unix-like 시스템: 프로세스 그룹(yt-dlp + ffmpeg)에 SIGINT -> 3초 후 SIGKILL
+            process_manager.terminate(process, timeout=3)
+
     def stop_recording(self, user_id: str) -> tuple[bool, str]:
         """
         특정 채널의 녹화를 중지합니다.
@@ -111,51 +361,122 @@ class StreamRecorder:
         Returns:
             tuple[bool, str]: (성공 여부, 메시지)
         """
-        if user_id not in self.processes:
-            return False, f"{user_id}: 진행 중인 녹화가 없습니다."
+        with self._lock:
+            if user_id not in self.processes:
+                return False, f"{user_id}: 진행 중인 녹화가 없습니다."
 
-        process = self.processes[user_id]
+            process = self.processes[user_id]
 
-        try:
-            if sys.platform == "win32":
-                import signal
-                # 먼저 CTRL+C 시그널 전송 (정상 종료 시도)
-                try:
-                    process.send_signal(signal.CTRL_C_EVENT)
-                except:
-                    pass
+            try:
+                with tracer.span("recorder.stop", "recorder", user_id=user_id):
+                    self._terminate(process)
 
-                # 2초 대기
-                try:
-                    process.wait(timeout=2)
-                except subprocess.TimeoutExpired:
-                    # 여전히 살아있으면 강제 종료
-                    subprocess.run(
-                        ["taskkill", "/F", "/T", "/PID", str(process.pid)],
-                        capture_output=True,
-                        creationflags=subprocess.CREATE_NO_WINDOW
-                    )
-                    # 프로세스 정리 (zombie 방지)
-                    process.wait()
-            else:
-                # Unix-like 시스템
-                process.terminate()
-                try:
-                    process.wait(timeout=3)
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                    process.wait()
+                error = None
+                return True, f"{user_id}: 녹화 중지"
 
-            return True, f"{user_id}: 녹화 중지"
+            except Exception as e:
+                error = str(e)
+                return False, f"{user_id}: 녹화 중지 오류: {e}"
+            finally:
+                # 프로세스 및 스레드 참조 정리
+                if user_id in self.processes:
+                    del self.processes[user_id]
+                if user_id in self.output_threads:
+                    del self.output_threads[user_id]
+                self.start_args.pop(user_id, None)
+                self.parts.pop(user_id, None)
+                self.last_activity.pop(user_id, None)
+                self._remove_info_file(user_id)
+                self._finish_fanout(user_id)
+                self._notify_finished(user_id, error)
 
-        except Exception as e:
-            return False, f"{user_id}: 녹화 중지 오류: {e}"
-        finally:
-            # 프로세스 및 스레드 참조 정리
-            if user_id in self.processes:
-                del self.processes[user_id]
-            if user_id in self.output_threads:
-                del self.output_threads[user_id]
+    def restart_recording(self, user_id: str, process=None) -> tuple[bool, str]:
+        """
+        멈춘 녹화를 종료하고 같은 방송 디렉토리의 이어서 녹화 파일(.partN)로 다시 시작합니다.
+        녹화 종료 콜백은 다시 시작에 실패한 경우에만 호출됩니다.
+
+        Args:
+            user_id: 트위캐스트 사용자 ID
+            process: 멈춘 것으로 판단한 프로세스 (그 사이 중지/재시작되었으면 아무것도 하지 않음)
+
+        Returns:
+            tuple[bool, str]: (성공 여부, 메시지)
+        """
+        with self._lock:
+            current = self.processes.get(user_id)
+            args = self.start_args.get(user_id)
+            if current is None or args is None or (process is not None and current is not process):
+                return False, f"{user_id}: 이어서 녹화할 녹화가 없습니다."
+
+            try:
+                self._terminate(current)
+            except Exception:
+                process_manager.kill_tree(current)
+            self.processes.pop(user_id, None)
+            self.output_threads.pop(user_id, None)
+            self._remove_info_file(user_id)
+            self._finish_fanout(user_id)
+
+            # 같은 방송 디렉토리에 [날짜]_제목(ID).partN 으로 이어서 기록 (모르면 새로 추출한 경로 사용)
+            part = self.parts.get(user_id, 1) + 1
+            previous = self.output_files.get(user_id)
+            output_base = None
+            if previous:
+                previous = Path(previous)
+                output_base = previous.parent / f"{previous.parent.name}.part{part}"
+
+            success, message = self.start_recording(user_id, **args, output_base=output_base)
+            if success:
+                self.parts[user_id] = part
+                if previous and self.part_callback:
+                    # 녹화 종료 콜백은 마지막 부분만 받으므로 끝난 부분은 여기서 알림
+                    try:
+                        size = previous.stat().st_size
+                    except OSError:
+                        size = None
+                    self.part_callback(user_id, str(previous), size)
+                return True, f"{user_id}: 이어서 녹화 시작 (part{part})"
+
+            self.parts.pop(user_id, None)
+            self.last_activity.pop(user_id, None)
+            if previous:
+                self.output_files[user_id] = str(previous)
+            self._notify_finished(user_id, message)
+            return False, message
+
+    def _finish_fanout(self, user_id: str):
+        """다중 출력 파이프라인의 모든 출력이 마무리될 때까지 기다립니다."""
+        pipeline = self.fanouts.pop(user_id, None)
+        if not pipeline:
+            return
+
+        dropped = pipeline.finish()
+        for name, count in dropped.items():
+            if count and self.output_callback:
+                self.output_callback(user_id, f"[fanout] {name}: 변환 지연으로 {count}개 청크 생략")
+
+        integrity = pipeline.integrity
+        if integrity and self.output_callback:
+            stream = integrity.get("stream") or {}
+            self.output_callback(
+                user_id,
+                f"[manifest] {len(integrity['segments'])}개 구간, 끊김 {stream.get('event_count', 0)}회 "
+                f"({stream.get('gap_seconds', 0):.1f}초), 패킷 손실 {stream.get('continuity_errors', 0)}회"
+            )
+
+    def _notify_finished(self, user_id: str, error: str = None):
+        """녹화 종료 콜백에 저장 파일과 크기를 전달합니다."""
+        file_path = self.output_files.pop(user_id, None)
+        if not self.finished_callback:
+            return
+
+        size = None
+        if file_path:
+            try:
+                size = Path(file_path).stat().st_size
+            except OSError:
+                pass
+        self.finished_callback(user_id, file_path, size, error)
 
     def stop_all_recordings(self):
         """모든 녹화를 중지합니다."""
@@ -0,0 +1,242 @@
+"""녹화 파일 보존 정책 모듈
+
+채널별 / 전역 규칙(보존 기간, 최대 용량, 최근 N개 방송 유지, 최소 여유 공간)에 따라
+오래된 방송 디렉토리를 백그라운드에서 삭제합니다.
+
+- 사용량은 녹화 목록 색인의 증분 집계 값을 사용 (디렉토리 트리를 다시 훑지 않음)
+- 삭제는 초당 파일 수를 제한하여 조금씩 진행하고, 녹화 중에는 더 느리게 진행
+- 녹화 중인 방송 디렉토리는 삭제하지 않음
+"""
+
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+
+_GB = 1024 ** 3
+
+
+class RetentionEngine:
+    """보존 규칙 적용 및 백그라운드 삭제 클래스"""
+
+    def __init__(
+        self,
+        library,
+        get_save_dir,
+        rules: dict,
+        protected=None,
+        on_delete=None,
+        interval: float = 600.0,
+        delete_rate: float = 20.0,
+        busy_slowdown: float = 4.0,
+        batch_size: int = 50,
+        dry_run: bool = False
+    ):
+        """
+        Args:
+            library: RecordingLibrary 인스턴스
+            get_save_dir: 현재 저장 경로를 반환하는 함수
+            rules: {"global": {...}, "channels": {user_id: {...}}}
+                   규칙 키: max_age_days, max_total_gb, keep_last, min_free_gb(전역 전용)
+            protected: 삭제하면 안 되는 디렉토리 집합을 반환하는 함수 (녹화 중인 방송)
+            on_delete: 방송 디렉토리를 삭제(또는 dry_run 시 삭제 예정)할 때 호출할 콜백 (session, reason)
+            interval: 규칙 확인 주기 (초)
+            delete_rate: 초당 최대 삭제 파일 수
+            busy_slowdown: 녹화 중일 때 삭제 속도를 나눌 값
+            batch_size: 색인에서 한 번에 제거할 파일 수
+            dry_run: True이면 삭제하지 않고 콜백만 호출
+        """
+        self.library = library
+        self.get_save_dir = get_save_dir
+        self.rules = rules or {}
+        self.protected = protected or (lambda: set())
+        self.on_delete = on_delete
+        self.interval = interval
+        self.delete_rate = delete_rate
+        self.busy_slowdown = busy_slowdown
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+
+        self.deleted_bytes = 0
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    # === 계획 ===
+
+    def plan(self) -> list[tuple[dict, str]]:
+        """
+        규칙에 따라 삭제할 방송 목록을 만듭니다 (파일 시스템은 여유 공간 확인만).
+
+        Returns:
+            list[tuple[dict, str]]: [(session, 사유)] 오래된 순
+        """
+        global_rule = self.rules.get("global", {})
+        channel_rules = self.rules.get("channels", {})
+        protected = self.protected()
+        now = time.time()
+
+        sessions = [session for session in self.library.sessions() if session["dir"] not in protected]
+        usage = self.library.usage()
+        doomed = {}  # {dir: (session, 사유)}
+
+        def doom(session, reason):
+            doomed.setdefault(session["dir"], (session, reason))
+
+        # 채널별 규칙 (보존 기간 / 최근 N개는 전역 값을 기본값으로 사용)
+        by_channel = {}
+        for session in sessions:
+            by_channel.setdefault(session["user_id"], []).append(session)
+
+        for user_id, items in by_channel.items():
+            rule = {
+                "max_age_days": global_rule.get("max_age_days"),
+                "keep_last": global_rule.get("keep_last"),
+                **channel_rules.get(user_id, {}),
+            }
+            keep_last = rule.get("keep_last")
+            if keep_last:
+                # 같은 방송 ID의 디렉토리(제목이 바뀐 뒤 이어서 녹화한 경우 등)는 한 방송으로 셈
+                broadcasts = {}
+                for session in items:
+                    broadcasts.setdefault(session.get("movie_id") or session["dir"], []).append(session)
+                ordered = sorted(broadcasts.values(), key=lambda group: max(s["mtime"] for s in group))
+                for group in ordered[:max(0, len(ordered) - int(keep_last))]:
+                    for session in group:
+                        doom(session, f"최근 {keep_last}개 초과")
+
+            max_age = rule.get("max_age_days")
+            if max_age:
+                cutoff = now - float(max_age) * 86400
+                for session in items:
+                    if session["mtime"] < cutoff:
+                        doom(session, f"{max_age}일 경과")
+
+            max_total = rule.get("max_total_gb") if user_id in channel_rules else None
+            if max_total:
+                total = usage.get(user_id, (0, 0))[1] - sum(
+                    session["bytes"] for session, _ in doomed.values() if session["user_id"] == user_id
+                )
+                for session in items:
+                    if total <= float(max_total) * _GB:
+                        break
+                    if session["dir"] not in doomed:
+                        doom(session, f"채널 용량 {max_total}GB 초과")
+                        total -= session["bytes"]
+
+        # 전역 최대 용량 / 최소 여유 공간 (채널 구분 없이 오래된 방송부터)
+        doomed_bytes = sum(session["bytes"] for session, _ in doomed.values())
+        max_total = global_rule.get("max_total_gb")
+        if max_total:
+            total = sum(item[1] for item in usage.values()) - doomed_bytes
+            for session in sessions:
+                if total <= float(max_total) * _GB:
+                    break
+                if session["dir"] not in doomed:
+                    doom(session, f"전체 용량 {max_total}GB 초과")
+                    total -= session["bytes"]
+                    doomed_bytes += session["bytes"]
+
+        min_free = global_rule.get("min_free_gb")
+        if min_free:
+            try:
+                free = shutil.disk_usage(self.get_save_dir()).free + doomed_bytes
+            except OSError:
+                free = None
+            for session in sessions if free is not None else []:
+                if free >= float(min_free) * _GB:
+                    break
+                if session["dir"] not in doomed:
+                    doom(session, f"여유 공간 {min_free}GB 미만")
+                    free += session["bytes"]
+
+        return sorted(doomed.values(), key=lambda item: item[0]["mtime"])
+
+    # === 삭제 ===
+
+    def run_once(self) -> int:
+        """
+        규칙을 한 번 적용합니다.
+
+        Returns:
+            int: 삭제한 방송 수
+        """
+        count = 0
+        for session, reason in self.plan():
+            if self._stop_event.is_set():
+                break
+            # 계획 후 녹화가 시작되었을 수 있으므로 다시 확인
+            if session["dir"] in self.protected():
+                continue
+            if self.on_delete:
+                self.on_delete(session, reason)
+            if not self.dry_run:
+                self._delete_session(session)
+            count += 1
+        return count
+
+    def _delete_session(self, session: dict):
+        """방송 디렉토리의 파일을 속도 제한을 지키며 삭제하고 색인에서 제거합니다."""
+        directory = Path(session["dir"])
+        indexed = set(session["files"])
+        removed = []
+
+        try:
+            with os.scandir(directory) as entries:
+                files = [entry.path for entry in entries if entry.is_file(follow_symlinks=False)]
+        except OSError:
+            files = []
+
+        for path in files:
+            if self._stop_event.is_set():
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            if path in indexed:
+                removed.append(path)
+            if len(removed) >= self.batch_size:
+                self.library.remove(removed)
+                removed = []
+            # 녹화 중에는 디스크 I/O를 덜 쓰도록 더 천천히 삭제
+            rate = self.delete_rate / (self.busy_slowdown if self.protected() else 1)
+            self._stop_event.wait(1.0 / max(rate, 0.1))
+
+        # 이미 없어진 파일도 색인에서 제거
+        removed.extend(path for path in indexed if path not in files)
+        if removed:
+            self.library.remove(removed)
+        self.deleted_bytes += session["bytes"]
+
+        try:
+            directory.rmdir()
+        except OSError:
+            pass
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                # 한 번 실패해도 다음 주기에 다시 시도
+                pass
+            self._wake_event.wait(self.interval)
+            self._wake_event.clear()
+
+    def start(self):
+        """백그라운드에서 주기적으로 규칙 적용을 시작합니다."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="retention", daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        """다음 주기를 기다리지 않고 규칙을 바로 확인합니다 (녹화 종료 시 등)."""
+        self._wake_event.set()
+
+    def stop(self):
+        """백그라운드 스레드를 종료합니다."""
+        self._stop_event.set()
+        self._wake_event.set()
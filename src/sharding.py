@@ -0,0 +1,296 @@
+"""다중 인스턴스 채널 분담 모듈
+
+여러 인스턴스(같은 호스트 또는 디렉토리를 공유하는 여러 호스트)가 공유 SQLite 파일의
+임대(lease)를 통해 채널을 나눠 맡습니다.
+
+- 채널을 감시하려는 인스턴스는 관심(interest)을 등록하고, 관심을 등록한 살아있는
+  인스턴스 중 rendezvous 해시로 정해진 한 인스턴스만 임대를 획득합니다.
+- 임대는 하트비트로 갱신되며, 죽은 인스턴스의 임대는 TTL 경과 후 다른 인스턴스가 인계합니다.
+- 임대를 가진 인스턴스만 녹화할 수 있으므로 같은 채널이 두 번 녹화되지 않습니다.
+- 하트비트가 계속 실패하면(파일 잠김/연결 끊김) 로컬 만료 시각이 지난 임대를 스스로 내려놓습니다(self-fencing).
+  로컬 만료 시각은 TTL에서 호스트 간 최대 시계 차이(skew)를 뺀 값이라, 다른 인스턴스가 자기 시계로
+  임대 만료를 판단하기 전에 녹화를 멈춥니다.
+"""
+
+import hashlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+
+
+class LeaseCoordinator:
+    """공유 SQLite 파일 기반 채널 임대 관리 클래스"""
+
+    def __init__(self, db_path: str, ttl: float = 30.0, instance_id: str = None, busy_check=None, on_lost=None,
+                 skew: float = 5.0):
+        """
+        Args:
+            db_path: 공유 임대 파일 경로 (모든 인스턴스가 같은 파일을 사용)
+            ttl: 임대 유효 시간 (초). 하트비트는 ttl/3 간격
+            instance_id: 인스턴스 식별자 (None이면 호스트명:PID:난수)
+            busy_check: user_id를 받아 녹화 중인지 반환하는 함수 (녹화 중인 채널은 재분배하지 않음)
+            on_lost: 임대를 잃었을 때 호출할 콜백 (user_id) - 하트비트/만료 감시 스레드에서 호출됨
+            skew: 호스트 간 최대 시계 차이 (초, 최대 ttl/3). 로컬 만료 시각을 이만큼 앞당김
+        """
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.instance_id = instance_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.busy_check = busy_check
+        self.on_lost = on_lost
+        self.skew = max(0.0, min(skew, ttl / 3))
+        self.owned = {}  # {user_id: 로컬 만료 시각 (monotonic)}
+        self.interests = set()
+        self._lock = threading.Lock()  # 임대 파일 접근 (하트비트가 오래 막힐 수 있음)
+        self._owned_lock = threading.Lock()  # owned 변경 (파일 접근 중에는 잡지 않음)
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._fence_thread = None
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS leases (
+                    user_id TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS interests (
+                    user_id TEXT NOT NULL,
+                    instance_id TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (user_id, instance_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_interests_expires ON interests(expires_at);
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # 공유 디렉토리(네트워크 드라이브) 호환을 위해 WAL 대신 기본 저널 모드 사용
+        return sqlite3.connect(self.db_path, timeout=10.0, isolation_level=None)
+
+    @staticmethod
+    def _score(instance_id: str, user_id: str) -> bytes:
+        return hashlib.sha1(f"{instance_id}|{user_id}".encode("utf-8")).digest()
+
+    def _preferred(self, conn: sqlite3.Connection, user_id: str, now: float) -> str | None:
+        """관심을 등록한 살아있는 인스턴스 중 이 채널을 맡아야 할 인스턴스를 반환합니다."""
+        rows = conn.execute(
+            "SELECT instance_id FROM interests WHERE user_id = ? AND expires_at > ?",
+            (user_id, now)
+        ).fetchall()
+        if not rows:
+            return None
+        return max((row[0] for row in rows), key=lambda i: self._score(i, user_id))
+
+    def try_acquire(self, user_id: str) -> bool:
+        """
+        채널 임대 획득을 시도합니다 (이미 보유 중이면 갱신).
+
+        Returns:
+            bool: 이 인스턴스가 채널을 담당하면 True
+        """
+        started = time.monotonic()
+        now = time.time()
+        with self._lock:
+            self.interests.add(user_id)
+            try:
+                conn = self._connect()
+            except sqlite3.Error:
+                return self.owns(user_id)
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "INSERT OR REPLACE INTO interests (user_id, instance_id, expires_at) VALUES (?, ?, ?)",
+                    (user_id, self.instance_id, now + self.ttl)
+                )
+                row = conn.execute(
+                    "SELECT owner, expires_at FROM leases WHERE user_id = ?", (user_id,)
+                ).fetchone()
+
+                if row and row[0] != self.instance_id and row[1] > now:
+                    # 다른 인스턴스가 유효한 임대를 보유 중
+                    conn.execute("COMMIT")
+                    with self._owned_lock:
+                        self.owned.pop(user_id, None)
+                    return False
+
+                if not (row and row[0] == self.instance_id) and self._preferred(conn, user_id, now) != self.instance_id:
+                    # 비어있지만 다른 인스턴스가 우선 담당
+                    conn.execute("COMMIT")
+                    return False
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO leases (user_id, owner, expires_at) VALUES (?, ?, ?)",
+                    (user_id, self.instance_id, now + self.ttl)
+                )
+                conn.execute("COMMIT")
+                with self._owned_lock:
+                    self.owned[user_id] = self._deadline(started)
+                return True
+            except sqlite3.Error:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                return self.owns(user_id)
+            finally:
+                conn.close()
+
+    def _deadline(self, started: float) -> float:
+        """
+        로컬 만료 시각. 임대 파일에 기록한 만료 시각(기록 전 시계 + ttl)보다
+        시계 차이만큼 먼저 만료되도록 기록 시작 전 monotonic 시각을 기준으로 계산
+        """
+        return started + self.ttl - self.skew
+
+    def owns(self, user_id: str) -> bool:
+        """이 인스턴스가 유효한 임대를 보유 중인지 확인합니다 (파일 접근 없음)."""
+        deadline = self.owned.get(user_id)
+        return deadline is not None and deadline > time.monotonic()
+
+    def release(self, user_id: str):
+        """채널 임대와 관심 등록을 해제합니다."""
+        with self._lock:
+            self.interests.discard(user_id)
+            with self._owned_lock:
+                self.owned.pop(user_id, None)
+            try:
+                with closing(self._connect()) as conn:
+                    conn.execute(
+                        "DELETE FROM leases WHERE user_id = ? AND owner = ?", (user_id, self.instance_id)
+                    )
+                    conn.execute(
+                        "DELETE FROM interests WHERE user_id = ? AND instance_id = ?", (user_id, self.instance_id)
+                    )
+            except sqlite3.Error:
+                pass
+
+    def heartbeat(self) -> list[str]:
+        """
+        관심 등록과 보유 임대를 갱신하고, 잃은 임대 및 재분배할 임대를 정리합니다.
+
+        Returns:
+            list[str]: 이번 하트비트에서 잃은 채널 목록
+        """
+        started = time.monotonic()
+        now = time.time()
+        lost = []
+        with self._lock:
+            conn = self._connect()
+            renewed = []
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for user_id in self.interests:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO interests (user_id, instance_id, expires_at) VALUES (?, ?, ?)",
+                        (user_id, self.instance_id, now + self.ttl)
+                    )
+
+                for user_id in list(self.owned):
+                    row = conn.execute(
+                        "SELECT owner FROM leases WHERE user_id = ?", (user_id,)
+                    ).fetchone()
+                    if not row or row[0] != self.instance_id:
+                        # 만료 후 다른 인스턴스가 가져감
+                        with self._owned_lock:
+                            held = self.owned.pop(user_id, None) is not None
+                        if held:
+                            lost.append(user_id)
+                        continue
+
+                    busy = self.busy_check(user_id) if self.busy_check else False
+                    if not busy and self._preferred(conn, user_id, now) != self.instance_id:
+                        # 새 인스턴스가 합류하여 담당이 바뀜 - 녹화 중이 아닐 때만 넘겨줌
+                        conn.execute("DELETE FROM leases WHERE user_id = ?", (user_id,))
+                        with self._owned_lock:
+                            held = self.owned.pop(user_id, None) is not None
+                        if held:
+                            lost.append(user_id)
+                        continue
+
+                    conn.execute(
+                        "UPDATE leases SET expires_at = ? WHERE user_id = ?", (now + self.ttl, user_id)
+                    )
+                    renewed.append(user_id)
+
+                # 오래 전에 만료된 행 정리
+                conn.execute("DELETE FROM interests WHERE expires_at < ?", (now - self.ttl,))
+                conn.execute("DELETE FROM leases WHERE expires_at < ?", (now - self.ttl,))
+                conn.execute("COMMIT")
+                # 커밋된 뒤에만 로컬 만료 시각 연장 (만료 감시가 그사이 내려놓은 임대는 다시 잡지 않음)
+                with self._owned_lock:
+                    for user_id in renewed:
+                        if user_id in self.owned:
+                            self.owned[user_id] = self._deadline(started)
+            except sqlite3.Error:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+            finally:
+                conn.close()
+
+        if self.on_lost:
+            for user_id in lost:
+                self.on_lost(user_id)
+        return lost
+
+    def fence(self) -> list[str]:
+        """
+        하트비트로 갱신하지 못한 채 로컬 만료 시각이 지난 임대를 내려놓습니다 (임대 파일 접근 없음).
+        다른 인스턴스가 인계하기 전에 녹화를 멈추도록 on_lost를 호출합니다.
+
+        Returns:
+            list[str]: 내려놓은 채널 목록
+        """
+        now = time.monotonic()
+        with self._owned_lock:
+            expired = [user_id for user_id, deadline in self.owned.items() if deadline <= now]
+            for user_id in expired:
+                del self.owned[user_id]
+        if self.on_lost:
+            for user_id in expired:
+                self.on_lost(user_id)
+        return expired
+
+    def _run(self):
+        while not self._stop_event.wait(self.ttl / 3):
+            try:
+                self.heartbeat()
+            except sqlite3.Error:
+                # 임대 파일을 열 수 없음 - 만료 감시가 로컬 만료 시각에 임대를 내려놓음
+                pass
+
+    def _run_fence(self):
+        # 하트비트가 파일 잠김/네트워크 드라이브 응답 없음으로 막혀 있어도 만료를 감시
+        while not self._stop_event.wait(min(1.0, self.ttl / 10)):
+            self.fence()
+
+    def start(self):
+        """하트비트 / 만료 감시 스레드를 시작합니다."""
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+            self._thread.start()
+            self._fence_thread = threading.Thread(target=self._run_fence, name="lease-fence", daemon=True)
+            self._fence_thread.start()
+
+    def stop(self):
+        """하트비트를 멈추고 보유한 모든 임대를 즉시 반납합니다."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._fence_thread:
+            self._fence_thread.join(timeout=5)
+            self._fence_thread = None
+        for user_id in list(self.interests | set(self.owned)):
+            self.release(user_id)
+
+    def live_instances(self) -> list[str]:
+        """관심 등록이 유효한 인스턴스 목록을 반환합니다."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT instance_id FROM interests WHERE expires_at > ?", (time.time(),)
+            ).fetchall()
+        return sorted(row[0] for row in rows)
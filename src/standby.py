@@ -0,0 +1,250 @@
+"""대기 녹화 프로세스 모듈
+
+방송 시작이 예상되는 채널마다 yt-dlp 녹화 프로세스를 미리 실행해 두고(시작/옵션 해석까지 마친 뒤
+표준 입력에서 추출 정보를 기다림), 방송 시작을 감지하면 녹화기가 그 프로세스에 확인 결과의 추출 정보를 보내
+바로 다운로드를 시작합니다. 실행 파일 시작(Windows 단일 실행 파일은 압축 해제 포함)과 모듈 로드 시간,
+재추출을 모두 녹화 시작에서 뺍니다.
+
+- 예측 점수: 최근에 방송이 끝났거나 방송 중으로 확인된 채널(방송이 끊겨 다시 시작하는 경우)과
+  지난 며칠간 지금부터 lead 안에 방송을 시작한 날의 비율 (최근 날일수록 가중치가 큼)
+- 대기 프로세스 수는 size 이하, idle_timeout이 지난 프로세스는 종료 후 다시 배정 (메모리/설정 변경 반영)
+- 한 스레드가 refresh_interval마다 배정을 갱신
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from .process_manager import process_manager
+
+
+_DAY = 86400.0
+
+
+def predict_live(
+    candidates: list[str],
+    sessions: dict,
+    last_live: dict,
+    now: datetime,
+    lead: float = 1800.0,
+    recent: float = 1800.0,
+    days: int = 14
+) -> list[tuple[str, float]]:
+    """
+    채널별 곧 방송을 시작할 가능성 점수를 계산합니다.
+
+    Args:
+        candidates: 점수를 매길 채널 ID 목록
+        sessions: HistoryStore.session_starts() 결과 {user_id: [(시작, 종료 | None)]}
+        last_live: HistoryStore.last_live_probes() 결과 {user_id: 마지막으로 방송 중이었던 시각}
+        now: 기준 시각
+        lead: 이 시간(초) 안에 시작할 방송을 예측
+        recent: 방송이 끝난 지 이 시간(초)이 지나지 않은 채널은 다시 시작할 가능성이 높다고 봄
+        days: 시작 시각 습관을 볼 기간 (일)
+
+    Returns:
+        list[tuple[str, float]]: 점수가 0보다 큰 채널 (점수 높은 순)
+    """
+    now_tod = now.hour * 3600 + now.minute * 60 + now.second
+    since = now - timedelta(days=days)
+    # 최근 날일수록 가중치가 큼 (1주일마다 절반), 매일 같은 시각에 시작했으면 1
+    def weight(age_days: float) -> float:
+        return 0.5 ** (age_days / 7)
+
+    total_weight = sum(weight(day) for day in range(max(1, days)))
+    scored = []
+    for user_id in candidates:
+        score = 0.0
+
+        # 최근 활동: 끝난 지 얼마 안 된 방송 (트위캐스트는 방송이 끊기거나 나뉘어 다시 시작하는 경우가 많음)
+        ended = [end or start for start, end in sessions.get(user_id, ())]
+        if user_id in last_live:
+            ended.append(last_live[user_id])
+        if ended:
+            age = (now - max(ended)).total_seconds()
+            if 0 <= age < recent:
+                score += 2.0 * (1 - age / recent)
+
+        # 시작 시각 습관: 지금부터 lead 안(조금 늦는 경우 10분 전부터)에 시작한 날의 비율
+        habit = 0.0
+        counted_days = set()
+        for start, _ in sessions.get(user_id, ()):
+            if start < since or start.date() in counted_days:
+                continue
+            ahead = (start.hour * 3600 + start.minute * 60 + start.second - now_tod) % _DAY
+            if ahead <= lead or ahead >= _DAY - 600:
+                counted_days.add(start.date())
+                habit += weight((now - start).total_seconds() / _DAY)
+        score += habit / total_weight
+
+        if score > 0:
+            scored.append((user_id, score))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored
+
+
+class _Standby:
+    """대기 녹화 프로세스 하나"""
+
+    def __init__(self, process, key: str, score: float):
+        self.process = process
+        self.key = key
+        self.score = score
+        self.spawned_at = time.monotonic()
+
+
+class StandbyPool:
+    """채널별 대기 녹화 프로세스 관리 클래스"""
+
+    def __init__(
+        self,
+        recorder,
+        rank,
+        size: int = 2,
+        idle_timeout: float = 600.0,
+        refresh_interval: float = 30.0,
+        on_event=None
+    ):
+        """
+        Args:
+            recorder: StreamRecorder 인스턴스 (대기 프로세스 실행 / 넘겨받기)
+            rank: [(user_id, 점수, 녹화 옵션 dict)]를 가능성 높은 순으로 반환하는 함수 (감시 스레드에서 호출됨).
+                녹화 옵션은 StreamRecorder.spawn_standby 인자 (ytdlp_path, ffmpeg_path, save_path, outputs, manifest)
+            size: 최대 대기 프로세스 수
+            idle_timeout: 넘겨주지 못한 대기 프로세스를 종료하고 다시 배정하는 시간 (초)
+            refresh_interval: 배정 갱신 주기 (초)
+            on_event: 배정/회수 시 호출할 콜백 (user_id, 메시지) - 감시 스레드에서 호출됨
+        """
+        self.recorder = recorder
+        self.rank = rank
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.refresh_interval = refresh_interval
+        self.on_event = on_event
+
+        self.workers = {}  # {user_id: _Standby}
+        self.spawned = 0
+        self.claimed = 0
+        self.recycled = 0
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _notify(self, user_id: str, message: str):
+        if self.on_event:
+            self.on_event(user_id, message)
+
+    @staticmethod
+    def _discard(worker: _Standby):
+        # 아직 URL을 받지 않았으므로 바로 종료해도 남는 파일이 없음
+        process_manager.kill_tree(worker.process)
+        try:
+            worker.process.wait(timeout=5)
+        except Exception:
+            pass
+        process_manager.release(worker.process)
+
+    # === 넘겨주기 ===
+
+    def claim(self, user_id: str, key: str):
+        """
+        채널의 대기 프로세스를 넘겨줍니다 (녹화기에서 호출).
+
+        Returns:
+            subprocess.Popen | None: 옵션이 같고 살아있는 대기 프로세스 (없으면 None)
+        """
+        with self._lock:
+            worker = self.workers.pop(user_id, None)
+        if worker is None:
+            return None
+        self._wake_event.set()  # 빈자리에 다음 채널 배정
+        if worker.key != key or worker.process.poll() is not None:
+            self._discard(worker)
+            return None
+        self.claimed += 1
+        return worker.process
+
+    # === 배정 ===
+
+    def refresh(self):
+        """예측 순위에 맞게 대기 프로세스를 배정/회수합니다."""
+        now = time.monotonic()
+        wanted = {}
+        for user_id, score, options in self.rank():
+            if len(wanted) >= self.size:
+                break
+            if not self.recorder.is_recording(user_id):
+                wanted[user_id] = (score, options)
+
+        with self._lock:
+            stale = []
+            for user_id, worker in list(self.workers.items()):
+                expired = now - worker.spawned_at >= self.idle_timeout
+                target = wanted.get(user_id)
+                changed = target is not None and self.recorder.standby_key(**target[1]) != worker.key
+                if target is None or expired or changed or worker.process.poll() is not None:
+                    stale.append((user_id, self.workers.pop(user_id), expired))
+        for user_id, worker, expired in stale:
+            self._discard(worker)
+            if expired:
+                self.recycled += 1
+
+        for user_id, (score, options) in wanted.items():
+            with self._lock:
+                if user_id in self.workers or len(self.workers) >= self.size:
+                    continue
+            # 대기 프로세스가 프로세스 한도를 차지하지 않도록 여유가 있을 때만 실행
+            if process_manager.live_count() >= process_manager.budget:
+                break
+            try:
+                process = self.recorder.spawn_standby(user_id, **options)
+            except Exception as e:
+                self._notify(user_id, f"⚠️ 대기 녹화 프로세스 실행 실패: {e}")
+                continue
+            worker = _Standby(process, self.recorder.standby_key(**options), score)
+            with self._lock:
+                closed = self._stop_event.is_set()
+                if not closed:
+                    self.workers[user_id] = worker
+            if closed:
+                self._discard(worker)
+                return
+            self.spawned += 1
+            self._notify(user_id, f"🔥 대기 녹화 프로세스 준비 (예측 점수 {score:.2f})")
+
+    def stats(self) -> dict:
+        """{"workers": [user_id], "spawned", "claimed", "recycled"}"""
+        with self._lock:
+            workers = list(self.workers)
+        return {"workers": workers, "spawned": self.spawned, "claimed": self.claimed, "recycled": self.recycled}
+
+    def wake(self):
+        """배정을 바로 갱신합니다 (방송 시작/종료, 감시 시작/중지 시)."""
+        self._wake_event.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                # 한 번 실패해도 다음 주기에 다시 배정
+                pass
+            self._wake_event.wait(self.refresh_interval)
+            self._wake_event.clear()
+
+    def start(self):
+        """백그라운드 배정을 시작합니다."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="standby-pool", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """배정을 멈추고 모든 대기 프로세스를 종료합니다."""
+        self._stop_event.set()
+        self._wake_event.set()
+        with self._lock:
+            workers = list(self.workers.values())
+            self.workers.clear()
+        for worker in workers:
+            self._discard(worker)
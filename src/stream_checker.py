@@ -2,21 +2,75 @@
 
 import asyncio
 import json
-import subprocess
-import sys
 from datetime import datetime
 
+from .process_manager import process_manager
+from .tracing import tracer
 
-async def check_stream_status(user_id: str, ytdlp_path: str = None) -> dict:
+
+# 오류 분류
+ERROR_OFFLINE = "offline"
+ERROR_NOT_FOUND = "not_found"
+ERROR_BLOCKED = "blocked"
+ERROR_RATE_LIMITED = "rate_limited"
+ERROR_NETWORK = "network"
+ERROR_TIMEOUT = "timeout"
+ERROR_EXTRACTOR = "extractor"
+ERROR_UNKNOWN = "unknown"
+
+# (분류, stderr에 포함되는 문구) - 위에서부터 먼저 일치하는 분류 사용
+_ERROR_PATTERNS = [
+    (ERROR_OFFLINE, ("no video formats found", "not currently live", "is offline")),
+    (ERROR_RATE_LIMITED, ("http error 429", "too many requests", "rate limit")),
+    (ERROR_NOT_FOUND, ("http error 404", "404: not found", "does not exist", "user not found")),
+    (ERROR_BLOCKED, ("http error 403", "not available in your country", "geo restrict",
+                     "geo-restrict", "private", "login required", "password")),
+    (ERROR_TIMEOUT, ("timed out", "timeout")),
+    (ERROR_NETWORK, ("unable to download webpage", "connection", "name resolution", "getaddrinfo",
+                     "urlopen error", "network is unreachable", "ssl", "remote end closed",
+                     "http error 5")),
+    (ERROR_EXTRACTOR, ("unsupported url", "unable to extract", "please report this issue",
+                       "traceback", "keyerror", "typeerror")),
+]
+
+
+def classify_error(error_msg: str) -> str:
+    """
+    yt-dlp 오류 메시지를 분류합니다.
+
+    Args:
+        error_msg: yt-dlp stderr 출력
+
+    Returns:
+        str: ERROR_* 분류 중 하나
+    """
+    lowered = error_msg.lower()
+    for kind, patterns in _ERROR_PATTERNS:
+        if any(pattern in lowered for pattern in patterns):
+            return kind
+    return ERROR_UNKNOWN
+
+
+async def check_stream_status(
+    user_id: str,
+    ytdlp_path: str = None,
+    proxy: str = None,
+    source_address: str = None
+) -> dict:
     """
     yt-dlp를 사용하여 트위캐스트 방송 상태를 확인합니다.
 
     Args:
         user_id: 트위캐스트 사용자 ID (URL의 마지막 부분)
         ytdlp_path: yt-dlp 실행 파일 경로 (None이면 'yt-dlp' 명령어 사용)
+        proxy: 확인 요청에 사용할 프록시 URL (http/socks)
+        source_address: 확인 요청에 사용할 로컬 출발 주소
 
     Returns:
         dict: {"is_live": bool, "title": str | None, "checked_at": datetime}
+            오류 시 "error"(메시지)와 "error_kind"(ERROR_* 분류)가 추가됩니다.
+            방송 중이면 녹화기에 그대로 넘길 수 있도록 "movie_id"와
+            yt-dlp 원본 정보 JSON("info_json")이 추가됩니다.
     """
     url = f"https://twitcasting.tv/{user_id}"
     ytdlp_cmd = ytdlp_path if ytdlp_path else "yt-dlp"
@@ -31,41 +85,57 @@ async def check_stream_status(user_id: str, ytdlp_path: str = None) -> dict:
             "--skip-download",
             "--dump-single-json",
             "--no-warnings",
-            url
         ]
+        if proxy:
+            cmd += ["--proxy", proxy]
+        if source_address:
+            cmd += ["--source-address", source_address]
+        cmd.append(url)
 
-        # 비동기 subprocess 실행
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
-        )
+        # 비동기 subprocess 실행 (타임아웃/취소 시 프로세스 그룹 전체 종료)
+        with tracer.span("probe.spawn", "probe", user_id=user_id):
+            process = await process_manager.spawn_async(
+                "probe",
+                cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
 
-        stdout, stderr = await asyncio.wait_for(
-            process.communicate(),
-            timeout=15.0  # 15초 타임아웃
-        )
+        with tracer.span("probe.wait", "probe", user_id=user_id):
+            stdout, stderr = await process_manager.communicate_async(
+                process,
+                timeout=15.0  # 15초 타임아웃
+            )
 
         if process.returncode == 0 and stdout:
+            with tracer.span("probe.decode", "probe", user_id=user_id, size=len(stdout)):
+                text = stdout.decode("utf-8")
+
             # JSON 파싱
-            data = json.loads(stdout.decode("utf-8"))
+            with tracer.span("probe.parse", "probe", user_id=user_id):
+                data = json.loads(text)
 
             # is_live 필드 확인 (트위캐스트는 라이브가 아니면 오류 발생)
             is_live = data.get("is_live", True)  # 성공적으로 가져왔다면 라이브 중
             title = data.get("title") or data.get("fulltitle")
 
-            return {
+            result = {
                 "is_live": is_live,
                 "title": title,
                 "checked_at": datetime.now()
             }
+            if is_live:
+                # 녹화 시작 시 재추출을 건너뛰기 위해 추출 결과를 보관
+                result["movie_id"] = data.get("id")
+                result["info_json"] = text
+            return result
         else:
             # 방송이 없거나 오류 발생
             error_msg = stderr.decode("utf-8", errors="ignore").strip() if stderr else ""
 
             # 일반적인 "방송 없음" 오류는 정상 상태로 처리
-            if "no video formats found" in error_msg.lower() or "not currently live" in error_msg.lower():
+            error_kind = classify_error(error_msg)
+            if error_kind == ERROR_OFFLINE:
                 return {
                     "is_live": False,
                     "title": None,
@@ -76,7 +146,8 @@ async def check_stream_status(user_id: str, ytdlp_path: str = None) -> dict:
                 "is_live": False,
                 "title": None,
                 "checked_at": datetime.now(),
-                "error": error_msg or f"exit code {process.returncode}"
+                "error": error_msg or f"exit code {process.returncode}",
+                "error_kind": error_kind
             }
 
     except asyncio.TimeoutError:
@@ -84,19 +155,22 @@ async def check_stream_status(user_id: str, ytdlp_path: str = None) -> dict:
             "is_live": False,
             "title": None,
             "checked_at": datetime.now(),
-            "error": "Timeout (15s)"
+            "error": "Timeout (15s)",
+            "error_kind": ERROR_TIMEOUT
         }
     except json.JSONDecodeError as e:
         return {
             "is_live": False,
             "title": None,
             "checked_at": datetime.now(),
-            "error": f"JSON parse error: {e}"
+            "error": f"JSON parse error: {e}",
+            "error_kind": ERROR_EXTRACTOR
         }
     except Exception as e:
         return {
             "is_live": False,
             "title": None,
             "checked_at": datetime.now(),
-            "error": str(e)
+            "error": str(e),
+            "error_kind": ERROR_UNKNOWN
         }
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""트레이싱 및 프로파일링 모듈
+
+감시/녹화 파이프라인의 구간별 소요 시간을 Chrome trace(Perfetto) 형식으로
+기록하고, 일정 시간 동안 샘플링 프로파일러를 실행하는 기능을 제공합니다.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class _NullSpan:
+    """트레이싱이 꺼져 있을 때 사용하는 빈 구간"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Chrome trace 이벤트 수집 클래스 (기본 비활성화)"""
+
+    def __init__(self, max_events: int = 200_000):
+        """
+        Args:
+            max_events: 메모리에 유지할 최대 이벤트 수 (초과 시 오래된 것부터 삭제)
+        """
+        self.enabled = False
+        self.events = deque(maxlen=max_events)
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        """트레이싱을 켭니다. 이전에 수집된 이벤트는 삭제됩니다."""
+        with self._lock:
+            self.events.clear()
+            self._origin_ns = time.perf_counter_ns()
+            self.enabled = True
+
+    def disable(self):
+        """트레이싱을 끕니다. 수집된 이벤트는 유지됩니다."""
+        self.enabled = False
+
+    def _now_us(self) -> float:
+        return (time.perf_counter_ns() - self._origin_ns) / 1000
+
+    def span(self, name: str, cat: str = "app", **args):
+        """
+        구간을 기록하는 컨텍스트 매니저를 반환합니다.
+
+        Args:
+            name: 구간 이름 (예: "probe.spawn")
+            cat: 카테고리
+            **args: trace 뷰어에 표시할 추가 정보
+
+        Returns:
+            컨텍스트 매니저 (비활성화 상태면 아무것도 기록하지 않음)
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, cat, args)
+
+    @contextmanager
+    def _span(self, name: str, cat: str, args: dict):
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            end = self._now_us()
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": start,
+                "dur": end - start,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = {k: str(v) for k, v in args.items()}
+            with self._lock:
+                self.events.append(event)
+
+    def instant(self, name: str, cat: str = "app", **args):
+        """순간 이벤트를 기록합니다."""
+        if not self.enabled:
+            return
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "i",
+            "s": "t",
+            "ts": self._now_us(),
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = {k: str(v) for k, v in args.items()}
+        with self._lock:
+            self.events.append(event)
+
+    def wrap(self, name: str, func, cat: str = "app"):
+        """함수 호출 전체를 하나의 구간으로 기록하도록 감쌉니다."""
+        if not self.enabled:
+            return func
+
+        def wrapper(*a, **kw):
+            with self.span(name, cat):
+                return func(*a, **kw)
+
+        return wrapper
+
+    def export(self, path: str) -> int:
+        """
+        수집된 이벤트를 Chrome trace JSON 파일로 저장합니다.
+
+        Args:
+            path: 저장할 파일 경로 (chrome://tracing, ui.perfetto.dev에서 열 수 있음)
+
+        Returns:
+            int: 저장된 이벤트 수
+        """
+        with self._lock:
+            events = list(self.events)
+
+        # 스레드 이름 메타데이터 추가
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": t.ident, "args": {"name": t.name}}
+            for t in threading.enumerate()
+        ]
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        return len(events)
+
+
+class SamplingProfiler:
+    """지정 시간 동안 모든 스레드의 호출 스택을 주기적으로 수집하는 프로파일러"""
+
+    def __init__(self, interval: float = 0.005):
+        """
+        Args:
+            interval: 샘플링 간격 (초)
+        """
+        self.interval = interval
+        self.samples = Counter()
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _collect(self, duration: float, output_path: str, on_done):
+        own_ident = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        deadline = time.monotonic() + duration
+
+        while time.monotonic() < deadline and not self._stop_event.is_set():
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+        count = self.dump(output_path)
+        if on_done:
+            on_done(output_path, count)
+
+    def start(self, duration: float, output_path: str, on_done=None) -> bool:
+        """
+        백그라운드에서 프로파일링을 시작합니다.
+
+        Args:
+            duration: 프로파일링 시간 (초)
+            output_path: 결과 파일 경로 (collapsed stack 형식, speedscope/flamegraph.pl 호환)
+            on_done: 완료 시 호출할 콜백 (output_path, sample_count)
+
+        Returns:
+            bool: 시작 여부 (이미 실행 중이면 False)
+        """
+        if self.is_running:
+            return False
+
+        self.samples.clear()
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._collect,
+            args=(duration, output_path, on_done),
+            name="sampling-profiler",
+            daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """실행 중인 프로파일링을 조기 종료합니다 (결과는 저장됨)."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def dump(self, output_path: str) -> int:
+        """수집된 샘플을 collapsed stack 형식으로 저장하고 총 샘플 수를 반환합니다."""
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return sum(self.samples.values())
+
+
+# 전역 인스턴스
+tracer = Tracer()
+profiler = SamplingProfiler()
@@ -1,6 +1,15 @@
 """유틸리티 함수 모듈"""
 
-from urllib.parse import urlparse
+import csv
+import re
+from urllib.parse import unquote, urlparse
+
+
+# 트위캐스트 사용자 ID: 트위터 ID, c:(트위캐스트 계정), g:/f:(구글/페이스북 숫자 ID), ig:(인스타그램)
+_USER_ID = re.compile(r"^(?:[A-Za-z0-9_]{1,50}|c:[A-Za-z0-9_]{1,50}|[gf]:\d{5,30}|ig:[A-Za-z0-9_.]{1,50})$")
+
+# 채널 목록 CSV에서 ID가 든 열로 보는 머리글
+_ID_COLUMNS = {"id", "user_id", "userid", "url", "channel", "channel_url", "채널", "아이디"}
 
 
 def extract_user_id(url_or_id: str) -> str:
@@ -34,6 +43,79 @@ def extract_user_id(url_or_id: str) -> str:
     return url_or_id
 
 
+def normalize_user_id(url_or_id: str) -> str | None:
+    """
+    URL 또는 ID를 검증된 트위캐스트 사용자 ID로 정규화합니다.
+
+    Args:
+        url_or_id: 트위캐스트 URL, 사용자 ID, "@ID" 또는 스킴 없는 "twitcasting.tv/ID"
+
+    Returns:
+        str | None: 사용자 ID (형식이 맞지 않으면 None)
+
+    Examples:
+        >>> normalize_user_id("twitcasting.tv/c%3Auser123/movie/1")
+        'c:user123'
+        >>> normalize_user_id("G:112335820121384004141")
+        'g:112335820121384004141'
+        >>> normalize_user_id("user 123") is None
+        True
+    """
+    text = url_or_id.strip().strip("'\"<>").lstrip("@")
+    if "twitcasting.tv/" in text and not text.startswith(("http://", "https://")):
+        text = "https://" + text.split("://", 1)[-1]
+    user_id = unquote(extract_user_id(text))
+    # 접두사는 소문자로 통일 (G:123 -> g:123)
+    prefix, colon, rest = user_id.partition(":")
+    if colon:
+        user_id = f"{prefix.lower()}:{rest}"
+    return user_id if _USER_ID.match(user_id) else None
+
+
+def parse_channel_list(text: str) -> tuple[list[str], list[str]]:
+    """
+    붙여넣은 URL 목록 또는 텍스트/CSV 파일 내용에서 채널 ID를 뽑습니다.
+
+    - 한 줄에 하나 (쉼표/세미콜론/탭으로 구분된 CSV도 가능, '#'으로 시작하는 줄은 주석)
+    - 첫 줄이 머리글(id, url, channel 등)이면 그 열을, 아니면 트위캐스트 URL이 있는 칸이나 첫 번째 칸을 사용
+    - 대소문자만 다른 ID는 처음 나온 것 하나만 남김
+
+    Returns:
+        tuple[list[str], list[str]]: (중복을 제거한 ID 목록(입력 순서), 형식이 맞지 않는 항목)
+    """
+    lines = [line for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    try:
+        dialect = csv.Sniffer().sniff("\n".join(lines[:20]), delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+
+    rows = list(csv.reader(lines, dialect))
+    column = None
+    if rows:
+        header = [cell.strip().lower() for cell in rows[0]]
+        column = next((index for index, name in enumerate(header) if name in _ID_COLUMNS), None)
+        if column is not None:
+            rows = rows[1:]
+
+    user_ids, invalid = [], []
+    seen = set()
+    for row in rows:
+        if column is not None:
+            cells = [row[column].strip()] if column < len(row) and row[column].strip() else []
+        else:
+            cells = [cell.strip() for cell in row if cell.strip()]
+        if not cells:
+            continue
+        cell = next((cell for cell in cells if "twitcasting.tv" in cell), cells[0])
+        user_id = normalize_user_id(cell)
+        if user_id is None:
+            invalid.append(cell)
+        elif user_id.lower() not in seen:
+            seen.add(user_id.lower())
+            user_ids.append(user_id)
+    return user_ids, invalid
+
+
 def validate_paths(*paths: str) -> tuple[bool, str]:
     """
     파일 경로들이 유효한지 검증합니다.
@@ -0,0 +1,183 @@
+"""녹화 정지 감시 모듈
+
+yt-dlp 녹화 프로세스가 살아있지만 더 이상 기록하지 않는 경우(네트워크 끊김, 멈춘 HLS 재생목록)를 찾아
+같은 방송 디렉토리의 이어서 녹화 파일(.part2, .part3, ...)로 바로 다시 시작합니다.
+
+- 스레드 하나가 모든 녹화를 주기적으로 확인 (파일 크기 stat + 마지막 출력 시각)
+- 파일이 커지지 않고 출력도 없는 시간이 stall_timeout을 넘으면 정지로 판단
+- 끊긴 구간은 방송 디렉토리의 `{방송}.gaps.json`에 기록
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+def gaps_path_for(directory: Path) -> Path:
+    """방송 디렉토리의 끊김 기록 파일 경로"""
+    return directory / f"{directory.name}.gaps.json"
+
+
+def record_gap(directory: Path, gap: dict):
+    """끊김 기록 파일에 구간 하나를 추가합니다 (임시 파일에 쓴 뒤 교체)."""
+    path = gaps_path_for(directory)
+    try:
+        gaps = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        gaps = []
+    gaps.append(gap)
+    temp_path = path.with_name(path.name + ".tmp")
+    try:
+        temp_path.write_text(json.dumps(gaps, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+class _Watch:
+    """녹화 하나의 감시 상태"""
+
+    def __init__(self, process, now: float):
+        self.process = process
+        self.path = None
+        self.size = -1
+        self.grown_at = now
+        self.restarts = 0
+
+
+class StallWatchdog:
+    """모든 녹화의 정지를 한 스레드에서 감시하는 클래스"""
+
+    def __init__(
+        self,
+        recorder,
+        stall_timeout: float = 60.0,
+        interval: float = 5.0,
+        max_restarts: int = 5,
+        on_event=None
+    ):
+        """
+        Args:
+            recorder: StreamRecorder 인스턴스
+            stall_timeout: 파일 증가와 출력이 모두 없는 시간이 이 값을 넘으면 정지로 판단 (초)
+            interval: 확인 주기 (초)
+            max_restarts: 방송 하나에서 이어서 녹화할 최대 횟수 (넘으면 녹화 중지)
+            on_event: 정지/재시작 시 호출할 콜백 (user_id, 메시지) - 감시 스레드에서 호출됨
+                      (감시 자체의 오류는 user_id None)
+        """
+        self.recorder = recorder
+        self.stall_timeout = stall_timeout
+        self.interval = interval
+        self.max_restarts = max_restarts
+        self.on_event = on_event
+
+        self.watches = {}  # {user_id: _Watch}
+        self.restart_count = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _notify(self, user_id: str, message: str):
+        if self.on_event:
+            self.on_event(user_id, message)
+
+    def check_once(self):
+        """모든 녹화를 한 번 확인합니다."""
+        now = time.monotonic()
+        processes = dict(self.recorder.processes)
+
+        for user_id in list(self.watches):
+            if user_id not in processes:
+                del self.watches[user_id]
+
+        for user_id, process in processes.items():
+            watch = self.watches.get(user_id)
+            if watch is None:
+                watch = self.watches[user_id] = _Watch(process, now)
+            elif watch.process is not process:
+                # 다른 곳에서 다시 시작된 녹화 - 재시작 횟수는 유지
+                watch.process = process
+                watch.size = -1
+                watch.grown_at = now
+
+            # 파일 크기 (경로를 아직 모르면 출력만으로 판단)
+            path = self.recorder.get_output_file(user_id)
+            if path:
+                try:
+                    size = os.stat(path).st_size
+                except OSError:
+                    size = 0
+                if path != watch.path or size > watch.size:
+                    watch.path = path
+                    watch.size = size
+                    watch.grown_at = now
+
+            if process.poll() is not None:
+                # 스스로 종료한 프로세스는 방송 종료 감지가 정리함
+                continue
+
+            last_progress = max(watch.grown_at, self.recorder.last_activity.get(user_id, 0.0))
+            silence = now - last_progress
+            if silence >= self.stall_timeout:
+                self._restart(user_id, watch, silence)
+
+    def _restart(self, user_id: str, watch: _Watch, silence: float):
+        stalled_at = datetime.now()
+        previous = watch.path
+
+        if watch.restarts >= self.max_restarts:
+            self._notify(user_id, f"⚠️ 녹화 정지 {silence:.0f}초 - 이어서 녹화 한도({self.max_restarts}회) 초과로 녹화 중지")
+            self.recorder.stop_recording(user_id)
+            self.watches.pop(user_id, None)
+            return
+
+        self._notify(user_id, f"⚠️ 녹화 정지 감지 ({silence:.0f}초간 진행 없음) - 이어서 녹화")
+        started = time.monotonic()
+        success, message = self.recorder.restart_recording(user_id, watch.process)
+        if not success:
+            self._notify(user_id, f"❌ 이어서 녹화 실패: {message}")
+            self.watches.pop(user_id, None)
+            return
+
+        watch.restarts += 1
+        self.restart_count += 1
+        watch.process = self.recorder.processes.get(user_id)
+        watch.path = None
+        watch.size = -1
+        watch.grown_at = time.monotonic()
+        self._notify(user_id, f"🔁 {message} ({time.monotonic() - started:.1f}초)")
+
+        if previous:
+            record_gap(Path(previous).parent, {
+                "part": self.recorder.parts.get(user_id),
+                "previous_file": Path(previous).name,
+                "stalled_since": datetime.fromtimestamp(stalled_at.timestamp() - silence).isoformat(timespec="seconds"),
+                "resumed_at": datetime.now().isoformat(timespec="seconds"),
+                # 마지막 진행부터 다시 시작까지 (새 파일의 첫 데이터까지는 포함하지 않음)
+                "seconds": round(silence + time.monotonic() - started, 1),
+            })
+
+    def _run(self):
+        last_error = None
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check_once()
+                last_error = None
+            except Exception as e:
+                # 한 번 실패해도 다음 주기에 다시 확인 (같은 오류가 이어지면 처음 한 번만 알림)
+                error = f"{type(e).__name__}: {e}"
+                if error != last_error:
+                    self._notify(None, f"⚠️ 녹화 정지 감시 오류: {error}")
+                last_error = error
+
+    def start(self):
+        """백그라운드 감시를 시작합니다."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="stall-watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """백그라운드 감시를 종료합니다."""
+        self._stop_event.set()
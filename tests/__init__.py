@@ -0,0 +1 @@
+"""동작 테스트 (python -m unittest 또는 pytest로 실행)"""
@@ -0,0 +1,126 @@
+"""녹화 승인 결정 테스트"""
+
+import time
+import unittest
+
+from src.admission import ADMIT, DEGRADE, QUEUE, AdmissionController
+
+
+class _Recorder:
+    def __init__(self):
+        self.recording = []
+
+    def get_recording_channels(self):
+        return list(self.recording)
+
+    def get_output_file(self, user_id):
+        return None
+
+
+class AdmissionTest(unittest.TestCase):
+    def _controller(self, **kwargs):
+        self.recorder = _Recorder()
+        self.admitted = []
+        controller = AdmissionController(
+            self.recorder,
+            on_admit=lambda user_id, payload, decision, reason: self.admitted.append((user_id, decision)),
+            interval=3600,
+            **kwargs
+        )
+        self.addCleanup(controller.stop)
+        return controller
+
+    def test_disabled_admits_everything(self):
+        controller = self._controller()
+        for i in range(10):
+            self.assertEqual(controller.request(f"u{i}")[0], ADMIT)
+
+    def test_concurrent_cap_counts_in_flight_admissions(self):
+        # 승인 후 녹화 목록에 나타나기 전에도 한도에 포함
+        controller = self._controller(max_concurrent=2)
+        self.assertEqual(controller.request("a")[0], ADMIT)
+        self.assertEqual(controller.request("b")[0], ADMIT)
+        self.assertEqual(controller.request("c")[0], QUEUE)
+        self.assertIn("c", controller.waiting)
+
+    def test_recording_and_admitted_not_double_counted(self):
+        controller = self._controller(max_concurrent=2)
+        controller.request("a")
+        self.recorder.recording = ["a"]
+        self.assertEqual(controller.request("b")[0], ADMIT)
+
+    def test_cancel_frees_slot(self):
+        controller = self._controller(max_concurrent=1)
+        controller.request("a")
+        self.assertEqual(controller.request("b")[0], QUEUE)
+        controller.cancel("a")
+        self.assertEqual(controller.request("b")[0], ADMIT)
+        self.assertNotIn("b", controller.waiting)
+
+    def test_stale_admission_expires(self):
+        controller = self._controller(max_concurrent=1)
+        controller.request("a")
+        controller.admitted["a"] = time.monotonic() - 120
+        controller.sample()
+        self.assertEqual(controller.request("b")[0], ADMIT)
+
+    def test_active_admission_kept_while_recording(self):
+        controller = self._controller(max_concurrent=1)
+        controller.request("a")
+        self.recorder.recording = ["a"]
+        controller.admitted["a"] = time.monotonic() - 120
+        controller.sample()
+        self.assertEqual(controller.request("b")[0], QUEUE)
+
+    def test_drain_respects_cap(self):
+        controller = self._controller(max_concurrent=2)
+        for user_id in ("a", "b", "c", "d", "e"):
+            controller.request(user_id)
+        controller.release("a")
+        controller._drain()
+        self.assertEqual(len(self.admitted), 1)
+        self.assertEqual(len(controller.waiting), 2)
+
+    def test_drain_priority_order(self):
+        controller = self._controller(max_concurrent=1)
+        controller.request("busy")
+        controller.request("low", priority=0)
+        controller.request("high", priority=5)
+        controller.release("busy")
+        controller._drain()
+        self.assertEqual(self.admitted, [("high", ADMIT)])
+
+    def test_waiting_higher_priority_goes_first(self):
+        controller = self._controller(max_concurrent=1)
+        controller.request("busy")
+        controller.request("high", priority=5)
+        controller.release("busy")
+        # 자리가 났어도 우선순위가 같거나 높은 대기 녹화보다 먼저 승인하지 않음
+        self.assertEqual(controller.request("low", priority=0)[0], QUEUE)
+        self.assertEqual(controller.request("higher", priority=9)[0], ADMIT)
+
+    def test_bandwidth_degrade_then_queue(self):
+        controller = self._controller(max_bandwidth_mbps=10, default_bitrate_mbps=3, degrade_ratio=0.3)
+        for user_id in ("a", "b", "c"):
+            self.assertEqual(controller.request(user_id)[0], ADMIT)
+        self.assertEqual(controller.request("d")[0], DEGRADE)
+        self.assertEqual(controller.request("e")[0], QUEUE)
+
+    def test_no_degrade_format_queues(self):
+        controller = self._controller(max_bandwidth_mbps=5, default_bitrate_mbps=3, degrade_format="")
+        controller.request("a")
+        decision, reason = controller.request("b")
+        self.assertEqual(decision, QUEUE)
+        self.assertIn("대역폭", reason)
+
+    def test_measured_rate_replaces_reservation(self):
+        controller = self._controller(max_bandwidth_mbps=10, default_bitrate_mbps=3)
+        controller.request("a")
+        controller.rates = {"a": (1.0, 1.0)}
+        # 예약(3) 대신 측정값(1)과 평균 추정치(1)로 판단
+        for user_id in ("b", "c", "d", "e"):
+            self.assertEqual(controller.request(user_id)[0], ADMIT)
+
+
+if __name__ == "__main__":
+    unittest.main()
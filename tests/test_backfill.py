@@ -0,0 +1,218 @@
+"""지난 방송 백필 테스트 (목록/대기열 걸러내기, 다운로드 진행, 조각 한도, 재시도)"""
+
+import json
+import sqlite3
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import unittest
+from contextlib import closing
+from pathlib import Path
+from types import SimpleNamespace
+
+from src.backfill import DONE, FAILED, QUEUED, RUNNING, BackfillQueue
+from src.library import RecordingLibrary
+
+
+# --flat-playlist이면 listing.json을 출력, 아니면 -o 형식대로 파일을 만들고 경로를 출력
+# 방송 ID가 "fail"로 시작하면 실패, "slow"로 시작하면 천천히 받음
+_FAKE_YTDLP = textwrap.dedent("""\
+    import json, sys, time
+    from pathlib import Path
+    here = Path(__file__).parent
+    args = sys.argv[1:]
+    if "--flat-playlist" in args:
+        listing = json.loads((here / "listing.json").read_text(encoding="utf-8"))
+        if listing is None:
+            sys.stderr.write("ERROR: Unable to download webpage\\n")
+            sys.exit(1)
+        print(json.dumps({"entries": listing}))
+        sys.exit(0)
+    movie_id = args[-1].rsplit("/", 1)[-1]
+    with open(here / "downloads.log", "a", encoding="utf-8") as log:
+        log.write(f"{movie_id} {args[args.index('-N') + 1]}\\n")
+    if movie_id.startswith("fail"):
+        print("ERROR: [twitcasting] This live is private")
+        sys.exit(1)
+    for percent in (10, 55, 100):
+        print(f"[download]  {percent:.1f}% of 1.00MiB", flush=True)
+        if movie_id.startswith("slow"):
+            time.sleep(0.3)
+    template = args[args.index("-o") + 1]
+    path = Path(template.replace("%(upload_date)s", "20240101").replace("%(title)s", f"title {movie_id}")
+                .replace("%(id)s", movie_id).replace("%(ext)s", "mp4"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"archive")
+    print(path)
+""")
+
+
+def _archive(movie_id: str, user_id: str = "alice") -> dict:
+    return {"id": movie_id, "url": f"https://twitcasting.tv/{user_id}/movie/{movie_id}", "title": f"title {movie_id}"}
+
+
+@unittest.skipIf(sys.platform == "win32", "POSIX 실행 스크립트 사용")
+class BackfillQueueTest(unittest.TestCase):
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        self.ytdlp = self.root / "yt-dlp"
+        self.ytdlp.write_text(f"#!{sys.executable}\n{_FAKE_YTDLP}", encoding="utf-8")
+        self.ytdlp.chmod(0o755)
+        self.save_dir = self.root / "rec"
+        self.settings = SimpleNamespace(ytdlp_path=str(self.ytdlp), ffmpeg_path="", save_path=str(self.save_dir))
+        self.library = RecordingLibrary(str(self.root / "library.db"))
+        self.events = []
+        self.live = {}
+        self.live_recordings = 0
+
+    def _queue(self, **kwargs) -> BackfillQueue:
+        queue = BackfillQueue(
+            self.library, lambda: self.settings, db_path=str(self.root / "backfill.db"),
+            live_count=lambda: self.live_recordings, live_movies=lambda: dict(self.live),
+            on_event=lambda user_id, message: self.events.append((user_id, message)),
+            poll_interval=0.05, **kwargs
+        )
+        self.addCleanup(self._stop, queue)
+        return queue
+
+    @staticmethod
+    def _stop(queue: BackfillQueue):
+        queue.stop()
+        # 임시 디렉토리를 지우기 전에 대기열 스레드가 데이터베이스를 놓을 때까지 기다림
+        if queue._thread:
+            queue._thread.join(5)
+
+    def _listing(self, entries):
+        (self.root / "listing.json").write_text(json.dumps(entries), encoding="utf-8")
+
+    def _downloads(self) -> list[tuple[str, str]]:
+        path = self.root / "downloads.log"
+        if not path.exists():
+            return []
+        return [tuple(line.split()) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    def _wait_idle(self, queue: BackfillQueue, timeout: float = 10):
+        deadline = time.monotonic() + timeout
+        while not queue.is_idle():
+            self.assertLess(time.monotonic(), deadline, "백필이 끝나지 않음")
+            time.sleep(0.05)
+
+    def _jobs(self, queue: BackfillQueue) -> dict:
+        with closing(queue._connect()) as conn:
+            return {row["movie_id"]: dict(row) for row in conn.execute("SELECT * FROM jobs")}
+
+    def test_enqueue_skips_recorded_and_current_live(self):
+        session = "[20240101]_old(100)"
+        recorded = self.save_dir / "alice" / session / f"{session}.mp4"
+        recorded.parent.mkdir(parents=True)
+        recorded.write_bytes(b"x")
+        self.library.add(str(recorded))
+        self._listing([_archive("100"), _archive("101"), _archive("102"), _archive("103")])
+        # 방송 중인 채널 (방송 ID 미확인) - 가장 큰 ID가 지금 방송
+        self.live["alice"] = None
+
+        queue = self._queue()
+        self.assertEqual(queue.enqueue_missing("alice"), 2)
+        self.assertEqual(set(self._jobs(queue)), {"101", "102"})
+        self.assertEqual(queue.enqueue_missing("alice"), 0)
+        self.assertEqual(queue.counts(), {QUEUED: 2})
+        self.assertIn(("alice", "📼 지난 방송 2개 백필 대기열에 추가"), self.events)
+
+    def test_downloads_in_live_layout_and_indexes(self):
+        self._listing([_archive("201"), _archive("202")])
+        queue = self._queue()
+        queue.enqueue_missing("alice")
+        queue.start()
+        self._wait_idle(queue)
+
+        self.assertEqual(queue.counts(), {DONE: 2})
+        for movie_id, job in self._jobs(queue).items():
+            session = f"[20240101]_title {movie_id}({movie_id})"
+            self.assertEqual(job["file_path"], str(self.save_dir / "alice" / session / f"{session}.mp4"))
+        self.assertEqual(self.library.movie_ids("alice"), {"201", "202"})
+        self.assertTrue(any("백필 완료" in message for _, message in self.events))
+
+    def test_failed_job_retried_then_failed(self):
+        self._listing([_archive("fail1")])
+        queue = self._queue(max_attempts=2)
+        queue.enqueue_missing("alice")
+        queue.start()
+        self._wait_idle(queue)
+
+        job = self._jobs(queue)["fail1"]
+        self.assertEqual((job["status"], job["attempts"]), (FAILED, 2))
+        self.assertEqual(job["error"], "ERROR: [twitcasting] This live is private")
+        self.assertEqual(len(self._downloads()), 2)
+
+        self.assertEqual(queue.retry_failed("alice"), 1)
+        self.assertEqual(self._jobs(queue)["fail1"]["attempts"], 0)
+
+    def test_fragment_budget_split_between_jobs(self):
+        self._listing([_archive("slow1"), _archive("slow2"), _archive("slow3")])
+        queue = self._queue(fragment_budget=6, fragments_per_job=4)
+        queue.enqueue_missing("alice")
+        queue._schedule()
+
+        # 첫 작업은 작업당 최대, 두 번째는 남은 한도, 세 번째는 한도가 빌 때까지 대기
+        progress = {job["movie_id"]: job["fragments"] for job in queue.progress()}
+        self.assertEqual(progress, {"slow1": 4, "slow2": 2})
+        self.assertEqual(queue.counts(), {RUNNING: 2, QUEUED: 1})
+        queue.start()
+        self._wait_idle(queue)
+        self.assertEqual(queue.counts(), {DONE: 3})
+
+    def test_live_recording_lowers_budget(self):
+        self._listing([_archive("301"), _archive("302")])
+        self.live_recordings = 1
+        queue = self._queue(fragment_budget=8, fragments_per_job=4, busy_budget=2)
+        queue.enqueue_missing("alice")
+        queue.start()
+        self._wait_idle(queue)
+        self.assertEqual(sorted(self._downloads()), [("301", "2"), ("302", "2")])
+
+    def test_live_movie_deferred_then_marked_recorded(self):
+        self._listing([_archive("401")])
+        queue = self._queue()
+        queue.enqueue_missing("alice")
+
+        # 대기열에 넣은 뒤 라이브 녹화가 시작된 방송은 방송이 끝날 때까지 미룸
+        self.live["alice"] = "401"
+        self.assertIsNone(queue._next_job())
+        self.assertEqual(queue.counts(), {QUEUED: 1})
+
+        # 방송이 끝나고 라이브 녹화 파일이 색인되어 있으면 받지 않고 완료 처리
+        self.live.clear()
+        session = "[20240101]_live(401)"
+        recorded = self.save_dir / "alice" / session / f"{session}.mp4"
+        recorded.parent.mkdir(parents=True)
+        recorded.write_bytes(b"x")
+        self.library.add(str(recorded))
+        self.assertIsNone(queue._next_job())
+        job = self._jobs(queue)["401"]
+        self.assertEqual((job["status"], job["error"]), (DONE, "라이브로 녹화됨"))
+
+    def test_interrupted_jobs_resume(self):
+        queue = self._queue()
+        with closing(sqlite3.connect(queue.db_path)) as conn, conn:
+            conn.execute(
+                "INSERT INTO jobs (movie_id, user_id, url, title, status, added_at) VALUES (?, ?, ?, ?, ?, ?)",
+                ("501", "alice", "https://twitcasting.tv/alice/movie/501", None, RUNNING, "2024-01-01T00:00:00")
+            )
+        self.assertEqual(self._queue().counts(), {QUEUED: 1})
+
+    def test_listing_failure_reported(self):
+        self._listing(None)
+        queue = self._queue()
+        done = threading.Event()
+        queue.on_event = lambda user_id, message: (self.events.append((user_id, message)), done.set())
+        queue.request_listing("alice")
+        self.assertTrue(done.wait(10))
+        self.assertEqual(self.events, [("alice", "⚠️ 지난 방송 목록 가져오기 실패: ERROR: Unable to download webpage")])
+
+
+if __name__ == "__main__":
+    unittest.main()
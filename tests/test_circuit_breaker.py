@@ -0,0 +1,99 @@
+"""서킷 브레이커 테스트"""
+
+import time
+import unittest
+
+from src.circuit_breaker import CLOSED, HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker
+from src.stream_checker import ERROR_NETWORK, ERROR_NOT_FOUND, ERROR_RATE_LIMITED
+
+
+def _failure(kind: str) -> dict:
+    return {"error": "실패", "error_kind": kind}
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker()
+        self.assertIsNone(breaker.record_failure(ERROR_NETWORK))
+        self.assertIsNone(breaker.record_failure(ERROR_NETWORK))
+        delay = breaker.record_failure(ERROR_NETWORK)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertTrue(27 <= delay <= 33)
+        self.assertFalse(breaker.allow())
+
+    def test_persistent_error_opens_immediately(self):
+        breaker = CircuitBreaker()
+        self.assertIsNotNone(breaker.record_failure(ERROR_NOT_FOUND))
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker()
+        breaker.record_failure(ERROR_NOT_FOUND)
+        breaker.retry_at = time.monotonic() - 1
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow())
+        breaker.release_probe()
+        self.assertTrue(breaker.allow())
+
+    def test_half_open_failure_doubles_delay(self):
+        breaker = CircuitBreaker()
+        first = breaker.record_failure(ERROR_NOT_FOUND)
+        breaker.retry_at = time.monotonic() - 1
+        breaker.allow()
+        second = breaker.record_failure(ERROR_NOT_FOUND)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertGreater(second, first * 1.6)
+
+    def test_delay_capped(self):
+        breaker = CircuitBreaker(max_delay=700)
+        for _ in range(5):
+            delay = breaker.record_failure(ERROR_NOT_FOUND)
+        self.assertLessEqual(delay, 700 * 1.1)
+
+    def test_success_closes(self):
+        breaker = CircuitBreaker()
+        breaker.record_failure(ERROR_NOT_FOUND)
+        breaker.retry_at = time.monotonic() - 1
+        breaker.allow()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.failures, 0)
+        self.assertTrue(breaker.allow())
+
+
+class BreakerRegistryTest(unittest.TestCase):
+    def test_rate_limit_pauses_all_channels(self):
+        registry = BreakerRegistry()
+        opened = registry.after_probe("a", _failure(ERROR_RATE_LIMITED))
+        self.assertEqual(opened[0], "global")
+        allowed, reason, remaining = registry.before_probe("b")
+        self.assertFalse(allowed)
+        self.assertGreater(remaining, 0)
+        # 요청 제한은 채널 브레이커에 반영하지 않음
+        self.assertEqual(registry.channel("a").state, CLOSED)
+
+    def test_rate_limit_outside_global_scope(self):
+        registry = BreakerRegistry()
+        self.assertIsNone(registry.after_probe("a", _failure(ERROR_RATE_LIMITED), global_scope=False))
+        self.assertTrue(registry.before_probe("b")[0])
+
+    def test_channel_failure_does_not_block_others(self):
+        registry = BreakerRegistry()
+        self.assertEqual(registry.after_probe("a", _failure(ERROR_NOT_FOUND))[0], "channel")
+        allowed, reason, _ = registry.before_probe("a")
+        self.assertFalse(allowed)
+        self.assertEqual(reason, ERROR_NOT_FOUND)
+        self.assertTrue(registry.before_probe("b")[0])
+
+    def test_site_response_closes_global(self):
+        registry = BreakerRegistry()
+        registry.after_probe("a", _failure(ERROR_RATE_LIMITED))
+        registry.global_breaker.retry_at = time.monotonic() - 1
+        self.assertTrue(registry.before_probe("b")[0])
+        registry.after_probe("b", {"is_live": False})
+        self.assertEqual(registry.global_breaker.state, CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
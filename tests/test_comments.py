@@ -0,0 +1,162 @@
+"""라이브 댓글 기록 테스트 (중복 제거, 버퍼 한도, 기록 파일 위치/형식, 중계 서버 수신)"""
+
+import gzip
+import json
+import socket
+import threading
+import time
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.comments import COMMENTS_SUFFIX, CommentRecorder
+
+
+def _closed_endpoint() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}/comments"
+
+
+def _read(path: Path) -> list[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _comment(comment_id, message: str, created_at, author="viewer") -> dict:
+    return {"user_id": "alice", "type": "comment", "id": comment_id, "author": author,
+            "message": message, "created_at": created_at}
+
+
+class CommentRecorderTest(unittest.TestCase):
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        self.media = self.root / "rec" / "alice" / "[20240101]_t(1)" / "[20240101]_t(1).mp4"
+        self.located = (None, None)
+
+    def _recorder(self, endpoint: str = None, **kwargs) -> CommentRecorder:
+        recorder = CommentRecorder(
+            endpoint or _closed_endpoint(), lambda: str(self.root / "rec"),
+            locate=lambda user_id: self.located, **kwargs
+        )
+        self.addCleanup(recorder.close)
+        return recorder
+
+    def test_writes_next_to_recording(self):
+        base = 1_700_000_000.0
+        self.located = (str(self.media), base)
+        recorder = self._recorder(flush_interval=60)
+        recorder.start("alice", {"movie_id": "1"})
+        recorder.on_event("alice", _comment(1, "안녕", base + 5.5, author={"screen_name": "kim"}))
+        recorder.on_event("alice", _comment(2, "ms", int((base + 10) * 1000)))
+        recorder.on_event("alice", _comment(3, "iso", datetime.fromtimestamp(base + 20, timezone.utc).isoformat()))
+        recorder.on_event("alice", _comment(1, "안녕", base + 5.5))  # 재연결로 다시 받은 댓글
+
+        result = recorder.stop("alice")
+        path = self.media.with_name("[20240101]_t(1)" + COMMENTS_SUFFIX)
+        self.assertEqual(result, {"path": path, "written": 3, "dropped": 0})
+        self.assertEqual(_read(path), [
+            {"user_id": "alice", "movie_id": "1", "base": base},
+            {"t": 5.5, "id": 1, "a": "kim", "m": "안녕"},
+            {"t": 10.0, "id": 2, "a": "viewer", "m": "ms"},
+            {"t": 20.0, "id": 3, "a": "viewer", "m": "iso"},
+        ])
+
+    def test_ignores_other_events_and_channels(self):
+        self.located = (str(self.media), 1000.0)
+        recorder = self._recorder(flush_interval=60)
+        recorder.start("alice")
+        recorder.on_event("alice", {"user_id": "alice", "type": "live", "is_live": True})
+        recorder.on_event("bob", _comment(1, "다른 채널", 1001))
+        self.assertIsNone(recorder.stop("bob"))
+        self.assertEqual(recorder.stop("alice"), {"path": None, "written": 0, "dropped": 0})
+
+    def test_buffer_limit_drops_oldest(self):
+        self.located = (str(self.media), 1000.0)
+        recorder = self._recorder(flush_interval=60, max_buffer=3)
+        recorder.start("alice")
+        for i in range(5):
+            recorder.on_event("alice", _comment(i, f"m{i}", 1000 + i))
+        result = recorder.stop("alice")
+        self.assertEqual((result["written"], result["dropped"]), (3, 2))
+        self.assertEqual([line["m"] for line in _read(result["path"])[1:]], ["m2", "m3", "m4"])
+
+    def test_waits_for_recording_then_appends(self):
+        recorder = self._recorder(flush_interval=60, locate_timeout=60)
+        recorder.start("alice")
+        session = recorder.sessions["alice"]
+        recorder.on_event("alice", _comment(1, "녹화 전", time.time()))
+
+        # 녹화 파일 위치를 모르면 주기 기록은 버퍼에 남겨 둠
+        recorder._flush(session)
+        self.assertEqual((session.path, len(session.buffer)), (None, 1))
+
+        self.located = (str(self.media), time.time())
+        recorder._flush(session)
+        recorder.on_event("alice", _comment(2, "녹화 중", time.time()))
+        recorder.stop("alice")
+
+        # 기록할 때마다 gzip 멤버를 덧붙여도 한 파일로 읽히고, 머리 줄은 한 번만
+        lines = _read(session.path)
+        self.assertEqual([line.get("m") for line in lines], [None, "녹화 전", "녹화 중"])
+        self.assertLess(lines[1]["t"], 0.5)
+
+    def test_not_recorded_uses_recording_layout(self):
+        recorder = self._recorder(flush_interval=60)
+        recorder.start("alice", {"movie_id": "77", "title": "제목"})
+        recorder.on_event("alice", _comment(1, "hi", time.time()))
+        result = recorder.stop("alice")
+        self.assertEqual(result["path"].parent.parent, self.root / "rec" / "alice")
+        self.assertTrue(result["path"].name.endswith(f"_제목(77){COMMENTS_SUFFIX}"))
+        self.assertEqual(_read(result["path"])[1]["m"], "hi")
+
+    def test_receives_from_relay(self):
+        comments = [_comment(i, f"relay {i}", 1000 + i) for i in range(3)]
+        requests = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests.append(self.path)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                try:
+                    for comment in comments:
+                        self.wfile.write((json.dumps(comment) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+                    while not stopped.wait(0.05):
+                        self.wfile.write(b"\n")
+                        self.wfile.flush()
+                except OSError:
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        stopped = threading.Event()
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.addCleanup(stopped.set)
+
+        self.located = (str(self.media), 1000.0)
+        recorder = self._recorder(f"http://127.0.0.1:{server.server_address[1]}/comments", flush_interval=0.1)
+        recorder.start("alice")
+        path = self.media.with_name("[20240101]_t(1)" + COMMENTS_SUFFIX)
+        deadline = time.monotonic() + 5
+        while not (path.exists() and len(_read(path)) == 4) and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        self.assertEqual([line.get("m") for line in _read(path)], [None, "relay 0", "relay 1", "relay 2"])
+        self.assertIn("channels=alice", requests[0])
+        self.assertEqual(recorder.stop("alice")["written"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+"""푸시 기반 방송 감지 테스트 (로컬 대체 이벤트 서버 사용)"""
+
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from src.event_detector import LiveEventSubscriber
+
+
+class _EventServer(ThreadingHTTPServer):
+    """요청마다 respond(handler, 순번)으로 응답하는 이벤트 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []  # [(채널 목록, Last-Event-ID, 시각)]
+        self.closed = threading.Event()
+        super().__init__(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/events"
+
+    def stop(self):
+        self.closed.set()
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"
+
+    def do_GET(self):
+        channels = parse_qs(urlsplit(self.path).query).get("channels", [""])[0].split(",")
+        index = len(self.server.requests)
+        self.server.requests.append((channels, self.headers.get("Last-Event-ID"), time.monotonic()))
+        self.server.respond(self, index)
+
+    def send_stream(self, lines: list[str], hold: float = 0.0, content_type="text/event-stream"):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.end_headers()
+        try:
+            for line in lines:
+                self.wfile.write((line + "\n").encode("utf-8"))
+            self.wfile.flush()
+            # 연결을 유지하는 동안 하트비트 전송 (닫힌 연결은 쓰기 실패로 종료)
+            deadline = time.monotonic() + hold
+            while time.monotonic() < deadline and not self.server.closed.is_set():
+                time.sleep(0.05)
+                self.wfile.write(b":\n")
+                self.wfile.flush()
+        except OSError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+class LiveEventSubscriberTest(unittest.TestCase):
+    def _start(self, respond, **kwargs):
+        server = _EventServer(respond)
+        self.addCleanup(server.stop)
+        events = []
+        subscriber = LiveEventSubscriber(
+            server.endpoint, on_event=lambda user_id, event: events.append((user_id, event)),
+            read_timeout=5, rebuild_delay=0.1, **kwargs
+        )
+        self.addCleanup(subscriber.close)
+        return server, subscriber, events
+
+    def test_sse_delivery(self):
+        def respond(handler, index):
+            handler.send_stream([
+                ": 하트비트", "id: 1", 'data: {"user_id": "alice", "is_live": true}', "",
+                'data: {"user_id": "mallory", "is_live": true}', "",
+            ], hold=3)
+
+        server, subscriber, events = self._start(respond)
+        subscriber.subscribe("alice")
+        self.assertTrue(_wait_for(lambda: events))
+        self.assertEqual(events, [("alice", {"user_id": "alice", "is_live": True})])
+        self.assertEqual(server.requests[0][0], ["alice"])
+
+    def test_ndjson_delivery(self):
+        def respond(handler, index):
+            handler.send_stream(
+                ['{"user_id": "alice", "is_live": false}', "not json", '{"user_id": "bob", "is_live": true}'],
+                hold=3, content_type="application/x-ndjson"
+            )
+
+        _, subscriber, events = self._start(respond)
+        subscriber.subscribe_many(["alice", "bob"])
+        self.assertTrue(_wait_for(lambda: len(events) == 2))
+        self.assertEqual(sorted(user_id for user_id, _ in events), ["alice", "bob"])
+        self.assertFalse(dict(events)["alice"]["is_live"])
+
+    def test_last_event_id_sent_on_reconnect(self):
+        def respond(handler, index):
+            # 첫 연결은 이벤트 하나를 보내고 끊김
+            handler.send_stream(["id: 41", 'data: {"user_id": "alice", "is_live": true}', ""],
+                                hold=0 if index == 0 else 3)
+
+        server, subscriber, events = self._start(respond)
+        subscriber.subscribe("alice")
+        self.assertTrue(_wait_for(lambda: len(server.requests) >= 2))
+        self.assertIsNone(server.requests[0][1])
+        self.assertEqual(server.requests[1][1], "41")
+
+    def test_backoff_after_failures(self):
+        def respond(handler, index):
+            handler.send_error(503)
+
+        server, subscriber, _ = self._start(respond)
+        subscriber.subscribe_many(["alice"])
+        time.sleep(3.5)
+        # 1초, 2초 간격으로 재시도 (바로 다시 연결하지 않음)
+        times = [at for _, _, at in server.requests]
+        self.assertEqual(len(times), 3)
+        self.assertGreaterEqual(times[1] - times[0], 0.9)
+        self.assertGreaterEqual(times[2] - times[1], 1.9)
+
+    def test_backoff_after_dropped_connection(self):
+        def respond(handler, index):
+            handler.send_stream([], hold=0 if index == 0 else 3)
+
+        server, subscriber, _ = self._start(respond)
+        subscriber.subscribe("alice")
+        self.assertTrue(_wait_for(lambda: len(server.requests) >= 2))
+        self.assertGreaterEqual(server.requests[1][2] - server.requests[0][2], 0.9)
+
+    def test_subscriptions_batched_into_one_connection(self):
+        server, subscriber, _ = self._start(lambda handler, index: handler.send_stream([], hold=5), batch_size=3)
+        for user_id in ("a", "b", "c", "d"):
+            subscriber.subscribe(user_id)
+        self.assertTrue(_wait_for(lambda: subscriber.connected_count() == 2))
+        time.sleep(0.3)
+        self.assertEqual(sorted(channels for channels, _, _ in server.requests), [["a", "b", "c"], ["d"]])
+
+    def test_unsubscribe_keeps_connection(self):
+        def respond(handler, index):
+            time.sleep(0.3)
+            handler.send_stream(['data: {"user_id": "a", "is_live": true}',
+                                 'data: {"user_id": "b", "is_live": true}'], hold=5)
+
+        server, subscriber, events = self._start(respond)
+        subscriber.subscribe_many(["a", "b"])
+        subscriber.unsubscribe("b")
+        self.assertTrue(_wait_for(lambda: events))
+        time.sleep(0.2)
+        self.assertEqual([user_id for user_id, _ in events], ["a"])
+        subscriber.subscribe("b")
+        time.sleep(0.3)
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(subscriber.channels, {"a", "b"})
+
+    def test_add_channel_replaces_after_new_connection_opens(self):
+        server, subscriber, _ = self._start(lambda handler, index: handler.send_stream(["id: 5"], hold=5))
+        subscriber.subscribe_many(["a"])
+        self.assertTrue(_wait_for(lambda: subscriber.connected_count() == 1))
+        first = subscriber.connections[0]
+        subscriber.subscribe_many(["b", "c"])
+        self.assertTrue(_wait_for(lambda: first._stop_event.is_set()))
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(server.requests[1][0], ["a", "b", "c"])
+        self.assertEqual(server.requests[1][1], "5")
+        self.assertTrue(_wait_for(lambda: subscriber.connected_count() == 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
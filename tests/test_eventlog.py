@@ -0,0 +1,137 @@
+"""구조화 로그 테스트 (기록, 회전/압축, 블록 색인 검색)"""
+
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from contextlib import closing
+from pathlib import Path
+
+from src.eventlog import EventLog, EventLogReader
+
+
+class EventLogTest(unittest.TestCase):
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.directory = Path(temp.name) / "logs"
+
+    def _open(self, **kwargs) -> EventLog:
+        log = EventLog(str(self.directory), flush_interval=0.05, **kwargs)
+        self.addCleanup(log.close)
+        return log
+
+    def _index_counts(self, log: EventLog) -> tuple:
+        with closing(log._connect()) as conn:
+            return tuple(
+                conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("segments", "blocks", "block_channels")
+            )
+
+    def test_write_and_search_current(self):
+        log = self._open()
+        log.write("감시 시작", channel="alice")
+        log.write("녹화 실패", level="error", channel="bob", source="recorder", code=1)
+        log.flush()
+
+        records = log.search()
+        self.assertEqual([record["msg"] for record in records], ["녹화 실패", "감시 시작"])
+        self.assertEqual((records[0]["source"], records[0]["code"]), ("recorder", 1))
+        self.assertEqual([record["msg"] for record in log.search(channel="alice")], ["감시 시작"])
+        self.assertEqual([record["msg"] for record in log.search(level="warning")], ["녹화 실패"])
+        self.assertEqual(log.search(text="없는 메시지"), [])
+
+    def test_rotation_compresses_and_indexes_blocks(self):
+        log = self._open(max_segment_mb=0.002, block_lines=10)
+        for i in range(200):
+            log.write(f"line {i}", level="error" if i == 150 else "info", channel=f"ch{i % 3}")
+        log.flush()
+        log._compress_pending()
+
+        segments = sorted(self.directory.glob("segment-*.jsonl.gz"))
+        self.assertTrue(segments)
+        self.assertEqual(list(self.directory.glob("pending-*.jsonl")), [])
+        _, blocks, channels = self._index_counts(log)
+        self.assertGreater(blocks, len(segments))
+        self.assertGreater(channels, blocks)
+
+        # 압축 파일 + 현재 파일을 합쳐 모든 줄이 최신순으로 나옴
+        records = log.search(limit=1000)
+        self.assertEqual([record["msg"] for record in records], [f"line {i}" for i in reversed(range(200))])
+        self.assertEqual([record["msg"] for record in log.search(level="error")], ["line 150"])
+        self.assertEqual(len(log.search(channel="ch1")), len(range(1, 200, 3)))
+        self.assertEqual([record["msg"] for record in log.search(limit=3)], ["line 199", "line 198", "line 197"])
+
+    def test_search_by_time(self):
+        log = self._open(max_segment_mb=0.001, block_lines=5)
+        now = time.time()
+        for i in range(60):
+            log._queue.put({"ts": now - 3600 + i * 60, "level": "info", "channel": "alice",
+                            "source": "app", "msg": f"minute {i}"})
+        log.flush()
+        log._compress_pending()
+
+        records = log.search(since=now - 3600 + 10 * 60, until=now - 3600 + 12 * 60)
+        self.assertEqual([record["msg"] for record in records], ["minute 12", "minute 11", "minute 10"])
+
+    def test_recompress_leaves_no_stale_index(self):
+        log = self._open(max_segment_mb=1, block_lines=2)
+        pending = self.directory / "pending-000007.jsonl"
+        pending.write_text("".join(
+            json.dumps({"ts": i, "level": "info", "channel": "alice", "msg": f"m{i}"}) + "\n"
+            for i in range(1, 6)
+        ), encoding="utf-8")
+        backup = self.directory.parent / "pending.bak"
+        shutil.copy(pending, backup)
+
+        log._compress_pending()
+        first = self._index_counts(log)
+        # 색인은 썼지만 원본을 지우지 못한 채 종료된 경우 - 다음 실행에서 다시 압축
+        shutil.copy(backup, pending)
+        log._compress_pending()
+
+        self.assertEqual(first, (1, 3, 3))
+        self.assertEqual(self._index_counts(log), first)
+        self.assertEqual(len(log.search(channel="alice")), 5)
+
+    def test_trim_removes_old_segments(self):
+        log = self._open(max_segment_mb=0.001, keep_segments=2, block_lines=5)
+        # 회전은 묶음을 쓸 때마다 확인하므로 여러 번 나눠서 기록
+        for batch in range(4):
+            for i in range(20):
+                log.write(f"line {batch}-{i}", channel="alice")
+            log.flush()
+        log._compress_pending()
+
+        self.assertEqual(len(list(self.directory.glob("segment-*.jsonl.gz"))), 2)
+        segments, blocks, channels = self._index_counts(log)
+        self.assertEqual(segments, 2)
+        with closing(log._connect()) as conn:
+            orphans = conn.execute(
+                "SELECT COUNT(*) FROM blocks WHERE segment_id NOT IN (SELECT id FROM segments)"
+            ).fetchone()[0]
+        self.assertEqual(orphans, 0)
+        self.assertEqual(channels, blocks)
+
+    def test_reader_does_not_write(self):
+        reader = EventLogReader(str(self.directory))
+        self.assertEqual(reader.search(), [])
+        self.assertFalse(self.directory.exists())
+
+        log = self._open(max_segment_mb=0.001, block_lines=5)
+        for i in range(100):
+            log.write(f"line {i}", channel="alice")
+        log.flush()
+        log._compress_pending()
+        log.write("not compressed")
+        log.flush()
+
+        records = reader.search(limit=1000)
+        self.assertEqual(records[0]["msg"], "not compressed")
+        self.assertEqual(len(records), 101)
+        self.assertEqual(len(reader.search(channel="alice", limit=1000)), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""단일 다운로드 다중 출력 테스트 (표준 입력을 그대로 복사하는 가짜 ffmpeg 사용)"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.fanout import FanoutPipeline, build_output_base, resolve_outputs
+from src.process_manager import process_manager
+
+
+# 마지막 인자(파일 또는 pipe:1)에 표준 입력을 복사, "-slow"가 있으면 천천히 읽음
+_FAKE_FFMPEG = textwrap.dedent("""\
+    import sys, time
+    args = sys.argv[1:]
+    target = args[-1]
+    out = sys.stdout.buffer if target == "pipe:1" else open(target, "wb")
+    while True:
+        chunk = sys.stdin.buffer.read1(65536)
+        if not chunk:
+            break
+        if "-slow" in args:
+            time.sleep(0.05)
+        out.write(chunk)
+    out.close()
+""")
+
+
+def _ts_data(packets: int) -> bytes:
+    return b"".join(bytes([0x47, 0x01, 0x00, 0x10 | (i & 0x0F)]) + bytes([i & 0xFF]) * 184 for i in range(packets))
+
+
+@unittest.skipIf(sys.platform == "win32", "POSIX 실행 스크립트 사용")
+class FanoutPipelineTest(unittest.TestCase):
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        self.ffmpeg = self.root / "ffmpeg"
+        self.ffmpeg.write_text(f"#!{sys.executable}\n{_FAKE_FFMPEG}", encoding="utf-8")
+        self.ffmpeg.chmod(0o755)
+        self.output_base = self.root / "user" / "[20240101]_t(1)" / "[20240101]_t(1)"
+
+    def _source(self, data: bytes) -> subprocess.Popen:
+        data_path = self.root / "source.bin"
+        data_path.write_bytes(data)
+        # yt-dlp 대신 파일 내용을 표준 출력으로 내보내는 프로세스
+        return subprocess.Popen(
+            [sys.executable, "-c", f"import sys, shutil; shutil.copyfileobj(open({str(data_path)!r}, 'rb'), sys.stdout.buffer)"],
+            stdout=subprocess.PIPE
+        )
+
+    def _pipeline(self, data: bytes, outputs: list, **kwargs) -> FanoutPipeline:
+        source = self._source(data)
+        self.addCleanup(source.stdout.close)
+        self.addCleanup(source.wait)
+        return FanoutPipeline(source, str(self.ffmpeg), self.output_base, outputs, **kwargs)
+
+    def test_every_output_gets_one_copy(self):
+        data = os.urandom(1024 * 1024)
+        pipeline = self._pipeline(data, resolve_outputs(["480p", "audio"]))
+        dropped = pipeline.finish(timeout=10)
+        self.assertEqual(dropped, {"original": 0, "480p": 0, "audio": 0})
+        directory = self.output_base.parent
+        self.assertEqual((directory / "[20240101]_t(1).mp4").read_bytes(), data)
+        self.assertEqual((directory / "[20240101]_t(1).480p.mp4").read_bytes(), data)
+        self.assertEqual((directory / "[20240101]_t(1).audio.m4a").read_bytes(), data)
+        self.assertEqual(process_manager.live_count("encode"), 0)
+
+    def test_manifest_written_from_original(self):
+        data = _ts_data(5000)
+        pipeline = self._pipeline(data, [], manifest=True)
+        pipeline.finish(timeout=10)
+        self.assertEqual(pipeline.original_path.read_bytes(), data)
+        self.assertTrue(pipeline.integrity["complete"])
+        self.assertEqual(pipeline.integrity["sha256"], hashlib.sha256(data).hexdigest())
+        self.assertEqual(pipeline.integrity["stream"]["packets"], 5000)
+        saved = json.loads(Path(str(pipeline.original_path) + ".manifest.json").read_text(encoding="utf-8"))
+        self.assertEqual(saved["bytes"], len(data))
+
+    def test_slow_variant_drops_without_delaying_original(self):
+        data = os.urandom(4 * 1024 * 1024)
+        outputs = [{"name": "slow", "ext": "ts", "args": ["-slow"]}]
+        pipeline = self._pipeline(data, outputs, max_buffer_mb=0)
+        dropped = pipeline.finish(timeout=30)
+        self.assertEqual(pipeline.original_path.read_bytes(), data)
+        self.assertEqual(dropped["original"], 0)
+        self.assertGreater(dropped["slow"], 0)
+
+    def test_failed_spawn_tears_down_started_sinks(self):
+        source = self._source(b"")
+        self.addCleanup(source.stdout.close)
+        self.addCleanup(source.wait)
+        real_open = FanoutPipeline._open_sink
+        started = []
+
+        def open_sink(*args, **kwargs):
+            if started:
+                raise OSError("ffmpeg 실행 실패")
+            sink = real_open(*args, **kwargs)
+            started.append(sink)
+            return sink
+
+        with mock.patch.object(FanoutPipeline, "_open_sink", side_effect=open_sink):
+            with self.assertRaises(OSError):
+                FanoutPipeline(source, str(self.ffmpeg), self.output_base, resolve_outputs(["480p"]))
+        self.assertIsNotNone(started[0].process.poll())
+        self.assertNotIn(started[0].process.pid, process_manager.children)
+
+
+class OutputConfigTest(unittest.TestCase):
+    def test_resolve_outputs(self):
+        outputs = resolve_outputs(["audio", "unknown", {"name": "small", "args": ["-s", "320x180"]}, {"name": "x"}])
+        self.assertEqual([output["name"] for output in outputs], ["audio", "small"])
+        self.assertEqual(outputs[1]["ext"], "mp4")
+        self.assertEqual(resolve_outputs(None), [])
+
+    def test_build_output_base_from_info(self):
+        probe = {"info_json": json.dumps({"upload_date": "20240102", "title": 'a/b:c?', "id": 99})}
+        base = build_output_base(Path("/save"), "alice", probe)
+        self.assertEqual(base, Path("/save/alice/[20240102]_a_b_c_(99)/[20240102]_a_b_c_(99)"))
+
+    def test_build_output_base_fallback(self):
+        base = build_output_base(Path("/save"), "alice", {"title": "방송", "movie_id": "7"})
+        self.assertTrue(base.name.endswith("_방송(7)"))
+        self.assertEqual(base.parent.name, base.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
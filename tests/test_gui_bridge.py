@@ -0,0 +1,91 @@
+"""GUI-워커 연결 테스트 (설정 스냅샷 발행, 명령 큐 처리량 제한 / 오류 보고)"""
+
+import io
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr
+from dataclasses import FrozenInstanceError
+
+from src.gui_bridge import CommandQueue, SettingsSnapshot, SettingsStore
+
+
+class SettingsStoreTest(unittest.TestCase):
+    def test_publish_only_on_change(self):
+        store = SettingsStore()
+        first = store.publish(check_interval=30, save_path="rec")
+        self.assertEqual((first.version, first.check_interval, first.save_path), (1, 30, "rec"))
+        self.assertIs(store.publish(check_interval=30), first)
+        second = store.publish(auto_record=True)
+        self.assertEqual((second.version, second.check_interval, second.auto_record), (2, 30, True))
+        self.assertIs(store.current, second)
+
+    def test_snapshot_is_immutable(self):
+        snapshot = SettingsStore().current
+        self.assertEqual(snapshot, SettingsSnapshot())
+        with self.assertRaises(FrozenInstanceError):
+            snapshot.save_path = "other"
+
+    def test_concurrent_publish_keeps_every_version(self):
+        store = SettingsStore()
+
+        def publish(offset):
+            for i in range(200):
+                store.publish(check_interval=offset + i)
+
+        threads = [threading.Thread(target=publish, args=(offset,)) for offset in (0, 1000)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(store.current.version, 400)
+
+
+class CommandQueueTest(unittest.TestCase):
+    def test_runs_in_order_up_to_frame_limit(self):
+        commands = CommandQueue(max_per_frame=3, budget_ms=1000)
+        done = []
+        for i in range(5):
+            commands.put(lambda i=i: done.append(i))
+        self.assertEqual(commands.drain(), 3)
+        self.assertEqual((done, commands.pending()), ([0, 1, 2], 2))
+        self.assertEqual(commands.drain(), 2)
+        self.assertEqual(done, [0, 1, 2, 3, 4])
+        self.assertEqual(commands.drain(), 0)
+
+    def test_time_budget_defers_rest(self):
+        commands = CommandQueue(max_per_frame=100, budget_ms=5)
+        for _ in range(10):
+            commands.put(lambda: time.sleep(0.01))
+        self.assertEqual(commands.drain(), 1)
+        self.assertEqual(commands.pending(), 9)
+
+    def test_error_reported_and_rest_continues(self):
+        errors = []
+        commands = CommandQueue(on_error=lambda error, details: errors.append((error, details)))
+        done = []
+        commands.put(lambda: done.append(1))
+        commands.put(lambda: 1 / 0)
+        commands.put(lambda: done.append(3))
+
+        with redirect_stderr(io.StringIO()) as stderr:
+            self.assertEqual(commands.drain(), 3)
+        self.assertEqual(done, [1, 3])
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0][0], ZeroDivisionError)
+        self.assertIn("ZeroDivisionError", errors[0][1])
+        self.assertEqual(stderr.getvalue(), "")
+
+    def test_error_without_reporter_goes_to_stderr(self):
+        def broken_reporter(error, details):
+            raise RuntimeError("log closed")
+
+        for commands in (CommandQueue(), CommandQueue(on_error=broken_reporter)):
+            commands.put(lambda: 1 / 0)
+            with redirect_stderr(io.StringIO()) as stderr:
+                commands.drain()
+            self.assertIn("ZeroDivisionError", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""확인/방송/녹화 기록 저장소 테스트"""
+
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.history import HistoryStore
+
+
+class HistoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.db_path = Path(temp.name) / "sub" / "history.db"
+        self.store = HistoryStore(str(self.db_path), flush_interval=0.05)
+        self.addCleanup(self.store.close)
+        self.now = datetime.now().replace(microsecond=0)
+
+    def _probe(self, user_id, minutes_ago=0, is_live=False, error=None):
+        status = {"checked_at": self.now - timedelta(minutes=minutes_ago), "is_live": is_live, "title": None}
+        if error:
+            status["error"] = error
+        self.store.record_probe(user_id, status)
+
+    def test_wal_mode(self):
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_writes_are_queued_until_flush(self):
+        self._probe("alice")
+        self.assertTrue(self.store.flush())
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM probes").fetchone()[0], 1)
+
+    def test_batched_writes(self):
+        store = HistoryStore(str(self.db_path), batch_size=10, flush_interval=0.05)
+        self.addCleanup(store.close)
+        for i in range(95):
+            store.record_probe("bob", {"checked_at": self.now, "is_live": False})
+        self.assertTrue(store.flush())
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM probes").fetchone()[0], 95)
+
+    def test_sessions_for(self):
+        self.store.session_started("alice", "1", "첫 방송", self.now - timedelta(days=2))
+        self.store.session_ended("alice", self.now - timedelta(days=2) + timedelta(hours=1))
+        self.store.session_started("alice", "2", "둘째 방송", self.now - timedelta(hours=1))
+        self.store.session_started("alice", "0", "오래된 방송", self.now - timedelta(days=40))
+        self.store.session_started("bob", "3", "다른 채널", self.now)
+        self.store.flush()
+        sessions = self.store.sessions_for("alice", days=30)
+        self.assertEqual([session["movie_id"] for session in sessions], ["2", "1"])
+        self.assertIsNone(sessions[0]["ended_at"])
+        self.assertIsNotNone(sessions[1]["ended_at"])
+
+    def test_recordings_for(self):
+        self.store.recording_started("alice", "방송", self.now)
+        self.store.recording_finished("alice", self.now + timedelta(hours=1), "/save/a.mp4", 1234)
+        self.store.flush()
+        recording, = self.store.recordings_for("alice")
+        self.assertEqual((recording["file_path"], recording["bytes"], recording["error"]), ("/save/a.mp4", 1234, None))
+
+    def test_error_rate_by_channel(self):
+        for i in range(4):
+            self._probe("alice", error="실패" if i == 0 else None)
+        self._probe("bob", error="실패")
+        self._probe("bob")
+        self.store.flush()
+        rates = {row["user_id"]: row for row in self.store.error_rate_by_channel()}
+        self.assertEqual((rates["alice"]["probes"], rates["alice"]["errors"]), (4, 1))
+        self.assertAlmostEqual(rates["alice"]["error_rate"], 0.25)
+        self.assertEqual([row["user_id"] for row in self.store.error_rate_by_channel()], ["bob", "alice"])
+
+    def test_recorded_movie_ids(self):
+        started = self.now - timedelta(hours=3)
+        self.store.session_started("alice", "10", "녹화한 방송", started)
+        self.store.recording_started("alice", "녹화한 방송", started + timedelta(seconds=5))
+        self.store.recording_finished("alice", started + timedelta(hours=1), "/save/10.mp4", 1)
+        self.store.session_ended("alice", started + timedelta(hours=1))
+        # 녹화 없이 끝난 방송 / 파일 없이 실패한 녹화
+        self.store.session_started("alice", "11", "놓친 방송", self.now - timedelta(hours=1))
+        self.store.recording_started("alice", "놓친 방송", self.now - timedelta(minutes=50))
+        self.store.recording_finished("alice", self.now - timedelta(minutes=49), error="실패")
+        self.store.flush()
+        self.assertEqual(self.store.recorded_movie_ids("alice"), {"10"})
+
+    def test_session_starts_and_last_live(self):
+        self.store.session_started("alice", "1", "방송", self.now - timedelta(days=1))
+        self._probe("alice", minutes_ago=30, is_live=True)
+        self._probe("alice", minutes_ago=10, is_live=True)
+        self._probe("alice", minutes_ago=5, is_live=False)
+        self.store.flush()
+        self.assertEqual(self.store.session_starts()["alice"], [(self.now - timedelta(days=1), None)])
+        self.assertEqual(
+            self.store.last_live_probes(self.now - timedelta(hours=1)),
+            {"alice": self.now - timedelta(minutes=10)}
+        )
+
+    def test_compact_keeps_open_sessions(self):
+        old = self.now - timedelta(days=200)
+        self._probe("alice", minutes_ago=200 * 24 * 60)
+        self._probe("alice")
+        self.store.session_started("alice", "1", "끝난 방송", old)
+        self.store.session_ended("alice", old + timedelta(hours=1))
+        self.store.session_started("bob", "2", "진행 중인 방송", old)
+        self.store.flush()
+        self.assertEqual(self.store.compact(retention_days=180, vacuum=True), 2)
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM probes").fetchone()[0], 1)
+            self.assertEqual(conn.execute("SELECT user_id FROM sessions").fetchall(), [("bob",)])
+
+    def test_close_flushes_pending_writes(self):
+        store = HistoryStore(str(self.db_path), flush_interval=5)
+        for i in range(10):
+            store.record_probe("carol", {"checked_at": self.now, "is_live": False})
+        store.close()
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM probes WHERE user_id = 'carol'").fetchone()[0], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
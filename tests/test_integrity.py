@@ -0,0 +1,141 @@
+"""무결성 목록 / MPEG-TS 검사 테스트"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.integrity import ManifestWriter, TransportStreamMonitor, verify_manifest
+
+
+def _packet(pid: int, counter: int, pcr: float = None, discontinuity: bool = False) -> bytes:
+    """페이로드가 있는 TS 패킷 (pcr이 있으면 적응 필드에 PCR 기록)"""
+    header = bytes([0x47, (pid >> 8) & 0x1F, pid & 0xFF])
+    if pcr is None:
+        return header + bytes([0x10 | counter]) + b"\xff" * 184
+    base = int(pcr * 90000)
+    adaptation = bytes([
+        7, 0x10 | (0x80 if discontinuity else 0),
+        (base >> 25) & 0xFF, (base >> 17) & 0xFF, (base >> 9) & 0xFF, (base >> 1) & 0xFF,
+        ((base & 1) << 7) | 0x7E, 0,
+    ])
+    return header + bytes([0x30 | counter]) + adaptation + b"\xff" * (184 - len(adaptation))
+
+
+def _stream(pcrs: list[float], pid: int = 0x100) -> bytes:
+    return b"".join(_packet(pid, index & 0x0F, pcr) for index, pcr in enumerate(pcrs))
+
+
+class TransportStreamMonitorTest(unittest.TestCase):
+    def test_clean_stream(self):
+        monitor = TransportStreamMonitor()
+        monitor.feed(_stream([i * 0.1 for i in range(50)]))
+        summary = monitor.summary()
+        self.assertEqual(summary["format"], "mpegts")
+        self.assertEqual(summary["packets"], 50)
+        self.assertEqual(summary["continuity_errors"], 0)
+        self.assertEqual(summary["event_count"], 0)
+        self.assertAlmostEqual(summary["duration"], 4.9, places=2)
+
+    def test_chunk_boundaries(self):
+        data = _stream([i * 0.1 for i in range(50)] + [10.0])
+        whole = TransportStreamMonitor()
+        whole.feed(data)
+        split = TransportStreamMonitor()
+        for start in range(0, len(data), 100):
+            split.feed(data[start:start + 100])
+        self.assertEqual(whole.summary()["packets"], split.summary()["packets"])
+        self.assertEqual(whole.summary()["gap_seconds"], split.summary()["gap_seconds"])
+
+    def test_continuity_error(self):
+        monitor = TransportStreamMonitor()
+        monitor.feed(_packet(0x100, 0) + _packet(0x100, 1) + _packet(0x100, 3))
+        self.assertEqual(monitor.cc_errors, 1)
+
+    def test_repeated_counter_allowed(self):
+        monitor = TransportStreamMonitor()
+        monitor.feed(_packet(0x100, 0) + _packet(0x100, 0) + _packet(0x100, 1) + _packet(0x100, 15))
+        self.assertEqual(monitor.cc_errors, 1)
+
+    def test_counter_wraps(self):
+        monitor = TransportStreamMonitor()
+        monitor.feed(b"".join(_packet(0x100, i & 0x0F) for i in range(40)))
+        self.assertEqual(monitor.cc_errors, 0)
+
+    def test_null_packets_ignored(self):
+        monitor = TransportStreamMonitor()
+        monitor.feed(_packet(0x1FFF, 5) + _packet(0x1FFF, 9))
+        self.assertEqual(monitor.cc_errors, 0)
+
+    def test_pcr_gap_and_backward(self):
+        monitor = TransportStreamMonitor(gap_threshold=1.0)
+        monitor.feed(_stream([0.0, 0.5, 3.0, 2.0]))
+        kinds = [event["kind"] for event in monitor.events]
+        self.assertEqual(kinds, ["gap", "backward"])
+        self.assertAlmostEqual(monitor.gap_seconds, 2.5, places=2)
+
+    def test_discontinuity_flag(self):
+        monitor = TransportStreamMonitor()
+        monitor.feed(_packet(0x100, 0, 100.0) + _packet(0x100, 7, 5.0, discontinuity=True))
+        self.assertEqual([event["kind"] for event in monitor.events], ["discontinuity"])
+        self.assertEqual(monitor.cc_errors, 0)
+
+    def test_pcr_wraparound(self):
+        wrap = (2 ** 33) / 90000
+        monitor = TransportStreamMonitor()
+        monitor.feed(_stream([wrap - 0.2, 0.1]))
+        self.assertEqual(monitor.event_count, 0)
+        self.assertAlmostEqual(monitor.duration, 0.3, places=2)
+
+    def test_sync_loss(self):
+        monitor = TransportStreamMonitor()
+        monitor.feed(_packet(0x100, 0) + b"\x00" * 10 + _packet(0x100, 1))
+        self.assertEqual(monitor.packets, 2)
+        self.assertGreater(monitor.sync_losses, 0)
+
+
+class VerifyManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.media = Path(self.temp.name) / "video.ts"
+        self.data = bytes(range(256)) * 20  # 5120 바이트 -> 1024 바이트 구간 5개
+        writer = ManifestWriter(self.media, segment_size=1024)
+        for start in range(0, len(self.data), 700):
+            writer.update(self.data[start:start + 700])
+        writer.finish()
+        self.media.write_bytes(self.data)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_intact(self):
+        result = verify_manifest(self.media)
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["bytes"], len(self.data))
+        self.assertEqual(result["bad_segments"], [])
+
+    def test_manifest_path_accepted(self):
+        self.assertTrue(verify_manifest(str(self.media) + ".manifest.json")["ok"])
+
+    def test_corrupted_segment(self):
+        corrupted = bytearray(self.data)
+        corrupted[1500] ^= 0xFF
+        self.media.write_bytes(bytes(corrupted))
+        result = verify_manifest(self.media)
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["bad_segments"], [1])
+        self.assertFalse(result["sha256_match"])
+
+    def test_truncated(self):
+        self.media.write_bytes(self.data[:3000])
+        result = verify_manifest(self.media)
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["bytes"], 3000)
+
+    def test_progress(self):
+        calls = []
+        verify_manifest(self.media, progress=lambda done, total: calls.append((done, total)))
+        self.assertEqual(calls[-1], (5, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
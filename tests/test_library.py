@@ -0,0 +1,193 @@
+"""녹화 파일 색인 테스트 (경로 해석, 증분 재검사, 조회, 사용량 집계)"""
+
+import os
+import sqlite3
+import struct
+import tempfile
+import unittest
+from contextlib import closing
+from pathlib import Path
+
+from src.library import RecordingLibrary, mp4_duration, parse_recording_path
+
+
+def _box(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def _mp4(seconds: int, timescale: int = 1000, version: int = 0, moov_last: bool = False) -> bytes:
+    """재생 시간만 담은 최소 mp4 (ftyp + mdat + moov/mvhd)"""
+    if version == 1:
+        mvhd = bytes([1, 0, 0, 0]) + struct.pack(">QQIQ", 0, 0, timescale, seconds * timescale)
+    else:
+        mvhd = bytes([0, 0, 0, 0]) + struct.pack(">IIII", 0, 0, timescale, seconds * timescale)
+    moov = _box(b"moov", _box(b"mvhd", mvhd + bytes(80)))
+    boxes = [_box(b"ftyp", b"isom" + bytes(4)), _box(b"mdat", bytes(64))]
+    boxes.insert(len(boxes) if moov_last else 1, moov)
+    return b"".join(boxes)
+
+
+class ParseRecordingPathTest(unittest.TestCase):
+    def test_original(self):
+        info = parse_recording_path(Path("rec/channel/[20240102]_제목(abc)/[20240102]_제목(abc).mp4"))
+        self.assertEqual(info, {"user_id": "channel", "movie_id": "abc", "title": "제목",
+                                "date": "2024-01-02", "variant": "", "part": 1})
+
+    def test_variant_and_part(self):
+        session = "[20240102]_제목 (1)(abc)"
+        info = parse_recording_path(Path(f"rec/channel/{session}/{session}.part3.480p.mp4"))
+        self.assertEqual((info["title"], info["movie_id"]), ("제목 (1)", "abc"))
+        self.assertEqual((info["part"], info["variant"]), (3, "480p"))
+        info = parse_recording_path(Path(f"rec/channel/{session}/{session}.audio.m4a"))
+        self.assertEqual((info["part"], info["variant"]), (1, "audio"))
+
+    def test_unknown_layout(self):
+        info = parse_recording_path(Path("rec/channel/misc/video.mp4"))
+        self.assertEqual((info["user_id"], info["title"], info["movie_id"], info["date"]),
+                         ("channel", "misc", None, None))
+
+
+class Mp4DurationTest(unittest.TestCase):
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+
+    def _write(self, data: bytes) -> Path:
+        path = self.root / "video.mp4"
+        path.write_bytes(data)
+        return path
+
+    def test_moov_before_and_after_mdat(self):
+        self.assertEqual(mp4_duration(self._write(_mp4(90))), 90)
+        self.assertEqual(mp4_duration(self._write(_mp4(125, moov_last=True))), 125)
+
+    def test_version1_header(self):
+        self.assertEqual(mp4_duration(self._write(_mp4(3600, timescale=90000, version=1))), 3600)
+
+    def test_unreadable(self):
+        self.assertIsNone(mp4_duration(self._write(_mp4(0))))
+        self.assertIsNone(mp4_duration(self._write(b"not an mp4 file")))
+        self.assertIsNone(mp4_duration(self.root / "missing.mp4"))
+
+
+class RecordingLibraryTest(unittest.TestCase):
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name) / "rec"
+        self.library = RecordingLibrary(str(Path(temp.name) / "library.db"))
+
+    def _record(self, user_id: str, date: str, title: str, movie_id: str, suffix: str = ".mp4",
+                data: bytes = b"x" * 100) -> Path:
+        session = f"[{date}]_{title}({movie_id})"
+        path = self.root / user_id / session / f"{session}{suffix}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return path
+
+    def test_add_indexes_whole_directory(self):
+        path = self._record("alice", "20240101", "첫 방송", "m1", data=_mp4(60))
+        self._record("alice", "20240101", "첫 방송", "m1", suffix=".audio.m4a")
+        self.assertTrue(self.library.add(str(path)))
+        rows = {row["variant"]: row for row in self.library.query(user_id="alice")}
+        self.assertEqual(set(rows), {"", "audio"})
+        self.assertEqual(rows[""]["duration"], 60)
+        self.assertEqual(self.library.movie_ids("alice"), {"m1"})
+
+    def test_add_uses_recording_time_fallback(self):
+        path = self._record("alice", "20240101", "방송", "m1", suffix=".ts")
+        self.library.add(str(path), duration=42.0)
+        self.assertEqual(self.library.query()[0]["duration"], 42.0)
+        self.assertFalse(self.library.add(str(self.root / "missing" / "dir" / "file.mp4")))
+
+    def test_reconcile_incremental_and_full(self):
+        first = self._record("alice", "20240101", "하나", "m1")
+        self._record("alice", "20240102", "둘", "m2")
+        self._record("bob", "20240103", "셋", "m3")
+        result = self.library.reconcile(str(self.root))
+        self.assertEqual((result["scanned"], result["added"]), (3, 3))
+
+        # 변경 없으면 아무 디렉토리도 다시 읽지 않음
+        self.assertEqual(self.library.reconcile(str(self.root))["scanned"], 0)
+
+        # 방송 디렉토리 안에서만 지운 파일은 채널 mtime이 그대로라 full 검사에서만 보임
+        first.unlink()
+        self.assertEqual(self.library.reconcile(str(self.root))["removed"], 0)
+        result = self.library.reconcile(str(self.root), full=True)
+        self.assertEqual((result["scanned"], result["removed"]), (1, 1))
+        self.assertEqual(self.library.movie_ids("alice"), {"m2"})
+
+    def test_reconcile_removed_channel(self):
+        path = self._record("bob", "20240103", "셋", "m3")
+        self.library.reconcile(str(self.root))
+        path.unlink()
+        path.parent.rmdir()
+        path.parent.parent.rmdir()
+        self.assertEqual(self.library.reconcile(str(self.root))["removed"], 1)
+        self.assertEqual(self.library.query(), [])
+
+    def test_query_filters(self):
+        self._record("alice", "20240101", "게임 방송", "m1")
+        self._record("alice", "20240105", "노래 100%", "m2")
+        self._record("alice", "20240105", "노래 100%", "m2", suffix=".480p.mp4")
+        self._record("bob", "20240110", "게임", "m3")
+        self.library.reconcile(str(self.root))
+
+        self.assertEqual(len(self.library.query()), 4)
+        self.assertEqual({row["movie_id"] for row in self.library.query(text="게임")}, {"m1", "m3"})
+        self.assertEqual({row["movie_id"] for row in self.library.query(text="100%")}, {"m2"})
+        self.assertEqual(self.library.query(text="0_%"), [])
+        self.assertEqual({row["movie_id"] for row in self.library.query(since="2024-01-02", until="2024-01-05")},
+                         {"m2"})
+        self.assertEqual(len(self.library.query(user_id="alice", include_variants=False)), 2)
+        self.assertEqual([row["date"] for row in self.library.query(limit=2)], ["2024-01-10", "2024-01-05"])
+
+    def test_sessions_group_parts(self):
+        self._record("alice", "20240101", "방송", "m1", data=b"a" * 10)
+        self._record("alice", "20240101", "방송", "m1", suffix=".part2.mp4", data=b"b" * 20)
+        self._record("alice", "20240102", "다음", "m2", data=b"c" * 5)
+        self.library.reconcile(str(self.root))
+
+        sessions = {session["movie_id"]: session for session in self.library.sessions()}
+        self.assertEqual((sessions["m1"]["parts"], sessions["m1"]["bytes"], len(sessions["m1"]["files"])),
+                         (2, 30, 2))
+        self.assertEqual(sessions["m2"]["parts"], 1)
+
+    def test_usage_follows_changes(self):
+        path = self._record("alice", "20240101", "방송", "m1", data=b"a" * 10)
+        self._record("bob", "20240101", "방송", "m2", data=b"b" * 7)
+        self.library.reconcile(str(self.root))
+        self.assertEqual(self.library.usage(), {"alice": (1, 10), "bob": (1, 7)})
+
+        path.write_bytes(b"a" * 50)
+        self.library.add(str(path))
+        self.assertEqual(self.library.usage()["alice"], (1, 50))
+
+        self.library.remove([str(path)])
+        self.assertEqual(self.library.usage(), {"bob": (1, 7)})
+        by_channel = self.library.usage_by_channel()
+        self.assertEqual([(row["user_id"], row["files"]) for row in by_channel], [("bob", 1)])
+
+    def test_migrates_old_index(self):
+        db_path = self.library.db_path.with_name("old.db")
+        session = "[20240101]_방송(m1)"
+        old_path = str(self.root / "alice" / session / f"{session}.part2.mp4")
+        with closing(sqlite3.connect(db_path)) as conn, conn:
+            # 트리거와 part 열이 없던 이전 형식
+            conn.executescript("""
+                CREATE TABLE files (path TEXT PRIMARY KEY, user_id TEXT NOT NULL, movie_id TEXT, title TEXT,
+                    date TEXT, variant TEXT NOT NULL DEFAULT '', bytes INTEGER NOT NULL, duration REAL,
+                    mtime REAL NOT NULL);
+            """)
+            conn.execute("INSERT INTO files VALUES (?, 'alice', 'm1', '방송', '2024-01-01', 'part2', 30, NULL, 0)",
+                         (old_path,))
+
+        library = RecordingLibrary(str(db_path))
+        row = library.query()[0]
+        self.assertEqual((row["part"], row["variant"]), (2, ""))
+        self.assertEqual(library.usage(), {"alice": (1, 30)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""하위 프로세스 수명 관리 테스트 (타임아웃 종료, 프로세스 한도, 회수)"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.process_manager import ProcessBudgetExceeded, ProcessManager
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # 회수되지 않은 좀비는 종료된 것으로 봄
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+            return f.read().split(")")[-1].split()[0] != "Z"
+    except OSError:
+        return True
+
+
+def _sleeper(seconds: float = 30) -> list:
+    return [sys.executable, "-c", f"import time; time.sleep({seconds})"]
+
+
+@unittest.skipIf(sys.platform == "win32", "프로세스 그룹 / 시그널은 POSIX 전용")
+class ProcessManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.manager = ProcessManager(budget=2, budget_wait=0.5)
+        self.addCleanup(self._kill_all)
+
+    def _kill_all(self):
+        for _, process in list(self.manager.children.values()):
+            self.manager.kill_tree(process)
+            if isinstance(process, subprocess.Popen):
+                process.wait()
+
+    def test_timeout_kills_process_group(self):
+        with tempfile.TemporaryDirectory() as temp:
+            pid_file = Path(temp) / "child.pid"
+            # 손자 프로세스를 남기는 확인 프로세스 (yt-dlp가 ffmpeg 등을 실행하는 경우)
+            script = (
+                "import subprocess, sys, time; "
+                f"child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); "
+                f"open({str(pid_file)!r}, 'w').write(str(child.pid)); time.sleep(30)"
+            )
+
+            async def run():
+                process = await self.manager.spawn_async("probe", [sys.executable, "-c", script],
+                                                         stdout=asyncio.subprocess.PIPE)
+                while not pid_file.exists() or not pid_file.read_text():
+                    await asyncio.sleep(0.05)
+                with self.assertRaises(asyncio.TimeoutError):
+                    await self.manager.communicate_async(process, timeout=0.3)
+                return process
+
+            process = asyncio.run(run())
+            grandchild = int(pid_file.read_text())
+            self.assertIsNotNone(process.returncode)
+            deadline = time.monotonic() + 5
+            while _alive(grandchild) and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertFalse(_alive(grandchild))
+            self.assertEqual(self.manager.live_count(), 0)
+
+    def test_completed_probe_unregistered(self):
+        async def run():
+            process = await self.manager.spawn_async("probe", [sys.executable, "-c", "print('ok')"],
+                                                     stdout=asyncio.subprocess.PIPE)
+            return await self.manager.communicate_async(process, timeout=10)
+
+        stdout, _ = asyncio.run(run())
+        self.assertEqual(stdout.strip(), b"ok")
+        self.assertEqual(self.manager.live_count(), 0)
+
+    def test_budget_blocks_probes(self):
+        self.manager.popen("record", _sleeper())
+        self.manager.popen("record", _sleeper())
+        self.assertEqual(self.manager.counts(), {"record": 2})
+
+        async def spawn():
+            return await self.manager.spawn_async("probe", _sleeper(0))
+
+        started = time.monotonic()
+        with self.assertRaises(ProcessBudgetExceeded):
+            asyncio.run(spawn())
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+        with self.assertRaises(ProcessBudgetExceeded):
+            self.manager.wait_room(timeout=0.1)
+
+    def test_recordings_run_over_budget(self):
+        for _ in range(3):
+            self.manager.popen("record", _sleeper())
+        self.assertEqual(self.manager.live_count("record"), 3)
+
+    def test_room_after_reap(self):
+        process = self.manager.popen("record", _sleeper(0.1))
+        self.manager.popen("record", _sleeper())
+        process.wait()
+        self.manager.wait_room(timeout=1)
+        self.assertEqual(self.manager.live_count(), 1)
+
+    def test_terminate_escalates_to_kill(self):
+        # SIGINT를 무시하는 프로세스는 timeout 뒤 강제 종료
+        process = self.manager.popen("record", [
+            sys.executable, "-c",
+            "import signal, time; signal.signal(signal.SIGINT, signal.SIG_IGN); print('ready', flush=True); time.sleep(30)"
+        ], stdout=subprocess.PIPE)
+        process.stdout.readline()
+        process.stdout.close()
+        started = time.monotonic()
+        self.manager.terminate(process, timeout=0.3)
+        self.assertIsNotNone(process.poll())
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(self.manager.live_count(), 0)
+
+    def test_terminate_graceful(self):
+        process = self.manager.popen("record", _sleeper())
+        self.manager.terminate(process, timeout=5)
+        self.assertEqual(process.returncode, -2)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "prlimit은 Linux 전용")
+    def test_resource_limits_applied(self):
+        self.manager.configure(limits={"record": {"open_files": 64, "cpu_seconds": 100}})
+        process = self.manager.popen("record", _sleeper())
+        limits = Path(f"/proc/{process.pid}/limits").read_text(encoding="utf-8")
+        open_files = next(line for line in limits.splitlines() if line.startswith("Max open files"))
+        cpu_time = next(line for line in limits.splitlines() if line.startswith("Max cpu time"))
+        self.assertEqual(open_files.split()[3:5], ["64", "64"])
+        self.assertEqual(cpu_time.split()[3:5], ["100", "105"])
+
+
+@unittest.skipIf(sys.platform == "win32", "nice / CPU 지정은 POSIX 전용")
+class PriorityClassTest(unittest.TestCase):
+    def setUp(self):
+        self.manager = ProcessManager()
+        self.addCleanup(self._kill_all)
+
+    def _kill_all(self):
+        for _, process in list(self.manager.children.values()):
+            self.manager.kill_tree(process)
+            process.wait()
+
+    @unittest.skipIf(os.getpriority(os.PRIO_PROCESS, 0) > 0, "이미 낮은 우선순위로 실행 중")
+    def test_kind_nice_levels(self):
+        # 종류별 기본 우선순위: 녹화 > 확인 > 변환 > 백필
+        expected = {"record": 0, "probe": 5, "encode": 10, "backfill": 15}
+        for kind, nice in expected.items():
+            process = self.manager.popen(kind, _sleeper())
+            self.assertEqual(os.getpriority(os.PRIO_PROCESS, process.pid), nice, kind)
+
+    @unittest.skipUnless(hasattr(os, "sched_setaffinity"), "CPU 지정 미지원")
+    def test_configured_override(self):
+        cpu = min(os.sched_getaffinity(0))
+        self.manager.configure(priorities={"encode": {"cpus": [cpu]}, "probe": {"nice": 7}})
+        encode = self.manager.popen("encode", _sleeper())
+        self.assertEqual(os.sched_getaffinity(encode.pid), {cpu})
+        # 지정하지 않은 항목은 기본값 유지
+        self.assertEqual(self.manager.priorities["encode"]["nice"], 10)
+        if os.getpriority(os.PRIO_PROCESS, 0) <= 0:
+            probe = self.manager.popen("probe", _sleeper())
+            self.assertEqual(os.getpriority(os.PRIO_PROCESS, probe.pid), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""보존 규칙 선택 테스트"""
+
+import time
+import unittest
+from unittest import mock
+
+from src.retention import RetentionEngine
+
+
+_GB = 1024 ** 3
+_DAY = 86400
+
+
+class _Library:
+    def __init__(self, sessions):
+        self._sessions = sessions
+
+    def sessions(self):
+        return sorted(self._sessions, key=lambda session: session["mtime"])
+
+    def usage(self):
+        usage = {}
+        for session in self._sessions:
+            files, size = usage.get(session["user_id"], (0, 0))
+            usage[session["user_id"]] = (files + len(session["files"]), size + session["bytes"])
+        return usage
+
+
+def _session(user_id, name, age_days, size_gb=1.0, movie_id=None):
+    return {
+        "dir": f"/save/{user_id}/{name}", "user_id": user_id, "movie_id": movie_id or name,
+        "date": None, "mtime": time.time() - age_days * _DAY, "bytes": int(size_gb * _GB),
+        "parts": 1, "files": [f"/save/{user_id}/{name}/{name}.mp4"],
+    }
+
+
+class RetentionPlanTest(unittest.TestCase):
+    def _plan(self, sessions, rules, protected=()):
+        engine = RetentionEngine(_Library(sessions), lambda: "/save", rules, protected=lambda: set(protected))
+        return [(session["dir"], reason) for session, reason in engine.plan()]
+
+    def test_no_rules(self):
+        self.assertEqual(self._plan([_session("a", "s1", 100)], {}), [])
+
+    def test_keep_last_per_channel(self):
+        sessions = [_session("a", f"s{i}", 10 - i) for i in range(5)] + [_session("b", "t0", 50)]
+        plan = self._plan(sessions, {"global": {"keep_last": 3}})
+        self.assertEqual([path for path, _ in plan], ["/save/a/s0", "/save/a/s1"])
+
+    def test_channel_rule_overrides_global(self):
+        sessions = [_session("a", f"s{i}", 10 - i) for i in range(3)]
+        plan = self._plan(sessions, {"global": {"keep_last": 1}, "channels": {"a": {"keep_last": 2}}})
+        self.assertEqual([path for path, _ in plan], ["/save/a/s0"])
+
+    def test_keep_last_counts_broadcast_once(self):
+        # 제목이 바뀌어 디렉토리가 둘인 같은 방송은 한 방송으로 셈
+        sessions = [
+            _session("a", "old", 5, movie_id="1"),
+            _session("a", "new", 3, movie_id="2"),
+            _session("a", "new_retitled", 2, movie_id="2"),
+        ]
+        plan = self._plan(sessions, {"global": {"keep_last": 1}})
+        self.assertEqual([path for path, _ in plan], ["/save/a/old"])
+
+    def test_max_age(self):
+        sessions = [_session("a", "old", 40), _session("a", "new", 1)]
+        plan = self._plan(sessions, {"global": {"max_age_days": 30}})
+        self.assertEqual(plan, [("/save/a/old", "30일 경과")])
+
+    def test_channel_max_total(self):
+        sessions = [_session("a", f"s{i}", 10 - i, size_gb=2) for i in range(4)] + [_session("b", "t", 20, size_gb=5)]
+        plan = self._plan(sessions, {"channels": {"a": {"max_total_gb": 5}}})
+        self.assertEqual([path for path, _ in plan], ["/save/a/s0", "/save/a/s1"])
+
+    def test_global_max_total_oldest_first(self):
+        sessions = [_session("a", "s0", 9), _session("b", "t0", 8), _session("a", "s1", 1)]
+        plan = self._plan(sessions, {"global": {"max_total_gb": 1.5}})
+        self.assertEqual([path for path, _ in plan], ["/save/a/s0", "/save/b/t0"])
+
+    def test_protected_never_deleted(self):
+        sessions = [_session("a", "live", 100), _session("a", "old", 50)]
+        plan = self._plan(sessions, {"global": {"max_age_days": 1}}, protected={"/save/a/live"})
+        self.assertEqual([path for path, _ in plan], ["/save/a/old"])
+
+    def test_rules_not_doubled(self):
+        sessions = [_session("a", "s0", 100), _session("a", "s1", 1)]
+        plan = self._plan(sessions, {"global": {"max_age_days": 30, "keep_last": 1}})
+        self.assertEqual(len(plan), 1)
+
+    def test_min_free(self):
+        sessions = [_session("a", f"s{i}", 10 - i) for i in range(4)]
+        usage = mock.Mock(free=int(0.5 * _GB))
+        with mock.patch("src.retention.shutil.disk_usage", return_value=usage):
+            plan = self._plan(sessions, {"global": {"min_free_gb": 2}})
+        self.assertEqual([path for path, _ in plan], ["/save/a/s0", "/save/a/s1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""다중 인스턴스 채널 임대 테스트 (rendezvous 배정, 하트비트, 만료 감시)"""
+
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import closing
+from pathlib import Path
+from unittest import mock
+
+from src.sharding import LeaseCoordinator
+
+
+_CHANNELS = [f"user{i}" for i in range(20)]
+
+
+class LeaseTestCase(unittest.TestCase):
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.db_path = Path(temp.name) / "leases.db"
+        self.lost = []
+
+    def _coordinator(self, instance_id: str, **kwargs) -> LeaseCoordinator:
+        kwargs.setdefault("on_lost", lambda user_id: self.lost.append((instance_id, user_id)))
+        coordinator = LeaseCoordinator(self.db_path, instance_id=instance_id, **kwargs)
+        self.addCleanup(coordinator.stop)
+        return coordinator
+
+    def _execute(self, sql: str, params: tuple = ()):
+        with closing(sqlite3.connect(self.db_path)) as conn, conn:
+            conn.execute(sql, params)
+
+    def _register_interest(self, instance_id: str, user_id: str):
+        self._execute("INSERT OR REPLACE INTO interests VALUES (?, ?, ?)", (user_id, instance_id, time.time() + 30))
+
+    def _preferred(self, *coordinators, user_id: str):
+        return sorted(coordinators, key=lambda c: LeaseCoordinator._score(c.instance_id, user_id), reverse=True)
+
+
+class LeaseRankingTest(LeaseTestCase):
+    def test_preferred_instance_takes_free_channel(self):
+        a, b = self._coordinator("a"), self._coordinator("b")
+        for user_id in _CHANNELS:
+            preferred, other = self._preferred(a, b, user_id=user_id)
+            self._register_interest(preferred.instance_id, user_id)
+            self.assertFalse(other.try_acquire(user_id))
+            self.assertTrue(preferred.try_acquire(user_id))
+            self.assertTrue(preferred.owns(user_id))
+
+    def test_valid_lease_is_kept(self):
+        # 선호 순위와 무관하게 유효한 임대는 빼앗지 않음
+        a, b = self._coordinator("a"), self._coordinator("b")
+        self.assertTrue(a.try_acquire("user1"))
+        self.assertFalse(b.try_acquire("user1"))
+        a.release("user1")
+        self.assertTrue(b.try_acquire("user1"))
+
+    def test_expired_lease_taken_over(self):
+        a, b = self._coordinator("a"), self._coordinator("b")
+        self.assertTrue(a.try_acquire("user1"))
+        self._execute("UPDATE leases SET expires_at = ?", (time.time() - 1,))
+        self._execute("DELETE FROM interests WHERE instance_id = 'a'")
+        self.assertTrue(b.try_acquire("user1"))
+
+    def test_live_instances(self):
+        a, b = self._coordinator("a"), self._coordinator("b")
+        a.try_acquire("user1")
+        b.try_acquire("user2")
+        self.assertEqual(a.live_instances(), ["a", "b"])
+
+
+class HeartbeatTest(LeaseTestCase):
+    def test_renews_local_deadline(self):
+        a = self._coordinator("a", ttl=30, skew=5)
+        a.try_acquire("user1")
+        a.owned["user1"] = time.monotonic() + 1
+        self.assertEqual(a.heartbeat(), [])
+        self.assertGreater(a.owned["user1"], time.monotonic() + 20)
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            expires_at = conn.execute("SELECT expires_at FROM leases").fetchone()[0]
+        self.assertGreater(expires_at, time.time() + 25)
+
+    def test_detects_lease_taken_by_other(self):
+        a = self._coordinator("a")
+        a.try_acquire("user1")
+        self._execute("UPDATE leases SET owner = 'b'")
+        self.assertEqual(a.heartbeat(), ["user1"])
+        self.assertEqual(self.lost, [("a", "user1")])
+        self.assertFalse(a.owns("user1"))
+
+    def test_hands_over_to_preferred_instance_when_idle(self):
+        busy = set()
+        a = self._coordinator("a", busy_check=lambda user_id: user_id in busy)
+        b = self._coordinator("b", busy_check=lambda user_id: user_id in busy)
+        moved = [user_id for user_id in _CHANNELS if self._preferred(a, b, user_id=user_id)[0] is b][:2]
+        for user_id in moved:
+            self.assertTrue(a.try_acquire(user_id))
+            b.try_acquire(user_id)  # 관심만 등록 (a가 보유 중)
+        busy.add(moved[1])
+        self.assertEqual(a.heartbeat(), [moved[0]])
+        self.assertTrue(a.owns(moved[1]))
+        self.assertTrue(b.try_acquire(moved[0]))
+
+    def test_skew_capped(self):
+        self.assertEqual(self._coordinator("a", ttl=30, skew=100).skew, 10)
+        coordinator = self._coordinator("b", ttl=30, skew=5)
+        self.assertEqual(coordinator._deadline(100.0), 125.0)
+
+
+class FenceTest(LeaseTestCase):
+    def test_fence_drops_expired(self):
+        a = self._coordinator("a")
+        a.try_acquire("user1")
+        a.try_acquire("user2")
+        a.owned["user1"] = time.monotonic() - 0.1
+        self.assertEqual(a.fence(), ["user1"])
+        self.assertEqual(self.lost, [("a", "user1")])
+        self.assertTrue(a.owns("user2"))
+
+    def test_self_fences_when_store_unreachable(self):
+        lost = threading.Event()
+        a = self._coordinator("a", ttl=0.9, skew=0.1, on_lost=lambda user_id: lost.set())
+        self.assertTrue(a.try_acquire("user1"))
+        started = time.monotonic()
+        with mock.patch.object(a, "_connect", side_effect=sqlite3.OperationalError("database is locked")):
+            a.start()
+            self.assertTrue(lost.wait(3))
+        # 로컬 만료 시각(ttl - skew) 무렵 내려놓음
+        self.assertGreater(time.monotonic() - started, 0.7)
+        self.assertLess(time.monotonic() - started, 0.9 + 0.2)
+        self.assertFalse(a.owns("user1"))
+
+    def test_failed_heartbeat_does_not_extend(self):
+        a = self._coordinator("a")
+        a.try_acquire("user1")
+        deadline = a.owned["user1"] = time.monotonic() + 1
+        with mock.patch.object(a, "_connect", side_effect=sqlite3.OperationalError("disk I/O error")):
+            with self.assertRaises(sqlite3.Error):
+                a.heartbeat()
+        self.assertEqual(a.owned["user1"], deadline)
+
+
+if __name__ == "__main__":
+    unittest.main()
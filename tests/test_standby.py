@@ -0,0 +1,67 @@
+"""대기 녹화 예측 점수 테스트"""
+
+import unittest
+from datetime import datetime, timedelta
+
+from src.standby import predict_live
+
+
+_NOW = datetime(2024, 6, 15, 20, 0, 0)
+
+
+def _daily(hour: int, minute: int, days: int, length: float = 3600) -> list:
+    """지난 days일 동안 매일 같은 시각에 시작한 방송"""
+    sessions = []
+    for day in range(1, days + 1):
+        start = (_NOW - timedelta(days=day)).replace(hour=hour, minute=minute)
+        sessions.append((start, start + timedelta(seconds=length)))
+    return sessions
+
+
+class PredictLiveTest(unittest.TestCase):
+    def test_no_history(self):
+        self.assertEqual(predict_live(["a"], {}, {}, _NOW), [])
+
+    def test_habit_within_lead(self):
+        scores = dict(predict_live(["a"], {"a": _daily(20, 15, 14)}, {}, _NOW))
+        self.assertIn("a", scores)
+        self.assertGreater(scores["a"], 0.8)
+
+    def test_habit_outside_lead(self):
+        self.assertEqual(predict_live(["a"], {"a": _daily(23, 0, 14)}, {}, _NOW), [])
+
+    def test_slightly_late_start_counts(self):
+        # 예상 시각보다 10분 안쪽으로 이미 지난 시작 시각도 습관으로 봄
+        self.assertTrue(predict_live(["a"], {"a": _daily(19, 55, 7)}, {}, _NOW))
+
+    def test_recent_days_weigh_more(self):
+        recent = _daily(20, 10, 3)
+        old = [(start - timedelta(days=10), end - timedelta(days=10)) for start, end in recent]
+        scores = dict(predict_live(["recent", "old"], {"recent": recent, "old": old}, {}, _NOW))
+        self.assertGreater(scores["recent"], scores["old"])
+
+    def test_sessions_outside_window_ignored(self):
+        sessions = {"a": _daily(20, 10, 30)[20:]}
+        self.assertEqual(predict_live(["a"], sessions, {}, _NOW, days=14), [])
+
+    def test_one_session_per_day(self):
+        start = (_NOW - timedelta(days=1)).replace(hour=20, minute=5)
+        once = {"a": [(start, None)]}
+        twice = {"a": [(start, None), (start + timedelta(minutes=10), None)]}
+        self.assertEqual(predict_live(["a"], once, {}, _NOW), predict_live(["a"], twice, {}, _NOW))
+
+    def test_recently_ended_scores_high(self):
+        ended = _NOW - timedelta(minutes=5)
+        sessions = {"a": [(ended - timedelta(hours=1), ended)]}
+        scores = dict(predict_live(["a", "b"], sessions, {"b": _NOW - timedelta(minutes=25)}, _NOW))
+        self.assertGreater(scores["a"], 1.5)
+        self.assertLess(scores["b"], scores["a"])
+
+    def test_ordering(self):
+        sessions = {"habit": _daily(20, 15, 14), "weak": _daily(20, 15, 14)[10:]}
+        ranked = predict_live(["weak", "habit", "none"], sessions, {}, _NOW)
+        self.assertEqual([user_id for user_id, _ in ranked], ["habit", "weak"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""트레이싱 / 샘플링 프로파일러 테스트"""
+
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from src.tracing import SamplingProfiler, Tracer
+
+
+class TracerTest(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp.cleanup)
+
+    def test_disabled_records_nothing(self):
+        tracer = Tracer()
+        with tracer.span("probe.spawn"):
+            pass
+        tracer.instant("tick")
+        func = lambda: 1
+        self.assertIs(tracer.wrap("call", func), func)
+        self.assertEqual(len(tracer.events), 0)
+
+    def test_span_records_duration_and_args(self):
+        tracer = Tracer()
+        tracer.enable()
+        with tracer.span("probe.wait", cat="probe", user_id="alice"):
+            time.sleep(0.01)
+        event = tracer.events[0]
+        self.assertEqual((event["name"], event["cat"], event["ph"]), ("probe.wait", "probe", "X"))
+        self.assertGreaterEqual(event["dur"], 10_000 * 0.9)
+        self.assertEqual(event["args"], {"user_id": "alice"})
+
+    def test_span_recorded_on_exception(self):
+        tracer = Tracer()
+        tracer.enable()
+        with self.assertRaises(ValueError):
+            with tracer.span("probe.parse"):
+                raise ValueError
+        self.assertEqual(tracer.events[0]["name"], "probe.parse")
+
+    def test_nested_spans_and_wrap(self):
+        tracer = Tracer()
+        tracer.enable()
+        with tracer.span("outer"):
+            self.assertEqual(tracer.wrap("inner", lambda x: x * 2)(21), 42)
+        inner, outer = tracer.events
+        self.assertEqual((inner["name"], outer["name"]), ("inner", "outer"))
+        self.assertGreaterEqual(inner["ts"], outer["ts"])
+        self.assertLessEqual(inner["ts"] + inner["dur"], outer["ts"] + outer["dur"])
+
+    def test_enable_clears_and_limit(self):
+        tracer = Tracer(max_events=3)
+        tracer.enable()
+        for i in range(5):
+            tracer.instant(f"e{i}")
+        self.assertEqual([event["name"] for event in tracer.events], ["e2", "e3", "e4"])
+        tracer.enable()
+        self.assertEqual(len(tracer.events), 0)
+
+    def test_export_chrome_trace(self):
+        tracer = Tracer()
+        tracer.enable()
+        with tracer.span("record.start"):
+            pass
+        path = Path(self.temp.name) / "sub" / "trace.json"
+        self.assertEqual(tracer.export(str(path)), 1)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        phases = [event["ph"] for event in data["traceEvents"]]
+        self.assertIn("M", phases)
+        self.assertEqual(phases.count("X"), 1)
+        names = {event["args"]["name"] for event in data["traceEvents"] if event["ph"] == "M"}
+        self.assertIn(threading.current_thread().name, names)
+
+
+class SamplingProfilerTest(unittest.TestCase):
+    def test_collects_other_threads(self):
+        stop = threading.Event()
+
+        def busy_worker():
+            while not stop.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=busy_worker, name="busy", daemon=True)
+        worker.start()
+        with tempfile.TemporaryDirectory() as temp:
+            output = Path(temp) / "profile.txt"
+            done = threading.Event()
+            result = {}
+
+            def on_done(path, count):
+                result.update(path=path, count=count)
+                done.set()
+
+            profiler = SamplingProfiler(interval=0.002)
+            self.assertTrue(profiler.start(0.3, str(output), on_done))
+            self.assertFalse(profiler.start(0.3, str(output)))
+            self.assertTrue(done.wait(5))
+            stop.set()
+
+            lines = output.read_text(encoding="utf-8").splitlines()
+            self.assertGreater(result["count"], 0)
+            self.assertTrue(any(line.startswith("busy;") and "busy_worker" in line for line in lines))
+            self.assertEqual(sum(int(line.rsplit(" ", 1)[1]) for line in lines), result["count"])
+
+    def test_stop_early_dumps(self):
+        with tempfile.TemporaryDirectory() as temp:
+            output = Path(temp) / "profile.txt"
+            profiler = SamplingProfiler()
+            profiler.start(60, str(output))
+            started = time.monotonic()
+            profiler.stop()
+            self.assertLess(time.monotonic() - started, 5)
+            self.assertFalse(profiler.is_running)
+            self.assertTrue(output.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""채널 ID 정규화 / 채널 목록 해석 테스트"""
+
+import unittest
+
+from src.utils import normalize_user_id, parse_channel_list
+
+
+class NormalizeUserIdTest(unittest.TestCase):
+    def test_plain_and_url(self):
+        self.assertEqual(normalize_user_id("user_123"), "user_123")
+        self.assertEqual(normalize_user_id("https://twitcasting.tv/user_123"), "user_123")
+        self.assertEqual(normalize_user_id("https://twitcasting.tv/user_123/movie/456"), "user_123")
+
+    def test_decorations(self):
+        self.assertEqual(normalize_user_id("  @user_123 "), "user_123")
+        self.assertEqual(normalize_user_id("<https://twitcasting.tv/user_123>"), "user_123")
+        self.assertEqual(normalize_user_id("twitcasting.tv/user_123"), "user_123")
+
+    def test_prefixed_ids(self):
+        self.assertEqual(normalize_user_id("twitcasting.tv/c%3Auser123/movie/1"), "c:user123")
+        self.assertEqual(normalize_user_id("G:112335820121384004141"), "g:112335820121384004141")
+        self.assertEqual(normalize_user_id("ig:some.user"), "ig:some.user")
+
+    def test_invalid(self):
+        for text in ("", "user 123", "g:abc", "x" * 51, "https://twitcasting.tv/", "한글아이디"):
+            self.assertIsNone(normalize_user_id(text), text)
+
+
+class ParseChannelListTest(unittest.TestCase):
+    def test_one_per_line_with_comments(self):
+        text = "# 감시 목록\nuser_a\n\nhttps://twitcasting.tv/user_b\n  # 주석\n"
+        self.assertEqual(parse_channel_list(text), (["user_a", "user_b"], []))
+
+    def test_duplicates_case_insensitive(self):
+        ids, invalid = parse_channel_list("User_A\nuser_a\n@USER_A\nuser_b")
+        self.assertEqual(ids, ["User_A", "user_b"])
+        self.assertEqual(invalid, [])
+
+    def test_invalid_entries(self):
+        ids, invalid = parse_channel_list("user_a\nnot valid!\n")
+        self.assertEqual(ids, ["user_a"])
+        self.assertEqual(invalid, ["not valid!"])
+
+    def test_csv_header_column(self):
+        text = "name,url,memo\n첫째,https://twitcasting.tv/user_a,메모\n둘째,user_b,\n"
+        self.assertEqual(parse_channel_list(text), (["user_a", "user_b"], []))
+
+    def test_korean_header(self):
+        text = "이름;아이디\n첫째;user_a\n둘째;c:user_b\n"
+        self.assertEqual(parse_channel_list(text), (["user_a", "c:user_b"], []))
+
+    def test_headerless_csv_prefers_url_cell(self):
+        text = "첫째\thttps://twitcasting.tv/user_a\n둘째\thttps://twitcasting.tv/user_b\n"
+        self.assertEqual(parse_channel_list(text), (["user_a", "user_b"], []))
+
+    def test_empty(self):
+        self.assertEqual(parse_channel_list(""), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+"""녹화 정지 감시 테스트 (정지 판단, 이어서 녹화, 끊김 기록, 감시 오류 보고)"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.process_manager import process_manager
+from src.recorder import StreamRecorder
+from src.watchdog import StallWatchdog, gaps_path_for
+
+
+class _Process:
+    def __init__(self):
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+
+class _Recorder:
+    """StreamRecorder 대신 쓰는 기록용 녹화 관리자"""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.processes = {}
+        self.output_files = {}
+        self.last_activity = {}
+        self.parts = {}
+        self.restarts = []
+        self.stopped = []
+        self.restart_result = (True, "이어서 녹화 시작")
+
+    def start(self, user_id: str, name: str = "rec.mp4") -> Path:
+        path = self.directory / name
+        path.write_bytes(b"x" * 10)
+        self.processes[user_id] = _Process()
+        self.output_files[user_id] = str(path)
+        return path
+
+    def get_output_file(self, user_id):
+        return self.output_files.get(user_id)
+
+    def restart_recording(self, user_id, process):
+        self.restarts.append((user_id, process))
+        if self.restart_result[0]:
+            part = self.parts.get(user_id, 1) + 1
+            self.parts[user_id] = part
+            self.processes[user_id] = _Process()
+            self.output_files[user_id] = str(self.directory / f"rec.part{part}.mp4")
+        return self.restart_result
+
+    def stop_recording(self, user_id):
+        self.stopped.append(user_id)
+        self.processes.pop(user_id, None)
+
+
+class StallWatchdogTest(unittest.TestCase):
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.directory = Path(temp.name) / "[20240101]_t(1)"
+        self.directory.mkdir()
+        self.recorder = _Recorder(self.directory)
+        self.events = []
+        self.watchdog = StallWatchdog(
+            self.recorder, stall_timeout=10, max_restarts=2,
+            on_event=lambda user_id, message: self.events.append((user_id, message))
+        )
+        self.now = 1000.0
+        patcher = mock.patch("src.watchdog.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_growing_file_is_not_stalled(self):
+        path = self.recorder.start("alice")
+        self.watchdog.check_once()
+        for _ in range(5):
+            self.now += 8
+            with open(path, "ab") as f:
+                f.write(b"more")
+            self.watchdog.check_once()
+        self.assertEqual(self.recorder.restarts, [])
+
+    def test_output_counts_as_progress(self):
+        self.recorder.start("alice")
+        self.watchdog.check_once()
+        self.now += 8
+        self.recorder.last_activity["alice"] = self.now
+        self.now += 8
+        self.watchdog.check_once()
+        self.assertEqual(self.recorder.restarts, [])
+
+    def test_stall_restarts_and_records_gap(self):
+        self.recorder.start("alice")
+        process = self.recorder.processes["alice"]
+        self.watchdog.check_once()
+        self.now += 11
+        self.watchdog.check_once()
+
+        self.assertEqual(self.recorder.restarts, [("alice", process)])
+        self.assertEqual(self.watchdog.restart_count, 1)
+        self.assertIs(self.watchdog.watches["alice"].process, self.recorder.processes["alice"])
+        gaps = json.loads(gaps_path_for(self.directory).read_text(encoding="utf-8"))
+        self.assertEqual((gaps[0]["part"], gaps[0]["previous_file"], gaps[0]["seconds"]), (2, "rec.mp4", 11))
+
+        # 새 부분은 다시 stall_timeout 동안 기다림
+        self.now += 5
+        self.watchdog.check_once()
+        self.assertEqual(len(self.recorder.restarts), 1)
+
+    def test_restart_limit_stops_recording(self):
+        self.recorder.start("alice")
+        self.watchdog.check_once()
+        # 새 부분 파일이 처음 보일 때까지 한 주기씩 더 걸림
+        for _ in range(5):
+            self.now += 11
+            self.watchdog.check_once()
+        self.assertEqual(len(self.recorder.restarts), 2)
+        self.assertEqual(self.recorder.stopped, ["alice"])
+        self.assertNotIn("alice", self.watchdog.watches)
+        self.assertIn("한도(2회) 초과", self.events[-1][1])
+
+    def test_failed_restart_reported(self):
+        self.recorder.start("alice")
+        self.recorder.restart_result = (False, "yt-dlp 없음")
+        self.watchdog.check_once()
+        self.now += 11
+        self.watchdog.check_once()
+        self.assertEqual(self.events[-1], ("alice", "❌ 이어서 녹화 실패: yt-dlp 없음"))
+        self.assertNotIn("alice", self.watchdog.watches)
+
+    def test_exited_process_left_to_monitor(self):
+        self.recorder.start("alice")
+        self.watchdog.check_once()
+        self.recorder.processes["alice"].returncode = 1
+        self.now += 60
+        self.watchdog.check_once()
+        self.assertEqual(self.recorder.restarts, [])
+
+        del self.recorder.processes["alice"]
+        self.watchdog.check_once()
+        self.assertEqual(self.watchdog.watches, {})
+
+
+class StallWatchdogThreadTest(unittest.TestCase):
+    def test_errors_reported_once(self):
+        events = []
+        reported = threading.Event()
+
+        class Broken:
+            @property
+            def processes(self):
+                raise RuntimeError("recorder gone")
+
+        def on_event(user_id, message):
+            events.append((user_id, message))
+            reported.set()
+
+        watchdog = StallWatchdog(Broken(), interval=0.01, on_event=on_event)
+        watchdog.start()
+        self.addCleanup(watchdog.stop)
+        self.assertTrue(reported.wait(5))
+        time.sleep(0.1)
+        watchdog.stop()
+        self.assertEqual(events, [(None, "⚠️ 녹화 정지 감시 오류: RuntimeError: recorder gone")])
+
+
+@unittest.skipIf(sys.platform == "win32", "POSIX 프로세스 그룹 종료 사용")
+class RestartRecordingTest(unittest.TestCase):
+    def test_finished_part_reported(self):
+        with tempfile.TemporaryDirectory() as temp:
+            directory = Path(temp) / "[20240101]_t(1)"
+            directory.mkdir()
+            previous = directory / "[20240101]_t(1).mp4"
+            previous.write_bytes(b"x" * 123)
+
+            recorder = StreamRecorder()
+            parts, finished = [], []
+            recorder.set_part_callback(lambda *args: parts.append(args))
+            recorder.set_finished_callback(lambda *args: finished.append(args))
+            process = process_manager.popen("record", [sys.executable, "-c", "import time; time.sleep(30)"])
+            recorder.processes["alice"] = process
+            recorder.start_args["alice"] = {"ytdlp_path": "yt-dlp", "ffmpeg_path": "ffmpeg"}
+            recorder.output_files["alice"] = str(previous)
+
+            with mock.patch.object(recorder, "start_recording", return_value=(True, "녹화 시작")) as start:
+                success, _ = recorder.restart_recording("alice", process)
+
+            self.assertTrue(success)
+            self.assertIsNotNone(process.poll())
+            self.assertEqual(start.call_args.kwargs["output_base"], directory / "[20240101]_t(1).part2")
+            self.assertEqual(recorder.parts["alice"], 2)
+            self.assertEqual(parts, [("alice", str(previous), 123)])
+            self.assertEqual(finished, [])
+
+
+if __name__ == "__main__":
+    unittest.main()